@@ -84,14 +84,21 @@ def _audio_cb(indata, frames, time, status):
         else:
             _raw_bands[idx] = 0.0
 
-# start the stream once on import
-_stream = sd.InputStream(
-    channels=1,
-    samplerate=SAMPLERATE,
-    blocksize=BLOCKSIZE,
-    callback=_audio_cb
-)
-_stream.start()
+# the stream starts on first use, so a process that merely imports this
+# module (e.g. a multiprocessing child re-importing touch_ui) leaves the
+# sound card alone
+_stream = None
+
+def _start_stream():
+    global _stream
+    if _stream is None:
+        _stream = sd.InputStream(
+            channels=1,
+            samplerate=SAMPLERATE,
+            blocksize=BLOCKSIZE,
+            callback=_audio_cb
+        )
+        _stream.start()
 
 # ─── EVALUATE ENVELOPES ────────────────────────────────────────────────────
 def evaluate_env():
@@ -101,6 +108,7 @@ def evaluate_env():
     """
     global _raw_l, _raw_h, _sm_l, _sm_h
     global _prev_above_l, _prev_above_h, _state_l, _state_h
+    _start_stream()
 
     out = {}
     for name, raw in (("envl", _raw_l), ("envh", _raw_h)):
@@ -189,6 +197,7 @@ def evaluate_fft_bands(n_bands=24):
       • converting to dB (floor at –30 dB Power) and normalizing
       • falling back to the nearest bin if a band has no FFT bins
     """
+    _start_stream()
     # 1) pull & pad the rolling buffer
     data = np.array(_fft_buffer, dtype=float)
     if data.size < FFT_SIZE:
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+High-bit-depth color chain + temporal dithering versus the 8-bit chain:
+how many distinct output levels a dark ramp keeps at low brightness
+(averaged over frames, as the eye sees it), and the per-frame cost.
+
+    python3 -m benchmarks.bench_dither [brightness]      # default 0.3
+"""
+import sys
+import time
+import numpy as np
+
+from color_pipeline import ColorPipeline
+from dither import TemporalDither
+from gamma import init_gamma
+
+
+def time_it(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    brightness = float(sys.argv[1]) if len(sys.argv) > 1 else 0.3
+    # touch_ui's calibration
+    init_gamma({"r": 0.65, "g": 0.65, "b": 0.65, "w": 0.65},
+               {"r": 1.25, "g": 1.25, "b": 1.25, "w": 1.25})
+    chain8 = ColorPipeline(brightness=brightness)
+    chain16 = ColorPipeline(brightness=brightness, bits=16)
+
+    # grey ramp over the darkest quarter of the input range
+    ramp = np.repeat(np.arange(64, dtype=np.uint8)[:, None], 3, axis=1)
+    out8 = chain8.apply(ramp)
+    dither = TemporalDither((len(ramp), 4))
+    frames = 90
+    seen = np.zeros((len(ramp), 4))
+    for _ in range(frames):
+        seen += dither.apply(chain16.apply(ramp))
+    seen /= frames
+    print(f"brightness {brightness}: input levels 0..63, white channel")
+    print(f"  8-bit chain       {len(np.unique(out8[:, 3])):3d} distinct levels")
+    print(f"  16-bit + dither   {len(np.unique(np.round(seen[:, 3], 1))):3d} distinct levels "
+          f"(mean over {frames} frames)\n")
+
+    rng = np.random.default_rng(0)
+    print(f"{'LEDs':>6s} {'8-bit chain':>12s} {'16-bit chain':>13s} {'dither':>9s}")
+    for num_leds in (640, 10_000):
+        frame = rng.integers(0, 256, size=(num_leds, 3), dtype=np.uint8)
+        o8 = np.empty((num_leds, 4), dtype=np.uint8)
+        o16 = np.empty((num_leds, 4), dtype=np.uint16)
+        dither = TemporalDither((num_leds, 4))
+        repeat = max(20, 200_000 // num_leds)
+        t8 = time_it(lambda: chain8.apply(frame, o8), repeat)
+        t16 = time_it(lambda: chain16.apply(frame, o16), repeat)
+        td = time_it(lambda: dither.apply(o16, o8), repeat)
+        print(f"{num_leds:6d} {t8 * 1e3:10.3f}ms {t16 * 1e3:11.3f}ms {td * 1e3:7.3f}ms")
+    print(f"\nbudget: {1e3 / 45:.3f} ms/frame at 45 FPS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: legacy per-LED WS2814 encoder vs. the vectorized table encoder,
+plus a decoder round-trip of every packed symbol mode (3/4/8 SPI bits per bit)
+and every chipset profile.
+
+Run from the repo root (no SPI hardware needed):
+    python3 -m benchmarks.bench_encode [num_leds]
+"""
+import sys
+import time
+import numpy as np
+
+from ws2814 import WS2814, FakeSpiDev
+from ws2814.encoding import (SYMBOL_BITS, DATA_RATE_HZ, WRGB_ORDER,
+                             encode_rgbw, decode_bitstream, symbol_table)
+from ws2814.ws2814 import LATCH_SECONDS
+from ws2814.chipsets import CHIPSETS
+
+
+def time_it(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    num_leds = int(sys.argv[1]) if len(sys.argv) > 1 else 640
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(num_leds, 4), dtype=np.uint8)
+
+    strip = WS2814('/dev/spidev0.0', num_leds, spi=FakeSpiDev())   # encoder only
+    strip.set_frame(frame)
+
+    legacy = np.array(strip.update_strip_legacy(), dtype=np.uint8)
+    fast = encode_rgbw(frame)
+    assert np.array_equal(legacy, fast), "vectorized encoder is not bit-exact"
+    print(f"{num_leds} LEDs, {fast.size} SPI bytes per frame: bit-exact OK")
+
+    t_legacy = time_it(strip.update_strip_legacy, 5)
+    t_fast = time_it(lambda: encode_rgbw(frame), 200)
+    print(f"legacy : {t_legacy * 1e3:8.3f} ms/frame")
+    print(f"vector : {t_fast * 1e3:8.3f} ms/frame  ({t_legacy / t_fast:.0f}x faster)")
+    print(f"budget : {1e3 / 45:8.3f} ms/frame at 45 FPS")
+
+    # Packed modes: decode like a WS281x would and compare against the frame
+    print()
+    wire_order = frame[:, WRGB_ORDER].reshape(-1)
+    for bits in sorted(SYMBOL_BITS, reverse=True):
+        payload = encode_rgbw(frame, symbol_table(bits))
+        decoded = decode_bitstream(payload, bits)
+        assert np.array_equal(decoded, wire_order), f"{bits}-bit mode does not decode"
+        clock = DATA_RATE_HZ * bits
+        wire = payload.size + 2 * int(np.ceil(LATCH_SECONDS * clock / 8))
+        max_fps = clock / (wire * 8)
+        print(f"{bits} bits/symbol @ {clock / 1e6:.1f} MHz: decode OK, "
+              f"{wire} wire bytes, max {max_fps:.0f} FPS")
+
+    print()
+    for name, chip in CHIPSETS.items():
+        for bits in sorted(chip.tables, reverse=True):
+            payload = encode_rgbw(frame, chip.table(bits), chip.order)
+            decoded = decode_bitstream(payload, bits)
+            assert np.array_equal(decoded, frame[:, chip.order].reshape(-1)), name
+        print(f"{name:8s}: {chip.channels} channels, order {chip.order}, "
+              f"modes {sorted(chip.tables)} decode OK")
+
+
+if __name__ == "__main__":
+    main()
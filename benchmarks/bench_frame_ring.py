@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Frame handoff latency from a renderer to an output reader: publish →
+reader holding the frame, for a TripleBuffer between two threads, a
+FrameRing between two processes and, for comparison, a
+multiprocessing.Queue (pickled frames).  The writer publishes at a fixed
+rate; reports median / 99th percentile / worst latency and how many
+frames the reader never saw (superseded before it got to them).  First
+checks that a handle which never wrote before (the UI blanking the wall)
+can take over from a writer in another process.
+
+    python3 -m benchmarks.bench_frame_ring [num_leds] [fps]     # 640 45
+"""
+import multiprocessing
+import sys
+import threading
+import time
+import numpy as np
+
+from frame_ring import FrameRing
+from output_worker import TripleBuffer
+
+SECONDS = 3.0
+
+
+def pace(fps, frames, publish):
+    """Publish `frames` frames at `fps`, a fresh ramp each time"""
+    start = time.perf_counter()
+    for i in range(frames):
+        time.sleep(max(0.0, start + i / fps - time.perf_counter()))
+        publish(i)
+
+
+def ring_reader(name, frames, results):
+    ring = FrameRing.attach(name)
+    lat = []
+    while len(lat) < frames:
+        frame, stamp = ring.read(timeout=1.0)
+        if frame is None:
+            break
+        lat.append(time.perf_counter() - stamp)
+    results.put(lat)
+    del frame
+    ring.close()
+
+
+def ring_writer(name, frames):
+    ring = FrameRing.attach(name)
+    for i in range(frames):
+        ring.write(np.full(ring.shape, i + 1, ring.dtype))
+    ring.close()
+
+
+def check_handover(ctx, shape, frames=10):
+    """Another process publishes `frames` frames, then the creator blanks"""
+    ring = FrameRing.create(shape)
+    reader = FrameRing.attach(ring.name)
+    child = ctx.Process(target=ring_writer, args=(ring.name, frames))
+    child.start()
+    child.join()
+    frame, _ = reader.read(timeout=1.0)
+    assert frame is not None and frame[0, 0] == frames and reader.seq == frames
+    ring.write(np.zeros(shape, np.uint8))
+    frame, _ = reader.read(timeout=1.0)
+    assert frame is not None and not frame.any(), "blank after another writer was ignored"
+    assert reader.seq == frames + 1, f"sequence went back to {reader.seq}"
+    reader.close()
+    ring.close()
+    ring.unlink()
+
+
+def queue_reader(q, frames, results):
+    lat = []
+    while len(lat) < frames:
+        item = q.get(timeout=1.0)
+        if item is None:
+            break
+        frame, stamp = item
+        lat.append(time.perf_counter() - stamp)
+    results.put(lat)
+
+
+def report(label, lat, frames):
+    ms = np.array(lat) * 1e3
+    print(f"  {label:26s} median {np.median(ms):6.3f} ms  p99 {np.percentile(ms, 99):6.3f} ms  "
+          f"max {ms.max():6.3f} ms  skipped {frames - len(ms)}/{frames}")
+
+
+def main():
+    num_leds = int(sys.argv[1]) if len(sys.argv) > 1 else 640
+    fps = float(sys.argv[2]) if len(sys.argv) > 2 else 45.0
+    frames = int(SECONDS * fps)
+    shape = (num_leds, 4)
+    ramp = (np.arange(num_leds * 4) % 256).astype(np.uint8).reshape(shape)
+    ctx = multiprocessing.get_context("spawn")
+    check_handover(ctx, shape)
+    print("handover: blank after another process's frames OK")
+    print(f"{num_leds} LEDs, {frames} frames at {fps:g} FPS")
+
+    # threads, one interpreter
+    buf = TripleBuffer(shape)
+    lat = []
+
+    def thread_reader():
+        while len(lat) < frames:
+            frame, stamp = buf.read(timeout=1.0)
+            if frame is None:
+                break
+            lat.append(time.perf_counter() - stamp)
+
+    reader = threading.Thread(target=thread_reader)
+    reader.start()
+    pace(fps, frames, lambda i: buf.write(ramp + np.uint8(i % 256)))
+    reader.join()
+    report("TripleBuffer (threads)", lat, frames)
+
+    results = ctx.Queue()
+
+    # shared memory, two processes
+    ring = FrameRing.create(shape)
+    child = ctx.Process(target=ring_reader, args=(ring.name, frames, results))
+    child.start()
+    time.sleep(0.5)       # let the child attach before the first frame
+
+    def publish_ring(i):
+        np.add(ramp, np.uint8(i % 256), out=ring.back())
+        ring.publish()
+
+    pace(fps, frames, publish_ring)
+    lat = results.get()
+    child.join()
+    report("FrameRing (processes)", lat, frames)
+    ring.close()
+    ring.unlink()
+
+    # pickled through a queue, two processes
+    q = ctx.Queue()
+    child = ctx.Process(target=queue_reader, args=(q, frames, results))
+    child.start()
+    time.sleep(0.5)
+    pace(fps, frames, lambda i: q.put((ramp + np.uint8(i % 256), time.perf_counter())))
+    lat = results.get()
+    child.join()
+    report("Queue, pickled (processes)", lat, frames)
+
+
+if __name__ == "__main__":
+    main()
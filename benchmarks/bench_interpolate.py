@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Output-rate interpolation: a renderer that only manages `render_fps`
+submits to an OutputWorker refreshing at 45 FPS, once per interpolation
+mode.  Reports the LED refresh rate, how many distinct frames reached the
+LEDs and the render rate the worker measured, plus the cost of one blend.
+
+    python3 -m benchmarks.bench_interpolate [render_fps] [num_leds]   # 15 640
+"""
+import sys
+import time
+import numpy as np
+
+from output_worker import OutputWorker, INTERPOLATION
+from outputs.base import OutputBackend
+
+
+class CountingOutput(OutputBackend):
+    """Discards frames but counts how many differ from the one before"""
+
+    def __init__(self, num_leds):
+        super().__init__(num_leds)
+        self.last = np.zeros((num_leds, 4), dtype=np.uint8)
+        self.distinct = 0
+
+    def show(self, frame):
+        if not np.array_equal(frame, self.last):
+            self.distinct += 1
+            self.last[:] = frame
+
+
+def main():
+    render_fps = float(sys.argv[1]) if len(sys.argv) > 1 else 15.0
+    num_leds = int(sys.argv[2]) if len(sys.argv) > 2 else 640
+    seconds = 2.0
+    # a frame that changes every render: a moving ramp
+    ramp = (np.arange(num_leds) * 7 % 256).astype(np.uint8)
+
+    print(f"renderer at {render_fps:g} FPS, LEDs at 45 FPS, {num_leds} LEDs, {seconds:g} s")
+    for mode in (None,) + INTERPOLATION:
+        device = CountingOutput(num_leds)
+        worker = OutputWorker(device, 45, interpolate=mode).start()
+        frame = np.empty((num_leds, 4), dtype=np.uint8)
+        start = time.perf_counter()
+        i = 0
+        while time.perf_counter() - start < seconds:
+            frame[:] = (ramp + np.uint8(16 * i % 256))[:, None]
+            worker.submit(frame)
+            i += 1
+            time.sleep(max(0.0, start + i / render_fps - time.perf_counter()))
+        worker.stop(blank=False)
+        stats = worker.stats()
+        print(f"  {str(mode):7s} refresh {stats['frames'] / seconds:5.1f} FPS, "
+              f"{device.distinct / seconds:5.1f} distinct/s, "
+              f"measured render {stats.get('render_fps', '-')}")
+
+    worker = OutputWorker(CountingOutput(num_leds), 45, interpolate="linear")
+    worker._add_keyframe(np.zeros((num_leds, 4), np.uint8), 0.0)
+    worker._add_keyframe(np.full((num_leds, 4), 255, np.uint8), 1.0)
+    repeat = 500
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        worker._frame_at(1.0 + worker.render_interval / 2)
+    print(f"\nlinear blend: {(time.perf_counter() - t0) / repeat * 1e3:.3f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Compare one SPI chain against the same LEDs split over several buses, using
+FakeSpiDevs that sleep for the real wire time (1.25 µs per SPI byte at
+6.4 MHz) and record every transfer.
+
+    python3 -m benchmarks.bench_multibus [num_leds] [buses]
+"""
+import sys
+import time
+import numpy as np
+
+from ws2814 import WS2814, FakeSpiDev, MultiBusOutput
+from ws2814.encoding import encode_rgbw
+
+WIRE_SECONDS_PER_BYTE = 8 / 6.4e6
+
+
+def fake(path):
+    return FakeSpiDev(delay_per_byte=WIRE_SECONDS_PER_BYTE)
+
+
+def frame_time(strip, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        strip.update_strip()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    num_leds = int(sys.argv[1]) if len(sys.argv) > 1 else 2048
+    buses = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(num_leds, 4), dtype=np.uint8)
+
+    single = WS2814('/dev/spidev0.0', num_leds, spi=fake(None))
+    single.set_frame(frame)
+
+    per_bus = -(-num_leds // buses)
+    segments = [(f'/dev/spidev{i // 2}.{i % 2}', i * per_bus,
+                 min(per_bus, num_leds - i * per_bus)) for i in range(buses)]
+    multi = MultiBusOutput(segments, spi_factory=fake)
+    multi.set_frame(frame)
+
+    # every bus must carry exactly its slice of the frame
+    multi.update_strip()
+    for strip, (dev, start, count) in zip(multi.strips, segments):
+        payload = strip.spi.sent_bytes()[-len(strip.tx_buffer):]
+        expected = encode_rgbw(frame[start:start + count]).tobytes()
+        assert payload[strip.pause_bytes:-strip.pause_bytes] == expected, dev
+        last = strip.spi.transfers[-1][0]
+        print(f"{dev}: LEDs {start}-{start + count - 1}, "
+              f"{len(payload)} bytes, finished at t={last:.4f}s")
+
+    t1 = frame_time(single)
+    tn = frame_time(multi)
+    print(f"1 bus     : {t1 * 1e3:7.2f} ms/frame  ({1 / t1:5.1f} FPS)")
+    print(f"{buses} buses   : {tn * 1e3:7.2f} ms/frame  ({1 / tn:5.1f} FPS)")
+    print("per-bus ms:", ", ".join(f"{s * 1e3:.2f}" for s in multi.bus_seconds))
+    multi.close()
+
+
+if __name__ == "__main__":
+    main()
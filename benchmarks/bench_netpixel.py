@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Send frames through every network output backend to a local UdpSink,
+check the reassembled pixels match and report packets per second.  DDP
+and Art-Net streams with sequence numbers off (all 0) are also fed through
+a FrameAssembler, which must get every frame.
+
+    python3 -m benchmarks.bench_netpixel [num_leds] [frames]
+"""
+import sys
+import time
+import numpy as np
+
+from netpixel import FrameAssembler, PacketSet, parse_packet
+from outputs import open_output
+from benchmarks.udp_sink import UdpSink
+
+PORT = 49048
+
+
+def reassemble(received, protocol, universe_start, frame_bytes):
+    flat = bytearray(frame_bytes)
+    pos = 0
+    for info in received:
+        data = info["data"]
+        if protocol == "ddp":
+            pos = info["offset"]
+        else:
+            pos = (info["universe"] - universe_start) * (512 // 4 * 4)
+        n = min(len(data), frame_bytes - pos)
+        flat[pos:pos + n] = data[:n]
+    return bytes(flat)
+
+
+def check_unsequenced(protocol, frame, frames=10):
+    """Every frame of a sequence-0 stream reassembles; returns the count"""
+    packets = PacketSet(protocol, len(frame))
+    assembler = FrameAssembler(protocol, len(frame))
+    got = 0
+    for i in range(frames):
+        data = (frame + np.uint8(i)).tobytes()
+        for packet in packets.fill(data):
+            packet[1 if protocol == "ddp" else 12] = 0
+            out = assembler.feed(parse_packet(bytes(packet)), time.perf_counter())
+            if out is not None:
+                assert out == data, f"{protocol}: unsequenced frame {i} differs"
+                got += 1
+    assert got == frames and assembler.late == 0 and assembler.incomplete == 0, \
+        f"{protocol} unsequenced: {got}/{frames} frames, {assembler.late} late, " \
+        f"{assembler.incomplete} incomplete"
+    return got
+
+
+def main():
+    num_leds = int(sys.argv[1]) if len(sys.argv) > 1 else 640
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(num_leds, 4), dtype=np.uint8)
+
+    for protocol in ("ddp", "e131", "artnet"):
+        # layout check: one frame, keep every packet
+        sink = UdpSink(PORT, keep=True).start()
+        out = open_output(num_leds, protocol, port=PORT)
+        out.set_frame(frame)
+        out.update_strip()
+        time.sleep(0.2)
+        sink.stop()
+        got = reassemble(sink.received, protocol, out.packets.universe_start, frame.size)
+        assert sink.errors == 0, sink.last_error
+        assert got == frame.tobytes(), f"{protocol}: reassembled frame differs"
+        if protocol != "e131":
+            print(f"{protocol:6s}: sequence 0, {check_unsequenced(protocol, frame)} frames "
+                  f"reassembled")
+
+        # throughput
+        sink = UdpSink(PORT).start()
+        out.packets_sent = 0
+        start = time.perf_counter()
+        for _ in range(frames):
+            out.update_strip()
+        send_s = time.perf_counter() - start
+        time.sleep(0.2)
+        sink.stop()
+        out.close()
+        sent = out.packets_sent
+        print(f"{protocol:6s}: layout OK, {len(out.packets.packets)} packets/frame, "
+              f"sent {sent / send_s:9.0f} pkt/s ({frames / send_s:6.0f} FPS), "
+              f"received {sink.packets}/{sent} ({sink.rate():.0f} pkt/s), "
+              f"dropped at sender {out.packets_dropped}")
+
+
+if __name__ == "__main__":
+    main()
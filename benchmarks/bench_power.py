@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Per-frame cost of the power limiter (power.PowerLimiter) with a few
+injection segments.  First checks its per-segment estimate against a
+plain per-LED sum and that overlapping segments are rejected.
+
+    python3 -m benchmarks.bench_power [num_leds ...]      # default 640 10000
+"""
+import sys
+import time
+import numpy as np
+
+from power import PowerLimiter
+
+MA = (20.0, 20.0, 20.0, 20.0)
+IDLE = 1.0
+
+
+def time_it(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def segments_for(num_leds, count=4):
+    """`count` injection segments with a gap after each"""
+    size = num_leds // count
+    return [(i * size, size - size // 4, 2000) for i in range(count)]
+
+
+def check(num_leds, rng):
+    frame = rng.integers(0, 256, size=(num_leds, 4), dtype=np.uint8)
+    segments = segments_for(num_leds)
+    limiter = PowerLimiter(num_leds, MA, IDLE, None, segments)
+    total, per_segment = limiter.estimate(frame)
+    per_led = frame @ (np.array(MA) / 255) + IDLE
+    assert np.isclose(total, per_led.sum(), rtol=1e-5)
+    expect = [per_led[start:start + count].sum() for start, count, _ in segments]
+    assert np.allclose(per_segment, expect, rtol=1e-5), "segment draw differs from per-LED sum"
+
+    try:
+        PowerLimiter(num_leds, MA, IDLE, None, [(0, 200, 2000), (100, 200, 2000)])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("overlapping power segments were accepted")
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [640, 10_000]
+    rng = np.random.default_rng(0)
+    check(640, rng)
+    print("segment estimate matches per-LED sum; overlapping segments rejected: OK")
+
+    print(f"{'LEDs':>6s} {'estimate':>10s} {'limit':>10s}")
+    for num_leds in sizes:
+        frame = rng.integers(0, 256, size=(num_leds, 4), dtype=np.uint8)
+        out = np.empty_like(frame)
+        limiter = PowerLimiter(num_leds, MA, IDLE, num_leds * 10.0, segments_for(num_leds))
+        repeat = max(20, 200_000 // num_leds)
+        t_est = time_it(lambda: limiter.estimate(frame), repeat)
+        t_apply = time_it(lambda: limiter.apply(frame, out), repeat)
+        print(f"{num_leds:6d} {t_est * 1e3:8.3f}ms {t_apply * 1e3:8.3f}ms")
+    print(f"\nbudget: {1e3 / 45:.3f} ms/frame at 45 FPS")
+
+
+if __name__ == "__main__":
+    main()
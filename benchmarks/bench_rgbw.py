@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Per-frame cost of each RGB→RGBW split strategy: the array split on its own
+(rgbw.rgb_to_rgbw) and the full compiled color chain (ColorPipeline),
+whose per-frame cost does not depend on the strategy; switching strategy
+only costs one LUT rebuild.  First checks the array hsv split against the
+per-pixel colorsys version it replaces.
+
+    python3 -m benchmarks.bench_rgbw [num_leds ...]      # default 640 10000
+"""
+import colorsys
+import sys
+import time
+import numpy as np
+
+from color_pipeline import ColorPipeline
+from rgbw import STRATEGIES, rgb_to_rgbw
+
+
+def time_it(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def hsv_reference(r, g, b):
+    """The old per-pixel colorsys split"""
+    h, s, v = colorsys.rgb_to_hsv(r / 255.0, g / 255.0, b / 255.0)
+    pr, pg, pb = colorsys.hsv_to_rgb(h, 1.0, 1.0)
+    c_frac = s * v
+    return (int(pr * c_frac * 255), int(pg * c_frac * 255), int(pb * c_frac * 255),
+            int((1.0 - s) * v * 255))
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [640, 10_000]
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, size=(20_000, 3), dtype=np.uint8)
+    expect = np.array([hsv_reference(*map(int, p)) for p in pixels], dtype=np.uint8)
+    assert np.array_equal(rgb_to_rgbw(pixels, "hsv"), expect), "hsv split differs from colorsys"
+    print(f"hsv   : matches colorsys on {len(pixels)} random pixels")
+
+    pipelines = {}
+    for name in STRATEGIES:
+        start = time.perf_counter()
+        pipelines[name] = ColorPipeline(rgbw=name)
+        print(f"{name:6s}: LUT build {1e3 * (time.perf_counter() - start):6.1f} ms")
+    print()
+
+    print(f"{'LEDs':>6s}  {'strategy':8s} {'split':>9s} {'full chain':>11s}")
+    for num_leds in sizes:
+        frame = rng.integers(0, 256, size=(num_leds, 3), dtype=np.uint8)
+        out = np.empty((num_leds, 4), dtype=np.uint8)
+        repeat = max(20, 200_000 // num_leds)
+        for name, pipeline in pipelines.items():
+            t_split = time_it(lambda: rgb_to_rgbw(frame, name, out), repeat)
+            t_chain = time_it(lambda: pipeline.apply(frame, out), repeat)
+            print(f"{num_leds:6d}  {name:8s} {t_split * 1e3:7.3f}ms {t_chain * 1e3:9.3f}ms")
+    print(f"\nbudget: {1e3 / 45:.3f} ms/frame at 45 FPS")
+
+
+if __name__ == "__main__":
+    main()
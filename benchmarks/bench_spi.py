@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark the SPI send path: the old concatenate-and-list xfer3 path vs. the
+persistent bytearray sent as bufsiz memoryview chunks through writebytes2.
+
+Reports frames/s, payload bytes/s and transient bytes allocated per frame
+(tracemalloc peak) against a FakeSpiDev, so no hardware is needed:
+    python3 -m benchmarks.bench_spi [num_leds]
+"""
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+from ws2814 import WS2814, FakeSpiDev
+from ws2814.encoding import encode_rgbw
+
+
+def legacy_update(strip):
+    """The pre-buffer path: encode, concatenate padding, convert to list"""
+    raw_data = encode_rgbw(strip.led_state, strip.symbol_table)
+    pause = bytes(strip.pause_bytes)
+    spi_message = pause + raw_data.tobytes() + pause
+    strip.spi.xfer3(list(spi_message))
+
+
+def measure(name, fn, strip, repeat=200):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    wire = len(strip.tx_buffer)
+    print(f"{name:9s}: {elapsed * 1e3:7.3f} ms/frame  "
+          f"{wire / elapsed / 1e6:8.1f} MB/s  "
+          f"{peak:9d} bytes allocated/frame")
+
+
+def main():
+    num_leds = int(sys.argv[1]) if len(sys.argv) > 1 else 640
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(num_leds, 4), dtype=np.uint8)
+
+    spi = FakeSpiDev(record=False)
+    strip = WS2814('/dev/spidev0.0', num_leds, spi=spi)
+    strip.set_frame(frame)
+    print(f"{num_leds} LEDs, {len(strip.tx_buffer)} bytes per frame, bufsiz {strip.bufsiz}")
+
+    # both paths must put identical bytes on the wire
+    check = FakeSpiDev()
+    strip.spi = check
+    legacy_update(strip)
+    old = check.sent_bytes()
+    check.transfers.clear()
+    strip.update_strip()
+    assert check.sent_bytes() == old, "buffered path differs from legacy path"
+    strip.spi = spi
+
+    measure("legacy", lambda: legacy_update(strip), strip)
+    measure("buffered", strip.update_strip, strip)
+
+
+if __name__ == "__main__":
+    main()
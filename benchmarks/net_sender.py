@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test sender for net_node.py: streams a moving gradient as DDP / E1.31 /
+Art-Net, optionally dropping or reordering packets so the node's
+incomplete / late frame handling can be exercised.
+
+    python3 -m benchmarks.net_sender [--protocol ddp] [--fps 45] [--seconds 10]
+    python3 -m benchmarks.net_sender --drop 0.01 --reorder 0.02
+"""
+import argparse
+import random
+import socket
+import time
+import numpy as np
+
+from netpixel import PROTOCOLS, DEFAULT_PORTS, PacketSet
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="send test frames to a pixel node")
+    p.add_argument("--protocol", choices=PROTOCOLS, default="ddp")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int)
+    p.add_argument("--leds", type=int, default=640)
+    p.add_argument("--channels", type=int, choices=(3, 4), default=4)
+    p.add_argument("--fps", type=float, default=45.0)
+    p.add_argument("--seconds", type=float, default=10.0)
+    p.add_argument("--drop", type=float, default=0.0, help="probability of dropping a packet")
+    p.add_argument("--reorder", type=float, default=0.0,
+                   help="probability of holding a packet back into the next frame")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    port = args.port or DEFAULT_PORTS[args.protocol]
+    packets = PacketSet(args.protocol, args.leds, args.channels)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect((args.host, port))
+
+    ramp = np.arange(args.leds, dtype=np.uint16)
+    frame = np.zeros((args.leds, args.channels), dtype=np.uint8)
+    held = []
+    sent = dropped = reordered = 0
+    period = 1.0 / args.fps
+    total = int(args.seconds * args.fps)
+    next_t = time.perf_counter()
+    for n in range(total):
+        frame[:, 0] = (ramp + 4 * n) & 0xFF
+        frame[:, 1] = (ramp * 3 + 2 * n) & 0xFF
+        frame[:, 2] = 255 - frame[:, 0]
+        for i, packet in enumerate(packets.fill(frame)):
+            if i == 1:
+                # packets held back from the last frame arrive after this one has started
+                for late in held:
+                    sock.send(late)
+                held.clear()
+            r = random.random()
+            if r < args.drop:
+                dropped += 1
+                continue
+            if r < args.drop + args.reorder:
+                held.append(bytes(packet))
+                reordered += 1
+                continue
+            sock.send(packet)
+            sent += 1
+        next_t += period
+        time.sleep(max(0.0, next_t - time.perf_counter()))
+
+    print(f"{total} frames to {args.host}:{port} ({args.protocol}, "
+          f"{len(packets.packets)} packets/frame): {sent} sent, "
+          f"{dropped} dropped, {reordered} reordered")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for a DDP / E1.31 / Art-Net controller: receives packets,
+checks their layout with netpixel.parse_packet and reports packets/s.
+
+    python3 -m benchmarks.udp_sink [port]          # default 4048 (DDP)
+"""
+import socket
+import sys
+import threading
+import time
+
+from netpixel import parse_packet
+
+
+class UdpSink:
+    """Counts and validates packets on a UDP port (runs in a thread)"""
+
+    def __init__(self, port, host="127.0.0.1", keep=False):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+        self.sock.bind((host, port))
+        self.sock.settimeout(0.2)
+        self.keep = keep          # keep parsed packets for inspection
+        self.received = []
+        self.packets = 0
+        self.errors = 0
+        self.last_error = None
+        self.first = self.last = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        buf = bytearray(2048)
+        while not self._stop.is_set():
+            try:
+                n = self.sock.recv_into(buf)
+            except socket.timeout:
+                continue
+            now = time.perf_counter()
+            self.first = self.first or now
+            self.last = now
+            try:
+                info = parse_packet(buf[:n])
+            except ValueError as e:
+                self.errors += 1
+                self.last_error = e
+                continue
+            self.packets += 1
+            if self.keep:
+                info["data"] = bytes(info["data"])
+                self.received.append(info)
+
+    def rate(self):
+        if not self.first or self.last == self.first:
+            return 0.0
+        return self.packets / (self.last - self.first)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sock.close()
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 4048
+    sink = UdpSink(port, host="0.0.0.0").start()
+    print(f"listening on udp/{port}, Ctrl-C to stop")
+    try:
+        while True:
+            before = sink.packets
+            time.sleep(1.0)
+            print(f"{sink.packets - before:7d} packets/s  "
+                  f"total {sink.packets}  bad {sink.errors}"
+                  + (f"  ({sink.last_error})" if sink.last_error else ""))
+    except KeyboardInterrupt:
+        sink.stop()
+
+
+if __name__ == "__main__":
+    main()
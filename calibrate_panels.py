@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# calibrate_panels.py
+"""
+Flat test fields for tuning per-panel calibration (calibration.py).
+
+Every panel shows the same flat color, corrected through its own profile,
+so batches that don't match stand out.  Step through white / grey / red /
+green / blue fields, change the level, and edit the calibration file until
+neighbouring panels look the same; the file is re-read on every field.
+
+    python3 calibrate_panels.py                     # all panels, level 64
+    python3 calibrate_panels.py --panel 3 --level 16
+    python3 calibrate_panels.py --raw               # uncorrected, for comparison
+    LED_OUTPUT=simulator python3 calibrate_panels.py
+
+With a layout file (config.LAYOUT_FILE) panels are numbered as in the file
+and --panels / --leds-per-panel are ignored.
+
+Keys (then Enter):  Enter next field · b previous · + / - level ×2 / ÷2 ·
+                    r reload file · q quit
+"""
+
+import argparse
+import os
+import numpy as np
+
+import config
+from calibration import PanelCalibration, load_calibration
+from layout import load_layout
+from outputs import open_output
+
+FIELDS = [
+    ("white (W)",   (0, 0, 0, 1)),
+    ("white (RGB)", (1, 1, 1, 0)),
+    ("red",         (1, 0, 0, 0)),
+    ("green",       (0, 1, 0, 0)),
+    ("blue",        (0, 0, 1, 0)),
+]
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="per-panel calibration test fields")
+    p.add_argument("--file", default=config.CALIBRATION_FILE, help="calibration JSON")
+    p.add_argument("--panels", type=int, default=10, help="panels in the chain")
+    p.add_argument("--leds-per-panel", type=int, default=64)
+    p.add_argument("--level", type=int, default=64, help="field level 1..255")
+    p.add_argument("--panel", type=int, help="light only this panel (chain order)")
+    p.add_argument("--raw", action="store_true", help="skip calibration")
+    return p.parse_args()
+
+
+def load(args, led_panel):
+    num_leds = len(led_panel)
+    if args.raw:
+        return PanelCalibration(num_leds, led_panel=led_panel)
+    calibration = load_calibration(args.file, num_leds, led_panel=led_panel)
+    if calibration is None:
+        print(f"{args.file} not found; showing uncorrected fields")
+        return PanelCalibration(num_leds, led_panel=led_panel)
+    if "default" not in calibration.spec:
+        print("note: no \"default\" profile in the file; unlisted panels are uncorrected here")
+    return calibration
+
+
+def main():
+    args = parse_args()
+    if config.LAYOUT_FILE and os.path.exists(config.LAYOUT_FILE):
+        led_panel = load_layout(config.LAYOUT_FILE).led_panel
+    else:
+        led_panel = np.repeat(np.arange(args.panels), args.leds_per_panel)
+    num_leds = len(led_panel)
+    num_panels = int(led_panel.max()) + 1
+    leds = open_output(num_leds)
+    calibration = load(args, led_panel)
+    for panel in range(num_panels):
+        name = calibration.names[calibration.profile[np.argmax(led_panel == panel)]]
+        print(f"panel {panel:2d}: {name}")
+
+    if args.panel is None:
+        mask = led_panel >= 0
+    else:
+        mask = led_panel == args.panel
+
+    field, level = 0, max(1, min(255, args.level))
+    frame = np.zeros((num_leds, 4), dtype=np.uint8)
+    try:
+        while True:
+            name, color = FIELDS[field]
+            frame[:] = 0
+            frame[mask] = np.array(color) * level
+            leds.set_frame(calibration.apply(frame))
+            leds.update_strip()
+            key = input(f"[{field + 1}/{len(FIELDS)}] {name} @ {level} > ").strip().lower()
+            if key == "q":
+                break
+            elif key == "b":
+                field = (field - 1) % len(FIELDS)
+            elif key == "+":
+                level = min(255, level * 2)
+            elif key == "-":
+                level = max(1, level // 2)
+            elif key == "r":
+                calibration = load(args, led_panel)
+            else:
+                field = (field + 1) % len(FIELDS)
+                calibration = load(args, led_panel)
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        leds.clear_strip()
+        leds.update_strip()
+        leds.close()
+
+
+if __name__ == "__main__":
+    main()
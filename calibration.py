@@ -0,0 +1,152 @@
+# calibration.py
+"""
+Per-panel (and per-LED) gamma / scale calibration.
+
+One init_gamma() curve can't match panels from different production
+batches, so the calibration file names a few profiles and assigns them to
+panels (chain order) or single LEDs.  Everything compiles to one
+(profiles × 4 × 256) uint8 table plus a per-LED offset into it, so
+correcting a frame is a single np.take whatever the number of profiles.
+
+File format (JSON, e.g. calibration.json):
+
+    {
+      "leds_per_panel": 64,
+      "default":  {"gamma": {"r": 0.65, "g": 0.65, "b": 0.65, "w": 0.65},
+                   "scale": {"r": 1.25, "g": 1.25, "b": 1.25, "w": 1.25}},
+      "profiles": {
+        "batch_b": {"gamma": {"g": 0.7}, "scale": {"g": 1.1, "b": 1.3}}
+      },
+      "panels":   {"3": "batch_b", "4": "batch_b"},
+      "leds":     {"130": "default"}
+    }
+
+"default" covers every LED not listed (without it, the current gamma.py
+tables are used); channels a profile leaves out inherit from "default".
+Panel numbers count along the chain.  Given the wall layout's per-LED
+panel array (layout.WallLayout.led_panel) they follow the layout file;
+otherwise panel p is LEDs p·leds_per_panel … (p+1)·leds_per_panel − 1.
+Frames passed to apply() are in physical order.
+
+With bits=16 the tables keep the unrounded curves in 8.8 fixed point and
+apply() returns uint16, for dither.TemporalDither at the output.
+"""
+
+import json
+import os
+import numpy as np
+
+import gamma
+from framepool import FramePool
+
+__all__ = ["PanelCalibration", "load_calibration"]
+
+CHANNELS = ("r", "g", "b", "w")
+
+
+def _profile_tables(profile, base, exact=False):
+    """(4, 256) gamma+scale tables for one profile dict, rounded down unless exact"""
+    gammas = {**base.get("gamma", {}), **profile.get("gamma", {})}
+    scales = {**base.get("scale", {}), **profile.get("scale", {})}
+    rows = []
+    for ch in CHANNELS:
+        if exact:
+            rows.append(np.minimum(255, gamma.make_gamma_curve(gammas.get(ch, 1.0))
+                                   * scales.get(ch, 1.0)))
+        else:
+            lut = np.array(gamma.make_gamma_lut(gammas.get(ch, 1.0)), dtype=np.float64)
+            rows.append(np.minimum(255, np.floor(lut * scales.get(ch, 1.0))))
+    return np.array(rows)
+
+
+class PanelCalibration:
+    """
+    num_leds:   LEDs in the chain
+    spec:       parsed calibration file (see module docstring)
+    brightness: global 0..1 multiplier folded into every table
+    led_panel:  optional (num_leds,) panel number of every LED, -1 for none
+    bits:       8 for uint8 output, 16 for uint16 8.8 fixed point
+    pool:       framepool.FramePool for apply()'s index scratch (default: own)
+    """
+
+    def __init__(self, num_leds, spec=None, brightness=1.0, led_panel=None, bits=8,
+                 pool=None):
+        if bits not in (8, 16):
+            raise ValueError("output bits must be 8 or 16")
+        self.num_leds = num_leds
+        self.spec = spec or {}
+        self.brightness = brightness
+        self.bits = bits
+        self.dtype = np.uint16 if bits == 16 else np.uint8
+        self._own_pool = pool is None
+        self.pool = FramePool() if pool is None else pool
+        leds_per_panel = int(self.spec.get("leds_per_panel", 64))
+
+        # profile 0 is the default; the rest in file order
+        self.names = ["default"] + [n for n in self.spec.get("profiles", {}) if n != "default"]
+        index = {name: i for i, name in enumerate(self.names)}
+
+        def lookup(name):
+            if name not in index:
+                raise ValueError(f"calibration refers to unknown profile {name!r}")
+            return index[name]
+
+        profile = np.zeros(num_leds, dtype=np.intp)
+        for panel, name in self.spec.get("panels", {}).items():
+            if led_panel is not None:
+                profile[np.asarray(led_panel) == int(panel)] = lookup(name)
+            else:
+                start = int(panel) * leds_per_panel
+                profile[start:start + leds_per_panel] = lookup(name)
+        for led, name in self.spec.get("leds", {}).items():
+            if 0 <= int(led) < num_leds:
+                profile[int(led)] = lookup(name)
+        self.profile = profile
+        # per-LED, per-channel offset of its table row in the flat table
+        self._offsets = profile[:, None] * 1024 + np.arange(4, dtype=np.intp) * 256
+        self.compile()
+
+    def compile(self):
+        """Rebuild the tables (after a brightness change or new init_gamma())"""
+        base = self.spec.get("default")
+        profiles = self.spec.get("profiles", {})
+        exact = self.bits == 16
+        if base is None:
+            tables = [gamma.gamma_curves() if exact else gamma.gamma_tables()]
+        else:
+            tables = [_profile_tables(base, {}, exact)]
+        for name in self.names[1:]:
+            tables.append(_profile_tables(profiles[name], base or {}, exact))
+        tables = np.array(tables, dtype=np.float64) * self.brightness
+        if exact:
+            tables = np.rint(tables * 256)
+        self.tables = np.floor(tables).astype(self.dtype)   # (profiles, 4, 256)
+        self._flat = self.tables.reshape(-1)
+
+    def update(self, brightness):
+        if brightness != self.brightness:
+            self.brightness = brightness
+            self.compile()
+
+    def apply(self, frame, out=None):
+        """Correct an (N,4) RGBW frame in physical order → (N,4) of self.dtype"""
+        frame = np.asarray(frame)
+        if frame.dtype != np.uint8:
+            frame = np.clip(frame, 0, 255).astype(np.uint8)
+        if out is None:
+            out = np.empty(frame.shape, dtype=self.dtype)
+        idx = self.pool.take(frame.shape, np.intp)
+        np.add(frame, self._offsets[:len(frame)], out=idx)
+        np.take(self._flat, idx, out=out, mode="clip")
+        if self._own_pool:
+            self.pool.recycle()
+        return out
+
+
+def load_calibration(path, num_leds, brightness=1.0, led_panel=None, bits=8, pool=None):
+    """PanelCalibration from a JSON file, or None if the file doesn't exist"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        spec = json.load(f)
+    return PanelCalibration(num_leds, spec, brightness, led_panel, bits, pool)
@@ -0,0 +1,294 @@
+# color_pipeline.py
+"""
+Compiled RGB → RGBW color correction for the LED output.
+
+The output chain — warm-white compensation, RGBW split, per-channel
+gamma/scale (gamma.py) and global brightness — is evaluated once over an
+RGB grid and stored as a 3D lookup table.  Correcting a frame is then a
+single NumPy gather (nearest) or eight (trilinear) instead of four Python
+function calls per pixel.  The table is rebuilt only when one of its
+inputs changes (update(), or compile() after a new init_gamma()).
+
+    color = ColorPipeline(brightness=0.3)
+    rgbw = color.apply(frame)        # (N,3|4) → (N,4) uint8
+
+size=256 gives the full 256³ table (64 MB), which with nearest lookup is
+bit-exact with the scalar chain; the default 33³ trilinear table is
+~0.6 MB and stays within one or two levels of it.
+
+bits=16 keeps what the 8-bit chain rounds away: the table holds the
+unrounded gamma curves (gamma.gamma_curves()) times brightness in 8.8
+fixed point, apply() returns uint16, and dither.TemporalDither brings the
+frame down to 8 bits at the output.
+
+Compiled tables are cached as .npy files under LED_LUT_CACHE (default
+cache/luts/), named by a hash of everything that goes into them: the
+gamma.py tables, RGBW strategy, warm-white factors, brightness, size and
+mode.  They are opened with mmap_mode="r", so a restart with unchanged
+calibration skips the build and processes using the same settings share
+one copy of the table in the page cache.  The directory is kept under
+LED_LUT_CACHE_MB (default 256 MB) by deleting the least recently used
+tables, so sweeping the brightness doesn't fill the disk.
+"""
+
+import hashlib
+import os
+import numpy as np
+
+import gamma
+from framepool import FramePool
+from rgbw import get_strategy
+
+__all__ = ["ColorPipeline", "WARM_WHITE"]
+
+# warm-white LED tint correction: pull red/green down, push blue up
+WARM_WHITE = (0.92, 0.96, 1.10)
+
+CACHE_DIR = os.environ.get("LED_LUT_CACHE", "cache/luts")
+# cache size cap; older tables are pruned least recently used first
+CACHE_MAX_BYTES = int(float(os.environ.get("LED_LUT_CACHE_MB", 256)) * 2**20)
+# bump when evaluate() changes so old cache files are not reused
+_CACHE_VERSION = 2
+
+
+def _prune_cache(cache_dir, keep, max_bytes=None):
+    """
+    Delete the least recently used tables until the cache fits max_bytes
+    (default CACHE_MAX_BYTES); `keep` is never deleted.  Tables still
+    mapped by a running process stay readable until it unmaps them.
+    """
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    try:
+        files = []
+        for entry in os.scandir(cache_dir):
+            if entry.name.startswith("lut-") and entry.name.endswith(".npy"):
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+class ColorPipeline:
+    """
+    size:       grid points per axis (2..256); 256 is the full table
+    mode:       "trilinear" or "nearest"
+    brightness: global 0..1 multiplier
+    warm_white: (r, g, b) tint factors, or None to skip
+    rgbw:       RGB → RGBW split strategy name (see rgbw.STRATEGIES)
+    with_gamma: False stops the chain after the RGBW split (no gamma, scale
+                or brightness), for a later per-LED stage such as
+                calibration.PanelCalibration
+    bits:       8 for uint8 output, 16 for uint16 8.8 fixed point (only
+                with with_gamma; the split alone is always uint8)
+    cache_dir:  where compiled tables are kept; None disables the cache
+    pool:       framepool.FramePool for apply()'s scratch arrays, returned
+                at the owner's recycle(); by default a private one
+    """
+
+    def __init__(self, size=33, mode="trilinear", brightness=1.0,
+                 warm_white=WARM_WHITE, rgbw="extra", with_gamma=True, bits=8,
+                 cache_dir=CACHE_DIR, pool=None):
+        if mode not in ("trilinear", "nearest"):
+            raise ValueError(f"unknown LUT mode {mode!r}")
+        if not 2 <= size <= 256:
+            raise ValueError("LUT size must be between 2 and 256")
+        if bits not in (8, 16):
+            raise ValueError("output bits must be 8 or 16")
+        self.size = size
+        self.mode = mode
+        self.brightness = brightness
+        self.warm_white = warm_white
+        self.rgbw = rgbw
+        self.with_gamma = with_gamma
+        self.bits = bits if with_gamma else 8
+        self.dtype = np.uint16 if self.bits == 16 else np.uint8
+        self.cache_dir = cache_dir
+        self.cache_path = None       # file the current table is mapped from
+        self._own_pool = pool is None
+        self.pool = FramePool() if pool is None else pool
+        self.builds = 0
+        self.compile()
+
+    # ─── building ─────────────────────────────────────────────────────────
+    def update(self, **settings):
+        """Change brightness / warm_white / rgbw; recompiles only on change"""
+        changed = False
+        for name, value in settings.items():
+            if name not in ("brightness", "warm_white", "rgbw"):
+                raise TypeError(f"unknown color setting {name!r}")
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                changed = True
+        if changed:
+            self.compile()
+        return changed
+
+    def evaluate(self, r, g, b):
+        """
+        Run the full correction chain on float arrays of 0..255 values and
+        return (M,4) float RGBW; mirrors the old per-pixel integer code
+        (with bits=16: unrounded, in 8.8 fixed point).
+        """
+        if self.warm_white is not None:
+            kr, kg, kb = self.warm_white
+            r = np.minimum(np.floor(r * kr), 255)
+            g = np.minimum(np.floor(g * kg), 255)
+            b = np.minimum(np.floor(b * kb), 255)
+        rgbw = get_strategy(self.rgbw)(r, g, b)
+        if not self.with_gamma:
+            return np.clip(np.column_stack(rgbw), 0, 255)
+
+        # gamma.py tables (scale included), interpolated between integer inputs
+        levels = np.arange(256)
+        tables = gamma.gamma_curves() if self.bits == 16 else gamma.gamma_tables()
+        out = np.empty((len(r), 4))
+        for ch in range(4):
+            x = np.clip(rgbw[ch], 0, 255)
+            out[:, ch] = np.interp(x, levels, tables[ch])
+        if self.bits == 16:
+            return np.minimum(out * (self.brightness * 256), 255 * 256)
+        return np.floor(out * self.brightness)
+
+    def cache_key(self):
+        """Hash of every input to the table"""
+        settings = (_CACHE_VERSION, self.size, self.mode, float(self.brightness),
+                    None if self.warm_white is None else tuple(map(float, self.warm_white)),
+                    self.rgbw, self.with_gamma, self.bits)
+        digest = hashlib.sha1(repr(settings).encode())
+        if self.bits == 16:
+            digest.update(gamma.gamma_curves().tobytes())
+        elif self.with_gamma:
+            digest.update(gamma.gamma_tables().tobytes())
+        return digest.hexdigest()[:16]
+
+    def compile(self):
+        """Load the table for the current settings from the cache, or build it"""
+        n = self.size
+        self._strides = np.array([n * n, n, 1], dtype=np.intp)
+        path = None
+        if self.cache_dir is not None:
+            path = os.path.join(self.cache_dir,
+                                f"lut-{self.mode}-{n}-{self.bits}-{self.cache_key()}.npy")
+            if os.path.exists(path):
+                try:
+                    self._use(np.load(path, mmap_mode="r"), path)
+                    os.utime(path)      # mark as recently used for _prune_cache
+                    return
+                except (OSError, ValueError) as e:
+                    print(f"Ignoring unreadable LUT cache {path}: {e}")
+
+        lut = self._build()
+        self.builds += 1
+        if path is not None:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # write under a temporary name so readers never see half a file
+                tmp = f"{path}.{os.getpid()}.tmp"
+                np.save(tmp, lut)
+                os.replace(tmp + ".npy", path)
+                lut = np.load(path, mmap_mode="r")
+            except OSError as e:
+                print(f"Could not cache color LUT in {self.cache_dir}: {e}")
+                path = None
+            else:
+                _prune_cache(self.cache_dir, keep=path)
+        self._use(lut, path)
+
+    def _use(self, lut, path):
+        self.lut = lut
+        self._flat = lut.reshape(-1, 4)
+        self.cache_path = path
+
+    def _build(self):
+        n = self.size
+        axis = np.linspace(0.0, 255.0, n)
+        dtype = self.dtype if self.mode == "nearest" else np.float32
+        lut = np.empty((n, n, n, 4), dtype=dtype)
+        g, b = np.meshgrid(axis, axis, indexing="ij")
+        g, b = g.reshape(-1), b.reshape(-1)
+        # one red plane at a time keeps the full table's peak memory down
+        for i, red in enumerate(axis):
+            plane = self.evaluate(np.full_like(g, red), g, b)
+            if self.mode == "nearest" and self.bits == 16:
+                plane = np.rint(plane)
+            lut[i] = plane.reshape(n, n, 4)
+        return lut
+
+    # ─── applying ─────────────────────────────────────────────────────────
+    def apply(self, frame, out=None):
+        """
+        Correct a whole frame: (N,3) or (N,4) RGB[W] (W ignored) → (N,4)
+        RGBW of self.dtype, written into `out` if given.  Scratch space
+        comes from self.pool, so a warm pipeline allocates nothing.
+        """
+        rgb = np.asarray(frame)[..., :3]
+        if rgb.dtype != np.uint8:
+            rgb = np.clip(rgb, 0, 255).astype(np.uint8)
+        if out is None:
+            out = np.empty(rgb.shape[:-1] + (4,), dtype=self.dtype)
+        rgb = rgb.reshape(-1, 3)
+        flat_out = out.reshape(-1, 4)
+        m = len(rgb)
+        n = self.size
+        take = self.pool.take
+
+        if self.mode == "nearest":
+            idx = take(m, np.intp)
+            if n == 256:
+                np.dot(rgb.astype(np.intp), self._strides, out=idx)
+            else:
+                scaled = take((m, 3), np.intp)
+                np.multiply(rgb, n - 1, out=scaled, dtype=np.intp)
+                scaled += 127
+                scaled //= 255
+                np.dot(scaled, self._strides, out=idx)
+            np.take(self._flat, idx, axis=0, out=flat_out, mode="clip")
+            self._done()
+            return out
+
+        pos = take((m, 3), np.float32)
+        np.multiply(rgb, np.float32((n - 1) / 255), out=pos)
+        i0 = take((m, 3), np.intp)
+        np.copyto(i0, pos, casting="unsafe")
+        np.minimum(i0, n - 2, out=i0)
+        t = take((m, 3), np.float64)                  # weight of the upper corner
+        np.subtract(pos, i0, out=t)
+        u = take((m, 3), np.float64)                  # … and of the lower one
+        np.subtract(1, t, out=u)
+        base = take(m, np.intp)
+        np.dot(i0, self._strides, out=base)
+
+        idx = take(m, np.intp)
+        w = take(m, np.float64)
+        acc = take((m, 4), np.float32)
+        corner = take((m, 4), np.float32)
+        acc[:] = 0
+        for dr in (0, 1):
+            for dg in (0, 1):
+                for db in (0, 1):
+                    np.multiply((t if dr else u)[:, 0], (t if dg else u)[:, 1], out=w)
+                    w *= (t if db else u)[:, 2]
+                    np.add(base, dr * n * n + dg * n + db, out=idx)
+                    # np.take is much faster than fancy indexing here
+                    np.take(self._flat, idx, axis=0, out=corner, mode="clip")
+                    corner *= w[:, None]
+                    acc += corner
+        acc += 0.5
+        np.copyto(flat_out, acc, casting="unsafe")
+        self._done()
+        return out
+
+    def _done(self):
+        if self._own_pool:
+            self.pool.recycle()
@@ -1,4 +1,5 @@
 import colorsys
+import numpy as np
 
 def make_colormap_from_anchors(anchors, resolution=256, easing="linear"):
     def is_hsv(color):
@@ -218,3 +219,16 @@ COLORMAPS = {
         (255, 255, 64), (64, 255, 255), (255, 64, 255)
     ] * 36,
 }
+
+
+# the same tables as (n, 3) uint8 arrays, for patterns drawing with NumPy
+_ARRAYS = {}
+
+
+def colormap_array(name, fallback="jet"):
+    """COLORMAPS[name] (or COLORMAPS[fallback]) as a cached (n, 3) uint8 array"""
+    if name not in COLORMAPS:
+        name = fallback
+    if name not in _ARRAYS:
+        _ARRAYS[name] = np.array(COLORMAPS[name], dtype=np.uint8).reshape(-1, 3)
+    return _ARRAYS[name]
@@ -1,4 +1,53 @@
 MATRIX_WIDTH = 24
 MATRIX_HEIGHT = 24
-USE_SIMULATOR = True  # Set False to use real NeoPixel output
-GPIO_PIN = 18
\ No newline at end of file
+# legacy: only main.py's Wall reads this (True is the equivalent of
+# LED_OUTPUT=simulator, False drives a NeoPixel strip on GPIO_PIN); every
+# other entry point picks its LEDs with OUTPUT_BACKEND below
+USE_SIMULATOR = True
+GPIO_PIN = 18
+
+# LED output backend: "ws2814", "multibus", "simulator", "null", "record",
+# or "ddp", "e131", "artnet" (UDP to LED_NET_HOST, see outputs/network.py)
+# (the LED_OUTPUT environment variable overrides this)
+OUTPUT_BACKEND = "ws2814"
+SPI_DEVICE = "/dev/spidev0.0"
+# LED chipset profile: "ws2814", "sk6812", "ws2812b" or "ws2811"
+CHIPSET = "ws2814"
+# for "multibus": (spi_device, first_led, led_count[, chipset]) per bus
+SPI_SEGMENTS = [("/dev/spidev0.0", 0, 640)]
+
+# RGB→RGBW split for the LED output: "extra", "min", "luma" or "hsv"
+# (touch_ui can switch it live from the "W:" dropdown)
+RGBW_STRATEGY = "extra"
+
+# per-panel gamma/scale calibration (see calibration.py); ignored if missing
+CALIBRATION_FILE = "calibration.json"
+
+# wall geometry (see layout.py); without this file each program uses its
+# own PANEL_WIDTH/PANELS_X/... grid
+LAYOUT_FILE = "layout.json"
+
+# color-chain precision for touch_ui: 16 keeps fractional levels (8.8 fixed
+# point) and temporally dithers them to 8 bits at the output, so dark
+# gradients don't band at low brightness; 8 is the plain 8-bit chain
+OUTPUT_BITS = 16
+
+# power limiter (see power.py): frames that would draw more than the budget
+# are scaled down at the output.  mA per channel at full scale (r, g, b, w)
+# and idle mA per LED — measure your strip; these are typical 5 V RGBW
+LED_MA_PER_CHANNEL = (12.0, 12.0, 12.0, 18.0)
+LED_IDLE_MA = 1.0
+# PSU budget for the whole chain in mA (None: no limit)
+POWER_BUDGET_MA = 20000
+# per power-injection segment: (first_led, count, budget_ma)
+POWER_SEGMENTS = []
+
+# touch_ui LED refresh when rendering can't keep up (see output_worker.py):
+# "linear" blends the last two rendered frames, "hold" repeats the newest,
+# None sends frames only as they are rendered
+OUTPUT_INTERPOLATION = "linear"
+
+# run touch_ui's LED output in a process of its own, fed through shared
+# memory (see frame_ring.py), so SPI transfers don't compete with rendering
+# for the GIL; False keeps it on a thread in the render engine process
+OUTPUT_PROCESS = True
@@ -0,0 +1,52 @@
+# dither.py
+"""
+Temporal dithering from high-bit-depth frames down to 8-bit LED values.
+
+At low brightness the corrected values of a dark gradient span only a few
+of the 256 output levels, so it bands.  The color chain can instead
+produce uint16 frames in 8.8 fixed point (level × 256, up to FULL_SCALE).
+TemporalDither turns those into uint8 and carries each LED's rounding
+error to its next frame, so over a few frames the average output matches
+the fractional level:
+
+    dither = TemporalDither((num_leds, 4))
+    leds.set_frame(dither.apply(frame16))
+
+The error accumulator starts at a random per-LED phase, so a flat area at
+half a level doesn't blink in unison.  All arithmetic stays in uint16
+(FULL_SCALE + 255 fits), and apply() allocates nothing once `out` exists.
+"""
+
+import numpy as np
+
+__all__ = ["TemporalDither", "FULL_SCALE"]
+
+# 8.8 fixed-point value of level 255
+FULL_SCALE = 255 << 8
+
+
+class TemporalDither:
+    """shape: frame shape, normally (num_leds, 4)"""
+
+    def __init__(self, shape, seed=0):
+        self.shape = tuple(shape)
+        rng = np.random.default_rng(seed)
+        self.error = rng.integers(0, 256, size=self.shape, dtype=np.uint16)
+        self._acc = np.empty(self.shape, dtype=np.uint16)
+
+    def reset(self, seed=0):
+        self.error[:] = np.random.default_rng(seed).integers(0, 256, size=self.shape)
+
+    def apply(self, frame, out=None):
+        """(…, C) uint16 8.8 frame → uint8, written into `out` if given"""
+        frame = np.asarray(frame)
+        if frame.dtype != np.uint16:
+            frame = np.clip(frame, 0, FULL_SCALE).astype(np.uint16)
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+        acc = self._acc
+        np.minimum(frame, FULL_SCALE, out=acc)
+        acc += self.error
+        np.bitwise_and(acc, 0xFF, out=self.error)
+        np.right_shift(acc, 8, out=out, casting="unsafe")
+        return out
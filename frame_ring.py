@@ -0,0 +1,210 @@
+# frame_ring.py
+"""
+Frames shared between processes.
+
+A FrameRing is a multiprocessing.shared_memory block holding a few frame
+slots, so a renderer in one process and the LED output (or a recorder, or
+a network preview) in others pass frames without pickling: the writer
+fills a slot in place, the readers map the same memory and copy the slot
+out (one memcpy of a frame).
+
+Layout (all native-endian, readers only need the name):
+
+    header   16 × int64: magic, slots, ndim, shape[4], dtype (as its
+             numpy type string), newest sequence number, slot stride
+    slots    int64 sequence number and float64 perf_counter() stamp per slot
+    frames   `slots` frames of shape/dtype, each 64-byte aligned
+
+Frame n (counting from 1) goes to slot (n - 1) % slots.  A slot's sequence
+number is -1 while the writer fills it and n once published; the header
+holds the newest n.  A reader takes the newest frame, so a slow reader
+skips frames rather than queueing them.  It checks the slot's number
+before and after copying, like a seqlock: if the writer came round to
+the slot in between, the copy may be torn, and it takes the newest frame
+again.  Any number of readers can attach; none of them writes to the
+block.  Writing is not tied to the creator: any handle may write, one at
+a time, and each frame continues from the newest sequence number in the
+header (e.g. the UI blanking the wall after the renderer that fed the
+ring has died).
+
+    ring = FrameRing.create((num_leds, 4))          # renderer
+    ring.back()[:] = frame; ring.publish()          # or ring.write(frame)
+
+    ring = FrameRing.attach(name)                   # output process
+    frame, stamp = ring.read(timeout=0.1)
+
+Stamps are time.perf_counter(), which on Linux is the system-wide
+monotonic clock, so latencies can be measured across processes.
+"""
+
+import multiprocessing
+import sys
+import time
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+
+__all__ = ["FrameRing"]
+
+MAGIC = int.from_bytes(b"LEDRING1", "little")
+HEADER_WORDS = 16
+_SLOTS, _NDIM, _SHAPE, _DTYPE, _SEQ, _STRIDE = 1, 2, 3, 7, 8, 9
+# how often a waiting reader looks for a new frame (seconds)
+POLL_INTERVAL = 0.0005
+# blocks this process created (and so registered with its resource tracker)
+_created = set()
+
+
+def _align(n, to=64):
+    return (n + to - 1) // to * to
+
+
+class FrameRing:
+    """
+    Use FrameRing.create() in the writing process and FrameRing.attach()
+    in readers.  read() has the same contract as
+    output_worker.TripleBuffer.read(), so a ring can feed an OutputWorker.
+    """
+
+    def __init__(self, shm):
+        self.shm = shm
+        self.name = shm.name
+        header = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        if header[0] != MAGIC:
+            raise ValueError(f"shared memory {shm.name!r} is not a frame ring")
+        self.slots = int(header[_SLOTS])
+        ndim = int(header[_NDIM])
+        self.shape = tuple(int(d) for d in header[_SHAPE:_SHAPE + ndim])
+        self.dtype = np.dtype(int(header[_DTYPE]).to_bytes(8, "little").rstrip(b"\0").decode())
+        stride = int(header[_STRIDE])
+        self._header = header
+        offset = HEADER_WORDS * 8
+        self._slot_seq = np.ndarray((self.slots,), dtype=np.int64, buffer=shm.buf, offset=offset)
+        self._slot_stamp = np.ndarray((self.slots,), dtype=np.float64, buffer=shm.buf,
+                                      offset=offset + 8 * self.slots)
+        first = _align(offset + 16 * self.slots)
+        self._frames = [np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf,
+                                   offset=first + i * stride)
+                        for i in range(self.slots)]
+        # writer: sequence number of the frame being filled (set by back())
+        self._next = int(header[_SEQ]) + 1
+        # reader: last sequence number read, and the private copy of it
+        self._last = 0
+        self._copy = None
+        self.dropped = 0      # frames published but superseded before this reader got them
+        self.torn = 0         # copies discarded because the writer overtook them
+
+    @classmethod
+    def create(cls, shape, dtype=np.uint8, slots=4, name=None):
+        """New ring in a new shared-memory block (unlink() it when done)"""
+        if isinstance(shape, int):
+            shape = (shape,)
+        dtype = np.dtype(dtype)
+        if not 1 <= len(shape) <= 4 or slots < 2:
+            raise ValueError("frame ring needs 1 to 4 dimensions and at least 2 slots")
+        stride = _align(int(np.prod(shape)) * dtype.itemsize)
+        size = _align(HEADER_WORDS * 8 + 16 * slots) + slots * stride
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _created.add(shm.name)
+        header = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[0] = MAGIC
+        header[_SLOTS] = slots
+        header[_NDIM] = len(shape)
+        header[_SHAPE:_SHAPE + len(shape)] = shape
+        header[_DTYPE] = int.from_bytes(dtype.str.encode().ljust(8, b"\0"), "little")
+        header[_STRIDE] = stride
+        np.ndarray((slots,), dtype=np.int64, buffer=shm.buf, offset=HEADER_WORDS * 8)[:] = 0
+        del header
+        return cls(shm)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Map an existing ring by name, without making this process
+        responsible for unlinking it
+        """
+        if sys.version_info >= (3, 13):
+            return cls(shared_memory.SharedMemory(name=name, track=False))
+        # before 3.13 attaching registers the block with the resource
+        # tracker, which unlinks it when the tracker's processes are gone.
+        # The registration is taken back only by a process that neither
+        # created the block (its unlink() unregisters it once) nor was
+        # started by multiprocessing (it shares its parent's tracker, where
+        # the creator has registered the block anyway)
+        shm = shared_memory.SharedMemory(name=name)
+        if shm.name not in _created and multiprocessing.parent_process() is None:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm)
+
+    # --- writer ---
+
+    def back(self) -> np.ndarray:
+        """Slot for the next frame, to fill in place before publish()"""
+        # continue after whichever handle published last
+        self._next = int(self._header[_SEQ]) + 1
+        slot = (self._next - 1) % self.slots
+        self._slot_seq[slot] = -1
+        return self._frames[slot]
+
+    def publish(self, stamp=None) -> None:
+        """Make the frame in back() the newest one"""
+        seq = self._next
+        slot = (seq - 1) % self.slots
+        self._slot_stamp[slot] = time.perf_counter() if stamp is None else stamp
+        self._slot_seq[slot] = seq
+        self._header[_SEQ] = seq
+        self._next = seq + 1
+
+    def write(self, frame) -> None:
+        """Copy `frame` into the next slot and publish it"""
+        np.copyto(self.back(), frame, casting="unsafe")
+        self.publish()
+
+    # --- readers ---
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the newest published frame (0: none yet)"""
+        return int(self._header[_SEQ])
+
+    def read(self, timeout=None):
+        """
+        Wait up to `timeout` seconds (None: forever) for a frame newer than
+        the last one read.  Returns (frame, publish_time) or (None, None);
+        the frame is this reader's own copy, valid until the next read().
+        """
+        if self._copy is None:
+            self._copy = np.empty(self.shape, dtype=self.dtype)
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            seq = int(self._header[_SEQ])
+            if seq > self._last:
+                slot = (seq - 1) % self.slots
+                if self._slot_seq[slot] == seq:
+                    stamp = float(self._slot_stamp[slot])
+                    np.copyto(self._copy, self._frames[slot])
+                    if self._slot_seq[slot] == seq:
+                        break
+                    self.torn += 1
+                continue        # the writer overtook us; take the newest again
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None, None
+            time.sleep(POLL_INTERVAL)
+        if self._last:
+            self.dropped += seq - self._last - 1
+        self._last = seq
+        return self._copy, stamp
+
+    def close(self):
+        """Unmap the block; while views from back() are still alive it
+        stays mapped until they go"""
+        self._frames = self._slot_seq = self._slot_stamp = self._header = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+
+    def unlink(self):
+        """Remove the block once every process is done with it (creator)"""
+        self.shm.unlink()
+        _created.discard(self.shm.name)
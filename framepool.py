@@ -0,0 +1,99 @@
+# framepool.py
+"""
+Reusable frame buffers for the render loop.
+
+Every tick needs the same handful of arrays — the render target, the
+corrected frame, the frame in LED order, scratch space inside the color
+chain.  Allocating them afresh each tick keeps the allocator and, through
+the temporaries around them, the garbage collector busy, and on the Pi a
+collection shows up as a hitch on the wall.  FramePool hands out arrays by
+(shape, dtype) and takes them all back at the end of the tick, so once the
+loop has warmed up it allocates nothing:
+
+    pool = FramePool()
+    while running:
+        frame = pool.take((H, W, 4))
+        ...
+        output.submit(led_frame)     # the output worker keeps its own copy
+        pool.recycle()
+
+Buffers come back with whatever the last user left in them.  stats()
+reports allocations (total and in the last tick) and, with track_gc=True,
+garbage-collector runs and pauses.
+"""
+
+import gc
+import time
+import numpy as np
+
+__all__ = ["FramePool"]
+
+
+class FramePool:
+    """
+    track_gc: also count garbage collections and time their pauses (one
+              process-wide gc callback, removed by close())
+    """
+
+    def __init__(self, track_gc=False):
+        self._free = {}          # (shape, dtype) -> [arrays]
+        self._taken = []
+        self.allocations = 0     # arrays created since start
+        self.ticks = 0
+        self.last_tick_allocations = 0
+        self._tick_allocations = 0
+
+        self.gc_collections = [0, 0, 0]
+        self.gc_pause_ms = 0.0       # longest pause seen
+        self._gc_start = None
+        self._track_gc = track_gc
+        if track_gc:
+            gc.callbacks.append(self._on_gc)
+
+    def take(self, shape, dtype=np.uint8):
+        """An array of this shape and dtype, reused if one is free"""
+        if isinstance(shape, int):
+            shape = (shape,)
+        key = (tuple(shape), np.dtype(dtype))
+        free = self._free.get(key)
+        if free:
+            buf = free.pop()
+        else:
+            buf = np.empty(key[0], dtype=key[1])
+            self.allocations += 1
+            self._tick_allocations += 1
+        self._taken.append((key, buf))
+        return buf
+
+    def recycle(self):
+        """End of tick: every array taken since the last recycle() is free again"""
+        for key, buf in self._taken:
+            self._free.setdefault(key, []).append(buf)
+        self._taken.clear()
+        self.ticks += 1
+        self.last_tick_allocations = self._tick_allocations
+        self._tick_allocations = 0
+
+    def stats(self) -> dict:
+        stats = {
+            "allocations":      self.allocations,
+            "last_tick_allocs": self.last_tick_allocations,
+            "buffers":          sum(len(v) for v in self._free.values()) + len(self._taken),
+        }
+        if self._track_gc:
+            stats["gc_collections"] = list(self.gc_collections)
+            stats["gc_max_pause_ms"] = round(self.gc_pause_ms, 2)
+        return stats
+
+    def close(self):
+        if self._track_gc and self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self.gc_collections[info["generation"]] += 1
+            pause = (time.perf_counter() - self._gc_start) * 1000.0
+            self.gc_pause_ms = max(self.gc_pause_ms, pause)
+            self._gc_start = None
@@ -5,9 +5,13 @@ Gamma‐ and white‐balance calibration for your LED wall.
 Define per‐channel gamma exponents and scale factors once at startup
 by calling init_gamma(), then use apply_gamma() just before sending
 to the LEDs (or in your sprite‐editor) to correct your raw RGBW values.
+apply_gamma_array() does the same for a whole (N,4) frame at once.
 """
 
-__all__ = ["init_gamma", "apply_gamma", "make_gamma_lut"]
+import numpy as np
+
+__all__ = ["init_gamma", "apply_gamma", "apply_gamma_array", "gamma_tables",
+           "gamma_curves", "make_gamma_lut", "make_gamma_curve"]
 
 # Internal storage for gammas, scales, and lookup tables
 _gamma = {"r": 1.0, "g": 1.0, "b": 1.0, "w": 1.0}
@@ -16,6 +20,11 @@ _luts = {"r": list(range(256)),
          "g": list(range(256)),
          "b": list(range(256)),
          "w": list(range(256))}
+# the same tables with the scale folded in: (4, 256) uint8, one row per channel
+_tables = np.tile(np.arange(256, dtype=np.uint8), (4, 1))
+_flat = _tables.reshape(-1)
+# offset of each channel's row in _flat
+_offsets = np.arange(4, dtype=np.intp) * 256
 
 
 def make_gamma_lut(gamma: float) -> list[int]:
@@ -26,6 +35,11 @@ def make_gamma_lut(gamma: float) -> list[int]:
     return [int(255 * ((i / 255) ** (1.0 / gamma))) for i in range(256)]
 
 
+def make_gamma_curve(gamma: float) -> np.ndarray:
+    """make_gamma_lut() without the rounding down: (256,) float64"""
+    return 255.0 * (np.arange(256) / 255.0) ** (1.0 / gamma)
+
+
 def init_gamma(
     gammas: dict[str, float],
     scales: dict[str, float] | None = None
@@ -38,7 +52,7 @@ def init_gamma(
 
     Must be called once at startup (before any apply_gamma calls).
     """
-    global _gamma, _scale, _luts
+    global _gamma, _scale, _luts, _tables, _flat
     # update gamma exponents
     for ch in ("r", "g", "b", "w"):
         if ch in gammas:
@@ -51,6 +65,10 @@ def init_gamma(
     # rebuild all four lookup tables
     for ch in ("r", "g", "b", "w"):
         _luts[ch] = make_gamma_lut(_gamma[ch])
+    # and the array versions used by apply_gamma_array()
+    _tables = np.array([[min(255, int(v * _scale[ch])) for v in _luts[ch]]
+                        for ch in ("r", "g", "b", "w")], dtype=np.uint8)
+    _flat = _tables.reshape(-1)
 
 
 def apply_gamma(r: int, g: int, b: int, w: int) -> tuple[int, int, int, int]:
@@ -71,3 +89,31 @@ def apply_gamma(r: int, g: int, b: int, w: int) -> tuple[int, int, int, int]:
     w2 = min(255, int(_luts["w"][w] * _scale["w"]))
 
     return r2, g2, b2, w2
+
+
+def gamma_tables() -> np.ndarray:
+    """Current corrected output for every input level: (4, 256) uint8, r/g/b/w rows"""
+    return _tables.copy()
+
+
+def gamma_curves() -> np.ndarray:
+    """
+    gamma_tables() before rounding: (4, 256) float64, scale included.
+    For high-bit-depth output, where the fraction below one level matters.
+    """
+    return np.array([np.minimum(255.0, make_gamma_curve(_gamma[ch]) * _scale[ch])
+                     for ch in ("r", "g", "b", "w")])
+
+
+def apply_gamma_array(frame: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Whole-frame apply_gamma(): (N,4) RGBW 0–255 in, (N,4) uint8 out
+    (written into `out` if given). Values outside 0–255 are clamped.
+    """
+    frame = np.asarray(frame)
+    if frame.dtype != np.uint8:
+        frame = np.clip(frame, 0, 255).astype(np.uint8)
+    if out is None:
+        out = np.empty(frame.shape, dtype=np.uint8)
+    np.take(_flat, frame + _offsets, out=out, mode="clip")
+    return out
@@ -3,7 +3,8 @@ import numpy as np
 import pygame
 import colorsys
 import sys
-from ws2814 import WS2814
+from outputs import open_output
+from layout import get_layout
 
 # ------------ CONFIGURATION CONSTANTS ------------
 DEPTH_MIN = 500          # initial min depth (mm)
@@ -18,25 +19,14 @@ PANEL_WIDTH  = 8    # pixels per panel in X
 PANEL_HEIGHT = 8    # pixels per panel in Y
 PANELS_X     = 3    # how many panels across
 PANELS_Y     = 3    # how many panels down
-NUM_LEDS     = PANEL_WIDTH * PANEL_HEIGHT * PANELS_X * PANELS_Y
 
-led_matrix = WS2814('/dev/spidev0.0', NUM_LEDS, 800)
+# config.LAYOUT_FILE if present, else this panel grid
+wall = get_layout(PANEL_WIDTH, PANEL_HEIGHT, PANELS_X, PANELS_Y)
+NUM_LEDS     = wall.num_leds
+wall_w = wall.width   # 24
+wall_h = wall.height  # 24
 
-
-def serpentine_index(x, y):
-    px = x // PANEL_WIDTH
-    py = y // PANEL_HEIGHT
-    lx = x % PANEL_WIDTH
-    ly = y % PANEL_HEIGHT
-    panel_num = px * PANELS_Y + py
-    if (ly % 2) == 0:
-        cell_num = ly * PANEL_WIDTH + lx
-    else:
-        cell_num = ly * PANEL_WIDTH + (PANEL_WIDTH - 1 - lx)
-    return panel_num * (PANEL_WIDTH * PANEL_HEIGHT) + cell_num
-
-wall_w = PANEL_WIDTH * PANELS_X  # 24
-wall_h = PANEL_HEIGHT * PANELS_Y  # 24
+led_matrix = open_output(NUM_LEDS, width=wall_w, height=wall_h, pixel_map=wall.physical)
 
 # ---------------- Kinect Helpers ----------------
 def get_depth():
@@ -56,7 +46,8 @@ def find_hand_y(depth, side, dmin, dmax, roi_width=ROI_WIDTH):
 # ---------------- Pong + UI ----------------
 class Pong:
     def __init__(self):
-        self.W, self.H = 24, 24       # game resolution
+        self.W, self.H = wall_w, wall_h   # game resolution = wall
+        self.led_frame = np.zeros((self.H, self.W, 4), dtype=np.uint8)
         self.S = 10                  # display scale
         self.ui_height = 60           # extra UI space
         pygame.init()
@@ -193,18 +184,8 @@ class Pong:
         surf.set_at((int(self.bx), int(self.by)), (255,255,255))
 
         # send to LED wall
-        frame = []
-        for yy in range(self.H):
-            for xx in range(self.W):
-                c = surf.get_at((xx, yy))
-                frame.append((c.r, c.g, c.b, 0))
-        for y in range(wall_h):
-            for x in range(wall_w):
-                lin = y*wall_w + x
-                if lin < len(frame):
-                    r, g, b, _ = frame[lin]
-                    idx = serpentine_index(x, y)
-                    led_matrix.set_led_color(idx, r, g, b, 0)
+        self.led_frame[..., :3] = pygame.surfarray.array3d(surf).swapaxes(0, 1)
+        led_matrix.set_frame(wall.to_physical(self.led_frame))
         led_matrix.update_strip()
 
         # draw scaled view + UI
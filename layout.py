@@ -0,0 +1,204 @@
+# layout.py
+"""
+Wall geometry compiled to index arrays.
+
+Programs draw in logical order — row-major, pixel (x, y) at y*width + x —
+while the LEDs are chained panel by panel.  WallLayout works the mapping
+out once as NumPy index arrays, so reordering a whole frame is one gather
+however the panels are placed:
+
+    wall = get_layout(8, 8, panels_x=5, panels_y=2)
+    leds.set_frame(wall.to_physical(frame))     # (H*W|H,W, C) → (N, C)
+    preview = wall.to_logical(leds.led_state)   # and back, for simulators
+
+Without a layout file the wall is a regular grid: panels chained
+column-major (top to bottom, then the next column), rows snaking inside
+each panel.  config.LAYOUT_FILE (JSON) describes anything else:
+
+    {
+      "panel_width": 8, "panel_height": 8, "wiring": "serpentine",
+      "panels": [
+        {"origin": [0, 0]},
+        {"origin": [0, 8], "rotate": 180},
+        {"origin": [8, 0], "flip": "x", "wiring": "serpentine_columns"},
+        {"origin": [8, 8], "skip_before": 2, "missing": [[7, 7]]}
+      ]
+    }
+
+Panels are listed in chain order.  Per panel:
+    origin        top-left canvas pixel [x, y] after rotation
+    width/height  panel size before rotation (default panel_width/height)
+    wiring        "serpentine" (rows, snaking), "rows", "columns",
+                  "serpentine_columns"; in the panel's own frame, starting
+                  top-left
+    flip          "x", "y" or "xy": mirror the panel's frame
+    rotate        0 / 90 / 180 / 270, clockwise, applied after the flip
+    skip_before   dark LEDs in the chain before this panel (jumpers etc.)
+    missing       [[x, y], ...] panel cells with no LED (cut corners)
+Canvas pixels no panel covers are gaps, so the wall can be any shape;
+"width"/"height" at the top level override the canvas size.
+"""
+
+import json
+import os
+import numpy as np
+
+import config
+
+__all__ = ["WallLayout", "load_layout", "get_layout", "WIRINGS"]
+
+WIRINGS = ("serpentine", "rows", "columns", "serpentine_columns")
+
+
+def _wiring_order(width, height, wiring):
+    """Panel-local (x, y) arrays in chain order"""
+    y, x = np.mgrid[0:height, 0:width]
+    if wiring == "serpentine":
+        x = np.where(y % 2 == 0, x, width - 1 - x)
+    elif wiring == "serpentine_columns":
+        x, y = x.T, np.where(x.T % 2 == 0, y.T, height - 1 - y.T)
+    elif wiring == "columns":
+        x, y = x.T, y.T
+    elif wiring != "rows":
+        raise ValueError(f"unknown panel wiring {wiring!r}; choose from {WIRINGS}")
+    return x.reshape(-1), y.reshape(-1)
+
+
+def _place(x, y, width, height, flip, rotate):
+    """Panel-local coordinates → offsets from the panel's canvas origin"""
+    if "x" in flip:
+        x = width - 1 - x
+    if "y" in flip:
+        y = height - 1 - y
+    if rotate == 90:
+        x, y = height - 1 - y, x
+    elif rotate == 180:
+        x, y = width - 1 - x, height - 1 - y
+    elif rotate == 270:
+        x, y = y, width - 1 - x
+    elif rotate != 0:
+        raise ValueError("panel rotation must be 0, 90, 180 or 270")
+    return x, y
+
+
+class WallLayout:
+    """
+    physical[y*width + x]  LED index of logical pixel (x, y), -1 for gaps
+    logical[led]           logical pixel shown by that LED, -1 if dark
+    led_panel[led]         panel (chain order) the LED belongs to, -1 if dark
+
+    WallLayout(panel_width, panel_height, panels_x, panels_y) is the regular
+    grid; WallLayout.from_spec() / load_layout() take a layout file.
+    """
+
+    def __init__(self, panel_width=8, panel_height=8, panels_x=1, panels_y=1):
+        # column-major panel chain, serpentine rows
+        panels = [{"origin": [px * panel_width, py * panel_height]}
+                  for px in range(panels_x) for py in range(panels_y)]
+        self._compile({"panel_width": panel_width, "panel_height": panel_height,
+                       "panels": panels})
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Compile a parsed layout file (see module docstring)"""
+        layout = cls.__new__(cls)
+        layout._compile(spec)
+        return layout
+
+    def _compile(self, spec):
+        self.spec = spec
+        default_w = spec.get("panel_width", 8)
+        default_h = spec.get("panel_height", 8)
+        default_wiring = spec.get("wiring", "serpentine")
+
+        xs, ys, panel_ids = [], [], []
+        extent_w = extent_h = 0
+        led = 0
+        for i, panel in enumerate(spec["panels"]):
+            w = panel.get("width", default_w)
+            h = panel.get("height", default_h)
+            x, y = _wiring_order(w, h, panel.get("wiring", default_wiring))
+            if panel.get("missing"):
+                missing = {tuple(cell) for cell in panel["missing"]}
+                keep = np.array([(a, b) not in missing for a, b in zip(x, y)], dtype=bool)
+                x, y = x[keep], y[keep]
+            rotate = panel.get("rotate", 0) % 360
+            x, y = _place(x, y, w, h, panel.get("flip", ""), rotate)
+            ox, oy = panel.get("origin", (0, 0))
+
+            skip = panel.get("skip_before", 0)
+            xs.append(np.full(skip, -1)); ys.append(np.full(skip, -1))
+            panel_ids.append(np.full(skip, -1))
+            xs.append(x + ox); ys.append(y + oy)
+            panel_ids.append(np.full(x.size, i))
+            led += skip + x.size
+
+            rw, rh = (h, w) if rotate in (90, 270) else (w, h)
+            extent_w = max(extent_w, ox + rw)
+            extent_h = max(extent_h, oy + rh)
+
+        self.width = spec.get("width", extent_w)
+        self.height = spec.get("height", extent_h)
+        self.num_leds = led
+        self.num_panels = len(spec["panels"])
+
+        x = np.concatenate(xs).astype(np.intp)
+        y = np.concatenate(ys).astype(np.intp)
+        lit = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        pixel = np.where(lit, y * self.width + x, -1)
+        if np.unique(pixel[lit]).size != np.count_nonzero(lit):
+            raise ValueError("layout has panels that overlap")
+
+        self.logical = pixel
+        self.led_panel = np.where(lit, np.concatenate(panel_ids), -1).astype(np.intp)
+        self.physical = np.full(self.width * self.height, -1, dtype=np.intp)
+        self.physical[pixel[lit]] = np.nonzero(lit)[0]
+
+        # gather indices with holes pointed at 0; those entries are blanked after
+        self._dark_leds = np.nonzero(~lit)[0]
+        self._from_logical = np.where(lit, pixel, 0)
+        self._gaps = np.nonzero(self.physical < 0)[0]
+        self._from_physical = np.where(self.physical >= 0, self.physical, 0)
+
+    def index(self, x, y):
+        """Physical LED index of logical pixel (x, y), or -1 for a gap"""
+        return int(self.physical[y * self.width + x])
+
+    def to_physical(self, frame, out=None):
+        """Logical frame ((H,W,C) or (H*W,C)) → (num_leds, C) in chain order"""
+        frame = np.asarray(frame)
+        frame = frame.reshape(-1, frame.shape[-1])
+        out = np.take(frame, self._from_logical, axis=0, out=out)
+        if self._dark_leds.size:
+            out[self._dark_leds] = 0
+        return out
+
+    def to_logical(self, leds, out=None):
+        """Chain-order (num_leds, C) frame → (H*W, C) logical frame, gaps black"""
+        out = np.take(np.asarray(leds), self._from_physical, axis=0, out=out)
+        if self._gaps.size:
+            out[self._gaps] = 0
+        return out
+
+
+_loaded = {}
+
+
+def load_layout(path):
+    """WallLayout from a JSON layout file; compiled once per file version"""
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if key not in _loaded:
+        with open(path) as f:
+            _loaded[key] = WallLayout.from_spec(json.load(f))
+    return _loaded[key]
+
+
+def get_layout(panel_width, panel_height, panels_x, panels_y, path=None):
+    """
+    The wall layout: config.LAYOUT_FILE (or `path`) if it exists, otherwise
+    the regular grid of panels_x × panels_y panels.
+    """
+    path = path or config.LAYOUT_FILE
+    if path and os.path.exists(path):
+        return load_layout(path)
+    return WallLayout(panel_width, panel_height, panels_x, panels_y)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# net_node.py
+"""
+Run the wall as a dumb network pixel node.
+
+Listens for DDP, E1.31 or Art-Net frames from another renderer, reassembles
+them (netpixel.FrameAssembler) and writes each complete frame straight to
+the LED output — no pattern engine, audio or UI is loaded.  Frames that are
+superseded before they complete, and packets that arrive after a newer
+frame has started, are dropped.  Once a second it prints frames shown,
+drops and receive-to-wire latency (first packet of a frame arriving →
+update_strip() returning).
+
+    python3 net_node.py                      # DDP on 4048, 640 RGBW LEDs
+    python3 net_node.py --protocol e131 --channels 3
+    LED_OUTPUT=null python3 net_node.py      # no hardware
+    python3 -m benchmarks.net_sender         # local test sender
+
+Pixels are expected in physical LED order.
+"""
+
+import argparse
+import socket
+import time
+import numpy as np
+
+from netpixel import PROTOCOLS, DEFAULT_PORTS, FrameAssembler, parse_packet
+from outputs import open_output
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="DDP / E1.31 / Art-Net receiver node")
+    p.add_argument("--protocol", choices=PROTOCOLS, default="ddp")
+    p.add_argument("--port", type=int, help="UDP port (default: protocol's standard port)")
+    p.add_argument("--bind", default="0.0.0.0", help="address to listen on")
+    p.add_argument("--leds", type=int, default=640, help="number of LEDs")
+    p.add_argument("--channels", type=int, choices=(3, 4), default=4,
+                   help="bytes per pixel in the stream: 3 = RGB (white off), 4 = RGBW")
+    p.add_argument("--universe-start", type=int, help="first universe (E1.31 / Art-Net)")
+    p.add_argument("--output", help="LED output backend (default: LED_OUTPUT / config)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    port = args.port or DEFAULT_PORTS[args.protocol]
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+    sock.bind((args.bind, port))
+    sock.settimeout(1.0)
+
+    assembler = FrameAssembler(args.protocol, args.leds, args.channels, args.universe_start)
+    frame = np.frombuffer(assembler.frame, dtype=np.uint8).reshape(args.leds, args.channels)
+    leds = open_output(args.leds, args.output)
+    print(f"Listening for {args.protocol} on {args.bind}:{port} "
+          f"({args.leds} LEDs × {args.channels} ch)")
+
+    buf = bytearray(2048)
+    bad = 0
+    latencies = []
+    last_report = time.perf_counter()
+    last_counts = (0, 0, 0)
+    try:
+        while True:
+            try:
+                n = sock.recv_into(buf)
+            except socket.timeout:
+                n = 0
+            now = time.perf_counter()
+            if n:
+                try:
+                    info = parse_packet(memoryview(buf)[:n])
+                except ValueError:
+                    bad += 1
+                    info = None
+                if info is not None and info["protocol"] == args.protocol:
+                    if assembler.feed(info, now) is not None:
+                        leds.led_state[:, :args.channels] = frame
+                        leds.update_strip()
+                        latencies.append(time.perf_counter() - assembler.started)
+
+            if now - last_report >= 1.0:
+                counts = (assembler.frames, assembler.incomplete, assembler.late)
+                shown, incomplete, late = (c - p for c, p in zip(counts, last_counts))
+                if latencies:
+                    lat = (f"latency avg {1000 * sum(latencies) / len(latencies):.2f} ms, "
+                           f"max {1000 * max(latencies):.2f} ms")
+                else:
+                    lat = "no frames"
+                print(f"{shown / (now - last_report):5.1f} fps | dropped "
+                      f"{incomplete} incomplete, {late} late packets, {bad} bad | {lat}")
+                latencies.clear()
+                last_counts = counts
+                last_report = now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Total: {assembler.frames} frames, {assembler.incomplete} incomplete, "
+              f"{assembler.late} late packets")
+        leds.clear_strip()
+        leds.update_strip()
+        leds.close()
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
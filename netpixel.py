@@ -0,0 +1,289 @@
+# netpixel.py
+"""
+DDP, E1.31 (sACN) and Art-Net packet layouts for sending LED frames over UDP.
+
+PacketSet preallocates every packet one frame needs, with the protocol
+headers filled in once; per frame only the pixel bytes, sequence number and
+(for DDP) push flag are written.  parse_packet() reads any of the three
+formats back and checks the header, and FrameAssembler stitches packets
+back into frames on the receiving side.
+
+Universe splitting never puts a pixel across two universes: an RGBW frame
+uses 128 pixels (512 channels) per universe, RGB 170 pixels (510 channels).
+"""
+
+import struct
+import uuid
+
+__all__ = ["PROTOCOLS", "DEFAULT_PORTS", "PacketSet", "parse_packet", "FrameAssembler"]
+
+PROTOCOLS = ("ddp", "e131", "artnet")
+DEFAULT_PORTS = {"ddp": 4048, "e131": 5568, "artnet": 6454}
+
+# ─── DDP ──────────────────────────────────────────────────────────────────
+DDP_HEADER = struct.Struct(">BBBBIH")   # flags, seq, type, dest, offset, length
+DDP_VERSION = 0x40
+DDP_PUSH = 0x01
+DDP_TYPE = {3: 0x0B, 4: 0x1B}           # RGB / RGBW, 8 bits per channel
+DDP_DEST_DISPLAY = 1
+DDP_MAX_DATA = 1440                     # 480 RGB or 360 RGBW pixels
+
+# ─── E1.31 ────────────────────────────────────────────────────────────────
+E131_ACN_ID = b"ASC-E1.17\x00\x00\x00"
+E131_HEADER_LEN = 126
+E131_SEQ_OFFSET = 111
+E131_UNIVERSE_OFFSET = 113
+
+# ─── Art-Net ──────────────────────────────────────────────────────────────
+ARTNET_ID = b"Art-Net\x00"
+ARTNET_OP_DMX = 0x5000
+ARTNET_HEADER = struct.Struct("<8sH")   # id, opcode (little-endian)
+ARTNET_HEADER_LEN = 18
+
+DMX_CHANNELS = 512
+
+
+def _e131_header(universe, length, cid, source_name, priority=100):
+    """Complete 126-byte E1.31 data packet header for `length` DMX slots"""
+    total = E131_HEADER_LEN + length
+    head = bytearray(E131_HEADER_LEN)
+    # root layer
+    struct.pack_into(">HH12sHI16s", head, 0,
+                     0x0010, 0x0000, E131_ACN_ID,
+                     0x7000 | (total - 16), 0x00000004, cid)
+    # framing layer
+    struct.pack_into(">HI64sBHBBH", head, 38,
+                     0x7000 | (total - 38), 0x00000002,
+                     source_name.encode()[:63], priority, 0, 0, 0, universe)
+    # DMP layer
+    struct.pack_into(">HBBHHHB", head, 115,
+                     0x7000 | (total - 115), 0x02, 0xA1, 0x0000, 0x0001,
+                     length + 1, 0x00)
+    return head
+
+
+def _artnet_header(universe, length):
+    head = bytearray(ARTNET_HEADER_LEN)
+    ARTNET_HEADER.pack_into(head, 0, ARTNET_ID, ARTNET_OP_DMX)
+    struct.pack_into(">HBBBBH", head, 10,
+                     14,                       # protocol version
+                     0, 0,                     # sequence, physical
+                     universe & 0xFF, (universe >> 8) & 0x7F,
+                     length)
+    return head
+
+
+class PacketSet:
+    """
+    All packets for one frame of `num_leds` × `channels` bytes.
+
+    packets[i] is a preallocated bytearray; spans[i] is the (start, end)
+    slice of the flat frame it carries.
+    """
+
+    def __init__(self, protocol, num_leds, channels=4, universe_start=None,
+                 source_name="led_matrix_control"):
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"unknown protocol {protocol!r}; choose from {PROTOCOLS}")
+        if channels not in DDP_TYPE:
+            raise ValueError("channels must be 3 (RGB) or 4 (RGBW)")
+        self.protocol = protocol
+        self.num_leds = num_leds
+        self.channels = channels
+        self.frame_bytes = num_leds * channels
+        if universe_start is None:
+            universe_start = 0 if protocol == "artnet" else 1
+        self.universe_start = universe_start
+
+        if protocol == "ddp":
+            per_packet = DDP_MAX_DATA // channels * channels
+            header_len = DDP_HEADER.size
+        else:
+            per_packet = DMX_CHANNELS // channels * channels
+            header_len = E131_HEADER_LEN if protocol == "e131" else ARTNET_HEADER_LEN
+        self.header_len = header_len
+
+        cid = uuid.uuid4().bytes
+        self.packets = []
+        self.spans = []
+        for i, start in enumerate(range(0, self.frame_bytes, per_packet)):
+            end = min(start + per_packet, self.frame_bytes)
+            length = end - start
+            if protocol == "ddp":
+                head = bytearray(DDP_HEADER.pack(DDP_VERSION, 0, DDP_TYPE[channels],
+                                                 DDP_DEST_DISPLAY, start, length))
+            elif protocol == "e131":
+                head = _e131_header(universe_start + i, length, cid, source_name)
+            else:
+                # Art-Net wants an even slot count; the pad byte stays zero
+                head = _artnet_header(universe_start + i, length + (length & 1))
+            packet = head + bytearray(length + (length & 1 if protocol == "artnet" else 0))
+            self.packets.append(packet)
+            self.spans.append((start, end))
+        self.views = [memoryview(p) for p in self.packets]
+        self.sequence = 0
+
+    @property
+    def universes(self):
+        """Universe numbers used (E1.31 / Art-Net)"""
+        return list(range(self.universe_start, self.universe_start + len(self.packets)))
+
+    def fill(self, data):
+        """
+        Copy one flat frame (bytes-like, frame_bytes long) into the packets
+        and advance the sequence number. Returns the packet list.
+        """
+        data = memoryview(data).cast("B")
+        self.sequence = self.sequence % 255 + 1          # 1..255, 0 means "off"
+        last = len(self.packets) - 1
+        for i, (view, (start, end)) in enumerate(zip(self.views, self.spans)):
+            h = self.header_len
+            view[h:h + end - start] = data[start:end]
+            if self.protocol == "ddp":
+                # DDP has a 4-bit sequence; push only on the frame's last packet
+                view[0] = DDP_VERSION | (DDP_PUSH if i == last else 0)
+                view[1] = (self.sequence - 1) % 15 + 1
+            elif self.protocol == "e131":
+                view[E131_SEQ_OFFSET] = self.sequence
+            else:
+                view[12] = self.sequence
+        return self.packets
+
+
+def parse_packet(packet):
+    """
+    Decode one DDP / E1.31 / Art-Net packet.
+
+    Returns a dict with "protocol", "sequence", "data" (memoryview) and
+    "offset" + "push" (DDP) or "universe" (E1.31 / Art-Net).
+    Raises ValueError if the header is malformed or lengths disagree.
+    """
+    packet = memoryview(packet).cast("B")
+    n = len(packet)
+
+    if n >= ARTNET_HEADER_LEN and bytes(packet[:8]) == ARTNET_ID:
+        _, opcode = ARTNET_HEADER.unpack_from(packet, 0)
+        if opcode != ARTNET_OP_DMX:
+            raise ValueError(f"Art-Net opcode {opcode:#06x} is not ArtDmx")
+        version, seq, _phys, sub_uni, net, length = struct.unpack_from(">HBBBBH", packet, 10)
+        if version < 14 or length % 2 or not 2 <= length <= DMX_CHANNELS:
+            raise ValueError("bad ArtDmx header")
+        if n != ARTNET_HEADER_LEN + length:
+            raise ValueError(f"ArtDmx length {length} but {n - ARTNET_HEADER_LEN} data bytes")
+        return {"protocol": "artnet", "sequence": seq,
+                "universe": (net << 8) | sub_uni,
+                "data": packet[ARTNET_HEADER_LEN:]}
+
+    if n >= E131_HEADER_LEN and bytes(packet[4:16]) == E131_ACN_ID:
+        root_fl, = struct.unpack_from(">H", packet, 16)
+        frame_fl, = struct.unpack_from(">H", packet, 38)
+        dmp_fl, vector, addr_type, _first, _inc, count, start_code = \
+            struct.unpack_from(">HBBHHHB", packet, 115)
+        for flags_len, layer_start in ((root_fl, 16), (frame_fl, 38), (dmp_fl, 115)):
+            if flags_len & 0x0FFF != n - layer_start:
+                raise ValueError("E1.31 layer length does not match packet size")
+        if vector != 0x02 or addr_type != 0xA1 or start_code != 0:
+            raise ValueError("bad E1.31 DMP layer")
+        if count - 1 != n - E131_HEADER_LEN:
+            raise ValueError("E1.31 property count does not match data")
+        return {"protocol": "e131", "sequence": packet[E131_SEQ_OFFSET],
+                "universe": struct.unpack_from(">H", packet, E131_UNIVERSE_OFFSET)[0],
+                "data": packet[E131_HEADER_LEN:]}
+
+    if n >= DDP_HEADER.size and packet[0] & 0xC0 == DDP_VERSION:
+        flags, seq, _dtype, _dest, offset, length = DDP_HEADER.unpack_from(packet, 0)
+        if n != DDP_HEADER.size + length:
+            raise ValueError(f"DDP length {length} but {n - DDP_HEADER.size} data bytes")
+        return {"protocol": "ddp", "sequence": seq & 0x0F, "offset": offset,
+                "push": bool(flags & DDP_PUSH), "data": packet[DDP_HEADER.size:]}
+
+    raise ValueError("not a DDP, E1.31 or Art-Net packet")
+
+
+class FrameAssembler:
+    """
+    Rebuilds frames from parsed packets (see parse_packet) for a receiver.
+
+    DDP frames end at the packet with the push flag; E1.31 / Art-Net frames
+    are complete once every universe of one sequence number has arrived.
+    A frame that is superseded before it completes is dropped as
+    incomplete; packets older than the current frame are dropped as late.
+    DDP and Art-Net senders may leave the sequence number at 0 (sequencing
+    off): those frames are told apart by the push flag / a repeated
+    universe instead, and nothing counts as late.
+    """
+
+    def __init__(self, protocol, num_leds, channels=4, universe_start=None):
+        self.layout = PacketSet(protocol, num_leds, channels, universe_start)
+        self.protocol = protocol
+        self.frame = bytearray(self.layout.frame_bytes)
+        self._view = memoryview(self.frame)
+        self._universe_slot = {u: i for i, u in enumerate(self.layout.universes)}
+        self._have = [False] * len(self.layout.packets)
+        self._bytes = 0
+        self._seq = None
+        self._complete = False
+        self.started = None          # arrival time of the current frame's first packet
+        self.frames = 0
+        self.incomplete = 0
+        self.late = 0
+
+    def _is_older(self, seq):
+        """True if `seq` belongs before the frame being assembled"""
+        if self.protocol == "ddp":
+            return (seq - self._seq) % 15 > 7
+        diff = (seq - self._seq + 128) % 256 - 128   # signed 8-bit difference
+        return -20 < diff < 0           # E1.31 §6.7.2 out-of-order window
+
+    def _begin(self, seq, now):
+        if self._bytes and not self._complete:
+            self.incomplete += 1
+        self._seq = seq
+        self._bytes = 0
+        self._have = [False] * len(self._have)
+        self._complete = False
+        self.started = now
+
+    def feed(self, info, now):
+        """Add one parsed packet; returns the frame buffer when it completes"""
+        seq = info["sequence"]
+        if seq == 0 and self.protocol != "e131":
+            # unsequenced: the previous frame ended at its push / last
+            # universe, or was cut short if this universe came round again
+            slot = self._universe_slot.get(info.get("universe"))
+            if self._seq != 0 or self._complete or (slot is not None and self._have[slot]):
+                self._begin(seq, now)
+        elif self._seq is None or (seq != self._seq and not self._is_older(seq)):
+            self._begin(seq, now)
+        elif seq != self._seq or self._complete:
+            self.late += 1
+            return None
+
+        data = info["data"]
+        if self.protocol == "ddp":
+            start = info["offset"]
+            n = min(len(data), len(self.frame) - start)
+            if n > 0:
+                self._view[start:start + n] = data[:n]
+                self._bytes += n
+            if not info["push"]:
+                return None
+            if self._bytes < len(self.frame):
+                self.incomplete += 1     # pushed with pieces missing
+                self._bytes = 0
+                self._complete = True
+                return None
+        else:
+            slot = self._universe_slot.get(info["universe"])
+            if slot is None or self._have[slot]:
+                return None
+            start, end = self.layout.spans[slot]
+            self._view[start:end] = data[:end - start]
+            self._have[slot] = True
+            self._bytes += end - start
+            if not all(self._have):
+                return None
+
+        self.frames += 1
+        self._complete = True
+        return self.frame
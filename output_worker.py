@@ -0,0 +1,391 @@
+# output_worker.py
+"""
+Background LED output.
+
+The render loop hands finished frames to an OutputWorker, which owns the
+LED device and pushes frames out on its own thread, so a blocking SPI
+transfer never stalls event handling or drawing.
+
+Frames pass through a TripleBuffer: the renderer always has a free back
+buffer to write into, the worker always has a stable front buffer to send
+from, and the middle "ready" slot holds the newest finished frame.  If the
+renderer publishes twice before the worker picks a frame up, the older one
+is dropped — the LEDs always get the newest frame.
+
+With dither=True the worker takes uint16 8.8 fixed-point frames (see
+dither.py) and dithers them down to 8 bits just before sending.  It also
+re-sends the current frame every frame period while no new one arrives,
+so a still image keeps averaging to its fractional levels.
+
+Given a power.PowerLimiter, every frame is current-limited on the worker
+thread right before that, and stats() reports the estimated draw.
+
+If the device raises, the worker thread stops, keeps the exception in
+.error, reports it in stats() and re-raises it from stop().
+
+With interpolate="linear" or "hold" the LEDs refresh at a fixed frame_rate
+however fast the renderer manages: submitted frames become keyframes and
+each tick sends the newest one ("hold") or a blend of the last two
+("linear", one render interval behind), so a heavy pattern rendering at
+20 FPS still moves smoothly at 45.  stats() reports the measured render rate.
+
+Frames can also come from another process: OutputWorker(source=ring)
+reads a frame_ring.FrameRing instead of its own TripleBuffer, and
+OutputProcess runs such a worker in a separate process — the renderer
+writes into the shared ring and the SPI transfer no longer shares its
+interpreter (and GIL) with rendering and UI drawing.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+import numpy as np
+
+from dither import TemporalDither
+from frame_ring import FrameRing
+
+__all__ = ["TripleBuffer", "OutputWorker", "OutputProcess", "INTERPOLATION"]
+
+
+class TripleBuffer:
+    """Single-producer / single-consumer triple buffer of fixed-shape frames"""
+
+    def __init__(self, shape, dtype=np.uint8):
+        self._buffers = [np.zeros(shape, dtype=dtype) for _ in range(3)]
+        self._stamps = [0.0, 0.0, 0.0]
+        self._back, self._ready, self._front = 0, 1, 2
+        self._fresh = False
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def back(self) -> np.ndarray:
+        """Buffer the producer may fill in place before calling publish()"""
+        return self._buffers[self._back]
+
+    def publish(self) -> None:
+        """Make the back buffer the newest ready frame"""
+        with self._cond:
+            self._stamps[self._back] = time.perf_counter()
+            self._back, self._ready = self._ready, self._back
+            if self._fresh:
+                self.dropped += 1   # previous ready frame was never sent
+            self._fresh = True
+            self._cond.notify()
+
+    def write(self, frame) -> None:
+        """Copy `frame` into the back buffer and publish it"""
+        np.copyto(self.back(), frame, casting="unsafe")
+        self.publish()
+
+    def read(self, timeout=None):
+        """
+        Wait up to `timeout` seconds for a new frame.
+        Returns (frame, publish_time) or (None, None); the frame stays
+        valid until the next read().
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._fresh, timeout):
+                return None, None
+            self._front, self._ready = self._ready, self._front
+            self._fresh = False
+            return self._buffers[self._front], self._stamps[self._front]
+
+
+INTERPOLATION = ("hold", "linear")
+# longest render interval linear interpolation will fade over (seconds)
+MAX_RENDER_INTERVAL = 0.25
+
+
+class OutputWorker:
+    """
+    Owns an LED device (anything with set_frame/update_strip/clear_strip,
+    e.g. WS2814) and sends the newest submitted frame on a background thread.
+    dither:      take uint16 8.8 frames and temporally dither them to 8 bits
+    power:       optional power.PowerLimiter applied to every frame
+    interpolate: None sends each frame as it is submitted; "hold" or
+                 "linear" refresh the LEDs at frame_rate whatever the render
+                 rate, repeating or blending the last two submitted frames
+    source:      read frames from this (e.g. a FrameRing attached in another
+                 process) instead of an own TripleBuffer fed by submit()
+    """
+
+    def __init__(self, device, frame_rate=45, dither=False, power=None, interpolate=None,
+                 source=None):
+        if interpolate not in (None,) + INTERPOLATION:
+            raise ValueError(f"unknown interpolation {interpolate!r}; "
+                             f"choose from {INTERPOLATION}")
+        self.device = device
+        self.frame_period = 1.0 / frame_rate
+        shape = (device.num_leds, 4)
+        dtype = np.uint16 if dither else np.uint8
+        self.dither = TemporalDither(shape) if dither else None
+        self.power = power
+        self.interpolate = interpolate
+        self._frame8 = np.zeros(shape, dtype=np.uint8)
+        self._limited = np.zeros(shape, dtype=dtype)
+        self.buffer = TripleBuffer(shape, dtype) if source is None else source
+        # interpolation: previous and newest keyframe, blend scratch
+        self._keys = [np.zeros(shape, dtype=dtype), np.zeros(shape, dtype=dtype)]
+        self._key_stamp = None
+        self._blend_f = np.zeros(shape, dtype=np.float32)
+        self._blended = np.zeros(shape, dtype=dtype)
+        # measured render rate (smoothed interval between keyframes)
+        self.render_interval = self.frame_period
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="led-output", daemon=True)
+        self.frames = 0
+        self.late = 0
+        self.last_send_ms = 0.0
+        self.error = None     # exception that stopped the thread, if any
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, frame) -> None:
+        """
+        Queue an (N,4) RGBW frame in physical LED order (copied); uint16
+        8.8 fixed point when dithering
+        """
+        self.buffer.write(frame)
+
+    def back(self) -> np.ndarray:
+        """Buffer to render the next frame into in place, then publish()"""
+        return self.buffer.back()
+
+    def publish(self) -> None:
+        self.buffer.publish()
+
+    def stats(self) -> dict:
+        stats = {
+            "frames":       self.frames,
+            "dropped":      self.buffer.dropped,
+            "late":         self.late,
+            "last_send_ms": self.last_send_ms,
+        }
+        if self.error is not None:
+            stats["error"] = repr(self.error)
+        if self.interpolate is not None:
+            stats["render_fps"] = round(1.0 / self.render_interval, 1)
+        if self.power is not None:
+            stats.update({
+                "power_ma":      round(self.power.draw_ma),
+                "segment_ma":    [round(ma) for ma in self.power.segment_ma],
+                "power_scale":   self.power.scale,
+                "power_limited": self.power.limited,
+            })
+        return stats
+
+    def _run(self):
+        try:
+            if self.interpolate is not None:
+                self._run_fixed_rate()
+            else:
+                self._run_as_submitted()
+        except Exception as e:
+            self.error = e
+            print(f"LED output stopped: {e!r}")
+
+    def _run_as_submitted(self):
+        current = None
+        while not self._stop.is_set():
+            if self.dither is None:
+                frame, stamp = self.buffer.read(timeout=0.1)
+            else:
+                frame, stamp = self.buffer.read(timeout=self.frame_period)
+                if frame is None and current is not None:
+                    frame, stamp = current, None     # repeat for the dither
+            if frame is None:
+                continue
+            current = frame
+            self._send(frame, stamp)
+
+    def _run_fixed_rate(self):
+        tick = time.perf_counter()
+        while not self._stop.is_set():
+            tick += self.frame_period
+            delay = tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                tick = time.perf_counter()    # fell behind; don't try to catch up
+            frame, stamp = self.buffer.read(timeout=0)
+            if frame is not None:
+                self._add_keyframe(frame, stamp)
+            if self._key_stamp is not None:
+                self._send(self._frame_at(time.perf_counter()), stamp)
+
+    def _add_keyframe(self, frame, stamp):
+        if self._key_stamp is not None:
+            # capped so a stall (e.g. loading a patch) doesn't stretch the fades
+            interval = min(stamp - self._key_stamp, MAX_RENDER_INTERVAL)
+            self.render_interval += 0.2 * (interval - self.render_interval)
+        prev, key = self._keys
+        np.copyto(prev, frame if self._key_stamp is None else key)
+        np.copyto(key, frame)
+        self._key_stamp = stamp
+
+    def _frame_at(self, now):
+        """Output frame for time `now`: newest keyframe, or a blend towards it"""
+        prev, key = self._keys
+        # linear mode shows each keyframe fully one render interval after it
+        # arrived, fading from the previous one in between
+        t = (now - self._key_stamp) / self.render_interval
+        if self.interpolate == "hold" or t >= 1.0:
+            return key
+        blend = self._blend_f
+        np.subtract(key, prev, out=blend, dtype=np.float32)
+        blend *= max(t, 0.0)
+        blend += prev
+        blend += 0.5
+        np.copyto(self._blended, blend, casting="unsafe")
+        return self._blended
+
+    def _send(self, frame, stamp):
+        t0 = time.perf_counter()
+        if self.power is not None:
+            frame = self.power.apply(frame, out=self._limited)
+        if self.dither is not None:
+            frame = self.dither.apply(frame, out=self._frame8)
+        self.device.set_frame(frame)
+        self.device.update_strip()
+        done = time.perf_counter()
+        self.last_send_ms = (done - t0) * 1000.0
+        self.frames += 1
+        # late: reached the LEDs more than one frame period after submit
+        if stamp is not None and done - stamp > self.frame_period:
+            self.late += 1
+
+    def stop(self, blank=True):
+        """
+        Stop the worker thread and (by default) blank the strip; if the
+        device failed, raises RuntimeError from that error instead of
+        touching it again
+        """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if self.error is not None:
+            raise RuntimeError("LED output failed") from self.error
+        if blank:
+            self.device.clear_strip()
+            self.device.update_strip()
+
+
+# how often OutputProcess's worker reports its stats (seconds)
+STATS_INTERVAL = 1.0
+
+
+def _output_main(ring_name, frame_rate, dither, power, interpolate, options, stop, blank, stats):
+    """
+    OutputProcess body: open the LED device and send frames from the ring.
+    Errors end up in the final stats (as "error") rather than a traceback
+    the parent never sees.
+    """
+    from outputs import open_output
+    ring = FrameRing.attach(ring_name)
+    device = worker = None
+    final = {}
+    try:
+        device = open_output(ring.shape[0], **options)
+        worker = OutputWorker(device, frame_rate, dither=dither, power=power,
+                              interpolate=interpolate, source=ring).start()
+        while not stop.wait(STATS_INTERVAL) and worker.error is None:
+            stats.put(worker.stats())
+        final = worker.stats()
+        worker.stop(blank=bool(blank.value))
+    except Exception as e:
+        final.setdefault("error", repr(e))
+    stats.put(final)
+    stats.put(None)
+    if device is not None:
+        device.close()
+    del worker
+    ring.close()
+
+
+class OutputProcess:
+    """
+    An OutputWorker in its own process, with the same submit/back/publish/
+    stats/stop interface.  Frames go through a FrameRing in shared memory;
+    the child opens the LED device itself with open_output(num_leds,
+    **options), so only picklable settings cross over (`power` is copied).
+    If the child fails or dies, stats() says so under "error" and stop()
+    raises RuntimeError.
+    """
+
+    def __init__(self, num_leds, frame_rate=45, dither=False, power=None, interpolate=None,
+                 slots=4, **options):
+        if interpolate not in (None,) + INTERPOLATION:
+            raise ValueError(f"unknown interpolation {interpolate!r}; "
+                             f"choose from {INTERPOLATION}")
+        self.ring = FrameRing.create((num_leds, 4), np.uint16 if dither else np.uint8, slots)
+        # spawn, not fork: the parent usually has pygame/SDL state a fork would inherit
+        ctx = multiprocessing.get_context("spawn")
+        self._stop = ctx.Event()
+        self._blank = ctx.Value("b", 1)
+        self._stats = ctx.Queue()
+        self._last_stats = {}
+        self._finished = False    # got the child's final report
+        self._process = ctx.Process(
+            target=_output_main, name="led-output", daemon=True,
+            args=(self.ring.name, frame_rate, dither, power, interpolate, options,
+                  self._stop, self._blank, self._stats))
+
+    def start(self):
+        self._process.start()
+        return self
+
+    def submit(self, frame) -> None:
+        """Copy an (N,4) frame into the shared ring and publish it"""
+        self.ring.write(frame)
+
+    def back(self) -> np.ndarray:
+        """Shared slot to render the next frame into in place, then publish()"""
+        return self.ring.back()
+
+    def publish(self) -> None:
+        self.ring.publish()
+
+    def _drain(self, timeout=None):
+        """Take the child's reports; with a timeout, wait for the final one"""
+        try:
+            while not self._finished:
+                stats = self._stats.get_nowait() if timeout is None else \
+                    self._stats.get(timeout=timeout)
+                if stats is None:
+                    self._finished = True
+                else:
+                    self._last_stats = stats
+        except queue.Empty:
+            pass
+
+    def stats(self) -> dict:
+        """
+        The worker's latest stats (reported every STATS_INTERVAL), with
+        "error" set once the worker failed or the process died
+        """
+        self._drain()
+        stats = dict(self._last_stats)
+        if not self._finished and self._process.exitcode is not None:
+            stats.setdefault("error", f"output process exited "
+                                      f"(code {self._process.exitcode})")
+        return stats
+
+    def stop(self, blank=True):
+        """
+        Stop the output process (it blanks the strip) and free the ring;
+        raises RuntimeError if the output had failed
+        """
+        if self._process.is_alive():
+            self._blank.value = bool(blank)
+            self._stop.set()
+            # drain up to the final report so the child's queue can flush
+            self._drain(timeout=5.0)
+            self._process.join()
+        self.ring.close()
+        self.ring.unlink()
+        error = self.stats().get("error")
+        if error is not None:
+            raise RuntimeError(f"LED output failed: {error}")
@@ -0,0 +1,91 @@
+# outputs
+"""
+Pluggable LED output backends.
+
+Every backend takes (N,4) RGBW frames in physical LED order through the
+WS2814-style API (set_led_color / set_frame / update_strip / clear_strip /
+close).  Pick one with open_output(); the name comes from the `backend`
+argument, else the LED_OUTPUT environment variable, else
+config.OUTPUT_BACKEND:
+
+    ws2814     SPI hardware (config.SPI_DEVICE)
+    multibus   several SPI buses (config.SPI_SEGMENTS)
+    simulator  pygame preview window / surface
+    null       discard frames (benchmarking)
+    record     write encoded frames + timestamps to a file
+    ddp / e131 / artnet   UDP to remote controllers (LED_NET_HOST)
+
+    LED_OUTPUT=null python3 touch_ui.py
+"""
+
+import importlib
+import os
+
+import config
+
+__all__ = ["BACKENDS", "register_backend", "open_output", "backend_name"]
+
+BACKENDS = {}
+
+# backends that live in their own module, imported on first use so that
+# e.g. pygame is only needed when the simulator is actually selected
+_LAZY = {
+    "null":      "outputs.null",
+    "record":    "outputs.recording",
+    "simulator": "outputs.simulator",
+    "ddp":       "outputs.network",
+    "e131":      "outputs.network",
+    "artnet":    "outputs.network",
+}
+
+
+def register_backend(name):
+    """Class/factory decorator: make `name` selectable in open_output()"""
+    def wrap(factory):
+        BACKENDS[name] = factory
+        return factory
+    return wrap
+
+
+# options the SPI drivers understand; anything else is for other backends
+_SPI_OPTIONS = ("bits_per_symbol", "partial_updates", "full_refresh_interval", "chipset")
+
+
+def _spi_options(options, *extra):
+    picked = {k: v for k, v in options.items() if k in _SPI_OPTIONS + extra}
+    picked.setdefault("chipset", config.CHIPSET)
+    return picked
+
+
+@register_backend("ws2814")
+def _open_ws2814(num_leds, spi_device=None, **options):
+    from ws2814 import WS2814
+    return WS2814(spi_device or config.SPI_DEVICE, num_leds, 800,
+                  **_spi_options(options, "spi"))
+
+
+@register_backend("multibus")
+def _open_multibus(num_leds, segments=None, **options):
+    from ws2814 import MultiBusOutput
+    segments = segments or config.SPI_SEGMENTS
+    total = sum(int(seg[2]) for seg in segments)
+    if total != num_leds:
+        raise ValueError(f"multibus segments cover {total} LEDs but the wall has "
+                         f"{num_leds}; fix SPI_SEGMENTS in config.py")
+    return MultiBusOutput(segments, **_spi_options(options, "spi_factory"))
+
+
+def backend_name(backend=None):
+    return backend or os.environ.get("LED_OUTPUT") or config.OUTPUT_BACKEND
+
+
+def open_output(num_leds, backend=None, **options):
+    """Create the selected output backend for `num_leds` LEDs"""
+    name = backend_name(backend)
+    if name not in BACKENDS and name in _LAZY:
+        importlib.import_module(_LAZY[name])
+    if name not in BACKENDS:
+        raise ValueError(f"unknown LED output backend {name!r}; "
+                         f"choose from {sorted(set(BACKENDS) | set(_LAZY))}")
+    print(f"LED output: {name}")
+    return BACKENDS[name](num_leds, **options)
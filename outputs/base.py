@@ -0,0 +1,46 @@
+import numpy as np
+
+
+class OutputBackend:
+    """
+    Common base for LED output backends.
+
+    Keeps an (N,4) RGBW state in physical LED order and offers the same
+    set_led_color / fill_strip / clear_strip / set_frame / update_strip API
+    as the WS2814 driver, so entry points don't care where frames go.
+    Subclasses only implement show(frame).
+
+    Driver-specific options (partial_updates, spi_device, …) are accepted and
+    ignored by backends that have no use for them.
+    """
+
+    def __init__(self, num_leds, **options):
+        self.num_leds = num_leds
+        self.led_state = np.zeros((num_leds, 4), dtype=np.uint8)
+        self.frames = 0
+
+    def set_led_color(self, index, red, green, blue, white):
+        if 0 <= index < self.num_leds:
+            self.led_state[index] = (red, green, blue, white)
+            return True
+        return False
+
+    def fill_strip(self, red=0, green=0, blue=0, white=0):
+        self.led_state[:] = (red, green, blue, white)
+
+    def clear_strip(self):
+        self.fill_strip(0, 0, 0, 0)
+
+    def set_frame(self, frame):
+        self.led_state[:] = np.asarray(frame, dtype=np.uint8).reshape(self.num_leds, 4)
+
+    def update_strip(self):
+        self.show(self.led_state)
+        self.frames += 1
+
+    def show(self, frame):
+        """Output one (N,4) uint8 RGBW frame in physical LED order"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
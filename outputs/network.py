@@ -0,0 +1,74 @@
+# network.py
+"""
+Network pixel output: send frames to remote controllers (e.g. ESP32s
+running WLED) as DDP, E1.31 or Art-Net over UDP, so the Pi only renders.
+
+    LED_OUTPUT=ddp LED_NET_HOST=192.168.1.50 python3 touch_ui.py
+
+Packets are preallocated once (netpixel.PacketSet) and sent from a
+non-blocking, connected UDP socket. Python has no sendmmsg(), so the batch
+for a frame is a tight send() loop; a full socket buffer drops the rest of
+the frame's packets instead of stalling the renderer.
+"""
+
+import os
+import socket
+import numpy as np
+
+from netpixel import DEFAULT_PORTS, PacketSet
+from . import register_backend
+from .base import OutputBackend
+
+
+class NetworkOutput(OutputBackend):
+    protocol = None
+
+    def __init__(self, num_leds, host=None, port=None, channels=4,
+                 universe_start=None, **options):
+        super().__init__(num_leds)
+        self.host = host or os.environ.get("LED_NET_HOST", "127.0.0.1")
+        self.port = int(port or os.environ.get("LED_NET_PORT", DEFAULT_PORTS[self.protocol]))
+        self.packets = PacketSet(self.protocol, num_leds, channels, universe_start)
+        self.channels = channels
+        # contiguous (N, channels) staging area for RGB controllers
+        self._pixels = np.zeros((num_leds, channels), dtype=np.uint8)
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+        self.sock.connect((self.host, self.port))
+        self.sock.setblocking(False)
+        self.packets_sent = 0
+        self.packets_dropped = 0
+        print(f"{self.protocol} output to {self.host}:{self.port}, "
+              f"{len(self.packets.packets)} packets per frame")
+
+    def show(self, frame):
+        np.copyto(self._pixels, frame[:, :self.channels])
+        send = self.sock.send
+        packets = self.packets.fill(self._pixels)
+        for i, packet in enumerate(packets):
+            try:
+                send(packet)
+            except (BlockingIOError, ConnectionRefusedError):
+                # buffer full (or nobody listening yet): drop the rest
+                self.packets_dropped += len(packets) - i
+                break
+            self.packets_sent += 1
+
+    def close(self):
+        self.sock.close()
+
+
+@register_backend("ddp")
+class DDPOutput(NetworkOutput):
+    protocol = "ddp"
+
+
+@register_backend("e131")
+class E131Output(NetworkOutput):
+    protocol = "e131"
+
+
+@register_backend("artnet")
+class ArtNetOutput(NetworkOutput):
+    protocol = "artnet"
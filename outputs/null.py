@@ -0,0 +1,10 @@
+from . import register_backend
+from .base import OutputBackend
+
+
+@register_backend("null")
+class NullOutput(OutputBackend):
+    """Discards every frame; only counts them (see .frames)"""
+
+    def show(self, frame):
+        pass
@@ -0,0 +1,65 @@
+# recording.py
+"""
+Recording sink: writes every frame, encoded exactly as the SPI driver would
+put it on the wire for the configured chipset (8-bit symbols), plus a
+timestamp, to a file for later inspection or replay.
+
+File layout (little-endian):
+    header:  b"LEDREC01", uint32 num_leds, uint32 bytes_per_frame
+    frames:  float64 seconds since start, uint32 length, <length> SPI bytes
+"""
+
+import os
+import struct
+import time
+
+import config
+from ws2814.chipsets import get_chipset
+from ws2814.encoding import encode_rgbw
+from . import register_backend
+from .base import OutputBackend
+
+MAGIC = b"LEDREC01"
+_HEADER = struct.Struct("<8sII")
+_RECORD = struct.Struct("<dI")
+
+DEFAULT_PATH = os.environ.get("LED_RECORD_PATH", "recordings/output.ledrec")
+
+
+@register_backend("record")
+class RecordingOutput(OutputBackend):
+    def __init__(self, num_leds, path=None, chipset=None, **options):
+        super().__init__(num_leds)
+        self.chipset = get_chipset(chipset or config.CHIPSET)
+        self._table = self.chipset.table(8)
+        self.path = path or DEFAULT_PATH
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, num_leds, num_leds * self.chipset.channels * 8))
+        self._start = time.perf_counter()
+        print(f"Recording LED output to {self.path}")
+
+    def show(self, frame):
+        payload = encode_rgbw(frame, self._table, self.chipset.order)
+        self._file.write(_RECORD.pack(time.perf_counter() - self._start, payload.size))
+        self._file.write(payload.tobytes())
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_recording(path):
+    """Yield (timestamp, payload_bytes) for every frame in a recording"""
+    with open(path, "rb") as f:
+        magic, num_leds, frame_bytes = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an LED recording")
+        while True:
+            head = f.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return
+            stamp, length = _RECORD.unpack(head)
+            yield stamp, f.read(length)
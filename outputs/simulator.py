@@ -0,0 +1,50 @@
+import numpy as np
+import pygame
+
+from . import register_backend
+from .base import OutputBackend
+
+
+@register_backend("simulator")
+class SimulatorOutput(OutputBackend):
+    """
+    Shows physical frames as the wall looks, using pygame.
+
+    pixel_map[y*width + x] is the physical LED index of logical pixel (x, y),
+    negative for gaps (e.g. layout.WallLayout.physical); without one the
+    chain is drawn in rows of `width`. If the program already has a pygame
+    window, nothing is opened: the picture is kept in self.surface for the
+    host to blit. Otherwise a window of its own is opened and refreshed on
+    every frame.
+    """
+
+    def __init__(self, num_leds, width=None, height=None, pixel_map=None,
+                 pixel_size=20, **options):
+        super().__init__(num_leds)
+        self.width = width or num_leds
+        self.height = height or -(-num_leds // self.width)
+        if pixel_map is None:
+            pixel_map = np.arange(self.width * self.height)
+        # gaps and LEDs past the end of the chain read from a black padding row
+        pixel_map = np.asarray(pixel_map, dtype=np.intp)
+        self.pixel_map = np.where((pixel_map >= 0) & (pixel_map < num_leds),
+                                  pixel_map, num_leds)
+        self._padded = np.zeros((num_leds + 1, 4), dtype=np.uint8)
+        self.pixel_size = pixel_size
+        self.surface = pygame.Surface((self.width, self.height))
+
+        pygame.init()
+        self.window = None
+        if pygame.display.get_surface() is None:
+            self.window = pygame.display.set_mode(
+                (self.width * pixel_size, self.height * pixel_size))
+            pygame.display.set_caption("LED Wall Simulator")
+
+    def show(self, frame):
+        self._padded[:self.num_leds] = frame
+        rgb = self._padded[self.pixel_map, :3].reshape(self.height, self.width, 3)
+        pygame.surfarray.blit_array(self.surface, rgb.swapaxes(0, 1))
+        if self.window is not None:
+            pygame.event.pump()
+            pygame.transform.scale(self.surface, self.window.get_size(), self.window)
+            pygame.display.flip()
@@ -1,7 +1,7 @@
 import time
-import math
+import numpy as np
 from .base import Pattern as BasePattern, apply_modulation
-from colormaps import COLORMAPS
+from colormaps import COLORMAPS, colormap_array
 
 # --- Adjustable Parameters ---
 PARAMS = {
@@ -33,7 +33,7 @@ class Pattern(BasePattern):
         self.param_meta = PARAMS
         self.start_time = time.time()
 
-    def render(self, lfo_signals=None):
+    def render_into(self, buf, lfo_signals=None):
         t = time.time() - self.start_time
 
         # 1) Read raw parameters
@@ -62,34 +62,28 @@ class Pattern(BasePattern):
         t *= speed
 
         # 4) Pick colormap
-        cmap     = COLORMAPS.get(self.params["COLORMAP"], COLORMAPS["rainbow"])
+        cmap     = colormap_array(self.params["COLORMAP"], "rainbow")
         cmap_len = len(cmap)
 
         w, h = self.width, self.height
-        frame = []
+        vy = (np.arange(h) / h)[:, None]
+        vx = (np.arange(w) / w)[None, :]
 
-        for y in range(h):
-            vy = y / h
-            for x in range(w):
-                vx = x / w
+        # classic plasma formula
+        v = (
+            np.sin((vx + t) * frequency)
+          + np.sin((vy + t) * frequency)
+          + np.sin(((vx + vy) / 2 + t) * frequency)
+        )
+        # normalize [-3..3] → [0..1]
+        v = (v + 3.0) / 6.0
 
-                # classic plasma formula
-                v = (
-                    math.sin((vx + t) * frequency)
-                  + math.sin((vy + t) * frequency)
-                  + math.sin(((vx + vy) / 2 + t) * frequency)
-                )
-                # normalize [-3..3] → [0..1]
-                v = (v + 3.0) / 6.0
+        # apply amplitude & clamp
+        v = np.clip(v * amplitude, 0.0, 1.0)
 
-                # apply amplitude & clamp
-                v = max(0.0, min(1.0, v * amplitude))
+        # rotate through LUT
+        v = (v + shift) % 1.0
 
-                # rotate through LUT
-                v = (v + shift) % 1.0
-
-                idx = int(v * (cmap_len - 1))
-                r, g, b = cmap[idx]
-                frame.append((r, g, b, 0))
-
-        return frame
+        idx = (v * (cmap_len - 1)).astype(np.intp)
+        buf[..., :3] = cmap[idx]
+        buf[..., 3] = 0
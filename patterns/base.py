@@ -1,4 +1,22 @@
+import numpy as np
+
+
 class Pattern:
+    """
+    Patterns draw with render_into(buf): fill the caller's (H, W, 4) uint8
+    RGBW array in place, ideally with whole-array NumPy operations, so no
+    per-pixel Python objects exist between the pattern and the LEDs.
+
+    render() is the older API — a row-major list of W*H (r, g, b, w)
+    tuples.  Patterns that only define render() still work through the
+    default render_into(), which copies the list into the buffer; for
+    patterns with render_into(), render() returns a fresh (W*H, 4) array.
+    adapt_pattern() is how loaders pick this up per class.
+    """
+
+    # True for classes adapt_pattern() wrapped: frames come via render()'s list
+    slow_path = False
+
     def __init__(self, width, height, params=None):
         self.width = width
         self.height = height
@@ -8,8 +26,58 @@ class Pattern:
         self.params.update(params)
 
     def render(self, lfo_signals=None):
+        if type(self).render_into is not Pattern.render_into:
+            buf = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+            self.render_into(buf, lfo_signals)
+            return buf.reshape(-1, 4)
         return [(0, 0, 0, 0)] * (self.width * self.height)
 
+    def render_into(self, buf, lfo_signals=None):
+        """Draw the next frame into buf, an (H, W, 4) uint8 array"""
+        to_frame(self.render(lfo_signals), buf)
+
+
+def to_frame(frame, buf):
+    """
+    Copy a render()-style frame — W*H (r, g, b[, w]) tuples or an array —
+    into an (H, W, 4) uint8 buffer in one np.asarray step
+    """
+    arr = np.asarray(frame)
+    if arr.dtype != np.uint8:
+        arr = np.clip(arr, 0, 255)
+    arr = arr.reshape(-1, arr.shape[-1])
+    flat = buf.reshape(-1, 4)
+    channels = min(arr.shape[1], 4)
+    flat[:, :channels] = arr[:, :channels]
+    if channels < 4:
+        flat[:, channels:] = 0
+
+
+def has_array_api(cls):
+    """True if a pattern class draws with its own render_into()"""
+    return getattr(cls, "render_into", Pattern.render_into) is not Pattern.render_into
+
+
+def adapt_pattern(cls):
+    """
+    The class to instantiate for a pattern module's Pattern: `cls` itself if
+    it has the array API, else a subclass whose render_into() converts the
+    list from its render() (flagged slow_path).  Works for classes that
+    don't derive from Pattern too.
+    """
+    if has_array_api(cls) or getattr(cls, "render", None) is Pattern.render:
+        return cls
+
+    class Adapted(cls):
+        slow_path = True
+
+        def render_into(self, buf, lfo_signals=None):
+            to_frame(self.render(lfo_signals), buf)
+
+    Adapted.__name__ = Adapted.__qualname__ = cls.__name__
+    Adapted.__module__ = cls.__module__
+    return Adapted
+
 def apply_modulation(base, meta, amount):
     """
     base   :: the un-modulated parameter value
@@ -1,4 +1,5 @@
 import random, math
+import numpy as np
 from .base import Pattern as BasePattern, apply_modulation
 from colormaps import COLORMAPS
 
@@ -33,7 +34,7 @@ class Pattern(BasePattern):
         # each drop is [x:float, y:float, size:float]
         self.drops = []
 
-    def render(self, lfo_signals=None):
+    def render_into(self, buf, lfo_signals=None):
         w, h = self.width, self.height
 
         # 1) Read raw parameters
@@ -85,8 +86,8 @@ class Pattern(BasePattern):
         cmap = COLORMAPS.get(self.params["COLORMAP"], COLORMAPS["rainbow"])
         N    = len(cmap)
 
-        # 6) Build an empty frame
-        frame = [(0,0,0,0)] * (w * h)
+        # 6) Start from an empty frame
+        buf[:] = 0
 
         # 7) Draw each drop as a filled circle
         for x, y, size in self.drops:
@@ -96,15 +97,13 @@ class Pattern(BasePattern):
             r, g, b = cmap[idx]
 
             r2 = size * size
-            x0 = int(math.floor(x - size))
-            x1 = int(math.ceil (x + size))
-            y0 = int(math.floor(y - size))
-            y1 = int(math.ceil (y + size))
-            for py in range(y0, y1+1):
-                for px in range(x0, x1+1):
-                    dx = px - x
-                    dy = py - y
-                    if 0 <= px < w and 0 <= py < h and (dx*dx + dy*dy) <= r2:
-                        frame[py*w + px] = (r, g, b, 0)
-
-        return frame
+            x0 = max(0, int(math.floor(x - size)))
+            x1 = min(w - 1, int(math.ceil (x + size)))
+            y0 = max(0, int(math.floor(y - size)))
+            y1 = min(h - 1, int(math.ceil (y + size)))
+            if x0 > x1 or y0 > y1:
+                continue
+            # disc mask over the drop's (clipped) bounding box
+            py, px = np.ogrid[y0:y1+1, x0:x1+1]
+            inside = (px - x) ** 2 + (py - y) ** 2 <= r2
+            buf[y0:y1+1, x0:x1+1][inside] = (r, g, b, 0)
@@ -29,7 +29,7 @@ class Pattern(BasePattern):
         self.particles  = []       # list of dicts: x,y,vx,vy,age,lifespan,hue
         self.dt         = 1.0 / 30 # assume 30 FPS for motion
 
-    def render(self, lfo_signals=None):
+    def render_into(self, buf, lfo_signals=None):
         w, h = self.width, self.height
 
         # 1) Read raw parameters
@@ -91,7 +91,7 @@ class Pattern(BasePattern):
         self.particles = new_parts
 
         # 5) Draw frame
-        frame = [(0,0,0,0)] * (w * h)
+        buf[:] = 0
         for p in self.particles:
             t = p["age"] / p["lifespan"]
             # color ramp: hue + fade-out
@@ -103,6 +103,4 @@ class Pattern(BasePattern):
             ix = int(p["x"])
             iy = int(p["y"])
             if 0 <= ix < w and 0 <= iy < h:
-                frame[iy * w + ix] = (r, g, b, 0)
-
-        return frame
+                buf[iy, ix] = (r, g, b, 0)
@@ -1,7 +1,7 @@
-import math
 import random
+import numpy as np
 from .base import Pattern as BasePattern, apply_modulation
-from colormaps import COLORMAPS
+from colormaps import COLORMAPS, colormap_array
 
 PARAMS = {
     "NUM_WAVES": {
@@ -49,7 +49,7 @@ class Pattern(BasePattern):
         y = random.uniform(0, self.height)
         self.waves.append((x, y, 0))  # (x, y, age)
 
-    def render(self, lfo_signals=None):
+    def render_into(self, buf, lfo_signals=None):
         self.frame_count += 1
 
         # Params
@@ -79,7 +79,7 @@ class Pattern(BasePattern):
                 elif key == "COLOR_CYCLE_SPEED":
                     color_shift    = mod_val
 
-        cmap = COLORMAPS.get(self.params["COLORMAP"], COLORMAPS["jet"])
+        cmap = colormap_array(self.params["COLORMAP"], "jet")
         cmap_len = len(cmap)
         hue_offset = self.frame_count * color_shift
 
@@ -88,20 +88,13 @@ class Pattern(BasePattern):
         while len(self.waves) < num_waves:
             self._spawn_wave()
 
-        frame = []
-        for y in range(self.height):
-            for x in range(self.width):
-                total = 0.0
-                for wx, wy, age in self.waves:
-                    dx = x - wx
-                    dy = y - wy
-                    r = math.hypot(dx, dy)
-                    phase = r * spatial_freq - age * wave_speed
-                    total += math.sin(phase)
-                norm = 0.5 + 0.5 * (total / num_waves)
-                hue = (norm + hue_offset) % 1.0
-                index = int(hue * (cmap_len - 1))
-                r, g, b = cmap[index]
-                frame.append((r, g, b, 0))
-
-        return frame
+        y, x = np.mgrid[0:self.height, 0:self.width]
+        total = np.zeros((self.height, self.width))
+        for wx, wy, age in self.waves:
+            r = np.hypot(x - wx, y - wy)
+            total += np.sin(r * spatial_freq - age * wave_speed)
+        norm = 0.5 + 0.5 * (total / num_waves)
+        hue = (norm + hue_offset) % 1.0
+        index = (hue * (cmap_len - 1)).astype(np.intp)
+        buf[..., :3] = cmap[index]
+        buf[..., 3] = 0
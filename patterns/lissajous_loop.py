@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from .base import Pattern as BasePattern, apply_modulation
 from colormaps import COLORMAPS
 
@@ -31,7 +32,7 @@ class Pattern(BasePattern):
         super().__init__(width, height, params)
         self.param_meta = PARAMS
 
-    def render(self, lfo_signals=None):
+    def render_into(self, buf, lfo_signals=None):
         w, h = self.width, self.height
         cx, cy = w/2, h/2
 
@@ -62,23 +63,18 @@ class Pattern(BasePattern):
         idx = int(cc * (len(cmap)-1))
         color = cmap[idx]
 
-        # 4) Prepare empty frame
-        frame = [(0,0,0,0)] * (w * h)
+        # 4) Start from an empty frame
+        buf[:] = 0
 
         # 5) Sample N points along t=[0..1), draw 2×2 pixel “line”
         N = max(w, h) * 8  # enough resolution
-        for i in range(N):
-            t = i / N * 2*math.pi
-            x = cx + cx * math.sin(xf * t + ph)
-            y = cy + cy * math.sin(yf * t)
-            ix = int(round(x))
-            iy = int(round(y))
-            # draw a 2×2 square centered
-            for dx in (0,1):
-                for dy in (0,1):
-                    px = ix + dx
-                    py = iy + dy
-                    if 0 <= px < w and 0 <= py < h:
-                        frame[py*w + px] = (*color, 0)
-
-        return frame
+        t = np.arange(N) / N * 2*math.pi
+        ix = np.rint(cx + cx * np.sin(xf * t + ph)).astype(np.intp)
+        iy = np.rint(cy + cy * np.sin(yf * t)).astype(np.intp)
+        # draw a 2×2 square at each point
+        for dx in (0,1):
+            for dy in (0,1):
+                px = ix + dx
+                py = iy + dy
+                keep = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+                buf[py[keep], px[keep]] = (*color, 0)
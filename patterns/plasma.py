@@ -1,7 +1,8 @@
 import math
 import random
+import numpy as np
 from .base import Pattern as BasePattern, apply_modulation
-from colormaps import COLORMAPS
+from colormaps import COLORMAPS, colormap_array
 
 PARAMS = {
     "NUM_GENERATORS": {
@@ -43,7 +44,7 @@ class Pattern(BasePattern):
             phase = random.uniform(0, 2 * math.pi)
             self.generators.append((angle, freq, phase))
 
-    def render(self, lfo_signals=None):
+    def render_into(self, buf, lfo_signals=None):
         self.frame_count += 1
 
         # Parameters
@@ -70,7 +71,7 @@ class Pattern(BasePattern):
                 elif key == "COLOR_CYCLE_SPEED":
                     cycle_speed = mod_val
 
-        cmap = COLORMAPS.get(self.params["COLORMAP"], COLORMAPS["jet"])
+        cmap = colormap_array(self.params["COLORMAP"], "jet")
         cmap_len = len(cmap)
 
         t = self.frame_count * move_speed
@@ -83,19 +84,15 @@ class Pattern(BasePattern):
             phase = random.uniform(0, 2 * math.pi)
             self.generators.append((angle, freq, phase))
 
-        frame = []
-        for y in range(self.height):
-            for x in range(self.width):
-                value = 0.0
-                for i in range(num_gen):
-                    angle, freq, phase = self.generators[i]
-                    dx = x - self.width / 2
-                    dy = y - self.height / 2
-                    dist = dx * math.cos(angle) + dy * math.sin(angle)
-                    value += math.sin(freq * dist + phase + t)
-                normalized = 0.5 + 0.5 * (value / num_gen)
-                index = int((normalized + hue_shift) * (cmap_len - 1)) % cmap_len
-                r, g, b = cmap[index]
-                frame.append((r, g, b, 0))
-
-        return frame
+        y, x = np.mgrid[0:self.height, 0:self.width]
+        dx = x - self.width / 2
+        dy = y - self.height / 2
+        value = np.zeros((self.height, self.width))
+        for i in range(num_gen):
+            angle, freq, phase = self.generators[i]
+            dist = dx * math.cos(angle) + dy * math.sin(angle)
+            value += np.sin(freq * dist + phase + t)
+        normalized = 0.5 + 0.5 * (value / num_gen)
+        index = ((normalized + hue_shift) * (cmap_len - 1)).astype(np.intp) % cmap_len
+        buf[..., :3] = cmap[index]
+        buf[..., 3] = 0
@@ -1,6 +1,7 @@
 import math
+import numpy as np
 from .base import Pattern as BasePattern, apply_modulation
-from colormaps import COLORMAPS
+from colormaps import COLORMAPS, colormap_array
 
 # --- Adjustable Parameters ---
 PARAMS = {
@@ -28,7 +29,7 @@ class Pattern(BasePattern):
         self.param_meta  = PARAMS
         self.frame_count = 0
 
-    def render(self, lfo_signals=None):
+    def render_into(self, buf, lfo_signals=None):
         self.frame_count += 1
         w, h = self.width, self.height
         cx, cy = w/2.0, h/2.0
@@ -62,32 +63,23 @@ class Pattern(BasePattern):
         shift     = shift % 1.0
 
         # 3) pick colormap
-        cmap     = COLORMAPS.get(self.params.get("COLORMAP","rainbow"), COLORMAPS["rainbow"])
+        cmap     = colormap_array(self.params.get("COLORMAP","rainbow"), "rainbow")
         cmap_n   = len(cmap)
 
         # 4) time offset in “ring units”
         t = (self.frame_count / 30.0) * speed / spacing
 
-        frame = []
-        for y in range(h):
-            for x in range(w):
-                # radial distance normalized 0..1
-                dx = x - cx
-                dy = y - cy
-                r = math.hypot(dx, dy) / max_r
+        # radial distance normalized 0..1
+        y, x = np.mgrid[0:h, 0:w]
+        r = np.hypot(x - cx, y - cy) / max_r
 
-                # position within each ring [0..1)
-                pos = (r / spacing - t) % 1.0
+        # position within each ring [0..1)
+        pos = (r / spacing - t) % 1.0
 
-                # if we’re within the thickness window, map to color
-                if pos < (thickness/spacing):
-                    # rotate that position by shift for color cycling
-                    cpos = (pos + shift) % 1.0
-                    idx = int(cpos * (cmap_n-1))
-                    idx = max(0, min(cmap_n-1, idx))
-                    r_,g_,b_ = cmap[idx]
-                    frame.append((r_, g_, b_, 0))
-                else:
-                    frame.append((0, 0, 0, 0))
-
-        return frame
+        # rotate that position by shift for color cycling
+        cpos = (pos + shift) % 1.0
+        idx = np.clip((cpos * (cmap_n-1)).astype(np.intp), 0, cmap_n-1)
+        buf[..., :3] = cmap[idx]
+        buf[..., 3] = 0
+        # only pixels within the thickness window are lit
+        buf[pos >= (thickness/spacing)] = 0
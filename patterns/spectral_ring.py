@@ -1,8 +1,9 @@
 import time
 import math
+import numpy as np
 from .base import Pattern as BasePattern, apply_modulation
 from audio_env import evaluate_fft_bands
-from colormaps import COLORMAPS
+from colormaps import COLORMAPS, colormap_array
 
 # --- Adjustable Parameters ---
 PARAMS = {
@@ -49,7 +50,7 @@ class Pattern(BasePattern):
         self.prev_mags    = None
         self.prev_bins    = int(self.params["BINS"])
 
-    def render(self, lfo_signals=None):
+    def render_into(self, buf, lfo_signals=None):
         self.frame_count += 1
 
         # 0) Grab and possibly update band count
@@ -100,30 +101,24 @@ class Pattern(BasePattern):
         w, h    = self.width, self.height
         cx, cy  = w/2, h/2
         max_r   = min(cx, cy) * radius_scale
-        cmap    = COLORMAPS.get(self.params["COLORMAP"], COLORMAPS["rainbow"])
+        cmap    = colormap_array(self.params["COLORMAP"], "rainbow")
         cmap_n  = len(cmap)
-        frame   = []
 
         color_offset = (self.frame_count * color_shift / 30.0) % 1.0
 
-        for py in range(h):
-            for px in range(w):
-                dx = px - cx
-                dy = py - cy
-                r  = math.hypot(dx, dy)
-                # normalized radius
-                rn = r / max_r
-                theta = (math.atan2(dy, dx) / (2*math.pi) + 0.5)
-                theta = (theta + self.angle_offset) % 1.0
+        py, px = np.mgrid[0:h, 0:w]
+        dx = px - cx
+        dy = py - cy
+        # normalized radius
+        rn = np.hypot(dx, dy) / max_r
+        theta = (np.arctan2(dy, dx) / (2*math.pi) + 0.5)
+        theta = (theta + self.angle_offset) % 1.0
 
-                band = min(bins-1, int(theta * bins))
-                if rn <= mags[band]:
-                    # color by rotated theta
-                    cf = (theta + color_offset) % 1.0
-                    idx = int(cf * (cmap_n-1))
-                    rc, gc, bc = cmap[idx]
-                    frame.append((rc, gc, bc, 0))
-                else:
-                    frame.append((0, 0, 0, 0))
-
-        return frame
+        band = np.minimum(bins-1, (theta * bins).astype(np.intp))
+        # color by rotated theta
+        cf = (theta + color_offset) % 1.0
+        idx = (cf * (cmap_n-1)).astype(np.intp)
+        buf[..., :3] = cmap[idx]
+        buf[..., 3] = 0
+        # lit out to each band's magnitude
+        buf[rn > np.asarray(mags)[band]] = 0
@@ -1,6 +1,7 @@
 import math
+import numpy as np
 from .base import Pattern as BasePattern, apply_modulation
-from colormaps import COLORMAPS
+from colormaps import COLORMAPS, colormap_array
 
 PARAMS = {
     "STRIPE_SPEED": {
@@ -34,7 +35,7 @@ class Pattern(BasePattern):
         self.param_meta = PARAMS
         self.frame_count = 0
 
-    def render(self, lfo_signals=None):
+    def render_into(self, buf, lfo_signals=None):
         self.frame_count += 1
 
         # Get base parameters
@@ -62,7 +63,7 @@ class Pattern(BasePattern):
                     angle_deg = mod_val
 
         # Colormap
-        cmap = COLORMAPS.get(self.params["COLORMAP"], COLORMAPS["jet"])
+        cmap = colormap_array(self.params["COLORMAP"], "jet")
         cmap_len = len(cmap)
 
         angle_rad = math.radians(angle_deg)
@@ -71,12 +72,8 @@ class Pattern(BasePattern):
 
         t_offset = self.frame_count * speed
 
-        frame = []
-        for j in range(self.height):
-            for i in range(self.width):
-                stripe_coord = (i * dx + j * dy + t_offset) / width
-                color_index = int(abs(stripe_coord) * 10) % cmap_len
-                r, g, b = cmap[color_index]
-                frame.append((r, g, b, 0))
-
-        return frame
+        j, i = np.mgrid[0:self.height, 0:self.width]
+        stripe_coord = (i * dx + j * dy + t_offset) / width
+        color_index = (np.abs(stripe_coord) * 10).astype(np.intp) % cmap_len
+        buf[..., :3] = cmap[color_index]
+        buf[..., 3] = 0
@@ -1,6 +1,7 @@
 import math
+import numpy as np
 from .base import Pattern as BasePattern, apply_modulation
-from colormaps import COLORMAPS
+from colormaps import COLORMAPS, colormap_array
 
 # ─── Adjustable Parameters ────────────────────────────────────────────────
 PARAMS = {
@@ -36,7 +37,7 @@ class Pattern(BasePattern):
         self.param_meta  = PARAMS
         self.frame_count = 0
 
-    def render(self, lfo_signals=None):
+    def render_into(self, buf, lfo_signals=None):
         self.frame_count += 1
 
         # ── 1) Read raw parameters ─────────────────────────────────
@@ -62,32 +63,27 @@ class Pattern(BasePattern):
                     color_shift = mv
 
         # ── 3) Prepare color lookup ─────────────────────────────────
-        cmap     = COLORMAPS.get(self.params["COLORMAP"], COLORMAPS["jet"])
+        cmap     = colormap_array(self.params["COLORMAP"], "jet")
         cmap_len = len(cmap)
 
         w, h = self.width, self.height
         t    = self.frame_count * wave_speed
 
-        frame = []
-        for y in range(h):
-            y_norm = y / h
-            # how far to offset this row (in pixels)
-            offset = amplitude * w * math.sin(2 * math.pi * (y_norm + t))
+        y_norm = (np.arange(h) / h)[:, None]
+        # how far to offset each row (in pixels)
+        offset = amplitude * w * np.sin(2 * math.pi * (y_norm + t))
 
-            for x in range(w):
-                # shifted X (wraps naturally)
-                x_off = (x + offset) / w
+        # shifted X (wraps naturally)
+        x_off = (np.arange(w)[None, :] + offset) / w
 
-                # stripe pattern
-                val = math.sin(2 * math.pi * (x_off * stripes))
+        # stripe pattern
+        val = np.sin(2 * math.pi * (x_off * stripes))
 
-                # normalize [–1…1] → [0…1]
-                v_norm = 0.5 * val + 0.5
+        # normalize [–1…1] → [0…1]
+        v_norm = 0.5 * val + 0.5
 
-                # add a slow hue shift
-                hue = (v_norm + self.frame_count * color_shift) % 1.0
-                idx = int(hue * (cmap_len - 1))
-                r, g, b = cmap[idx]
-                frame.append((r, g, b, 0))
-
-        return frame
+        # add a slow hue shift
+        hue = (v_norm + self.frame_count * color_shift) % 1.0
+        idx = (hue * (cmap_len - 1)).astype(np.intp)
+        buf[..., :3] = cmap[idx]
+        buf[..., 3] = 0
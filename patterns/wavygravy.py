@@ -1,6 +1,7 @@
 import math
+import numpy as np
 from .base import Pattern as BasePattern, apply_modulation
-from colormaps import COLORMAPS
+from colormaps import COLORMAPS, colormap_array
 
 # ─── Adjustable Parameters ────────────────────────────────────────────────
 PARAMS = {
@@ -36,7 +37,7 @@ class Pattern(BasePattern):
         self.param_meta  = PARAMS
         self.frame_count = 0
 
-    def render(self, lfo_signals=None):
+    def render_into(self, buf, lfo_signals=None):
         self.frame_count += 1
 
         # read raw params
@@ -62,27 +63,23 @@ class Pattern(BasePattern):
                     color_shift = mv
 
         # fetch colormap
-        cmap     = COLORMAPS.get(self.params["COLORMAP"], COLORMAPS["jet"])
+        cmap     = colormap_array(self.params["COLORMAP"], "jet")
         cmap_len = len(cmap)
 
         w, h = self.width, self.height
         t = self.frame_count * speed
-        frame = []
+        y, x = np.mgrid[0:h, 0:w]
 
-        for y in range(h):
-            for x in range(w):
-                acc = 0.0
-                # sum a few sin waves with different multipliers
-                for i in range(num_waves):
-                    freq = scale * (i + 1)
-                    phase = 2 * math.pi * ( (x / w) * freq + (y / h) * freq - t )
-                    acc += math.sin(phase)
-                # normalize into [0,1]
-                val = (acc / num_waves) * 0.5 + 0.5
-                # color shift over time
-                hue = (val + self.frame_count * color_shift) % 1.0
-                idx = int(hue * (cmap_len - 1))
-                r, g, b = cmap[idx]
-                frame.append((r, g, b, 0))
-
-        return frame
+        acc = np.zeros((h, w))
+        # sum a few sin waves with different multipliers
+        for i in range(num_waves):
+            freq = scale * (i + 1)
+            phase = 2 * math.pi * ( (x / w) * freq + (y / h) * freq - t )
+            acc += np.sin(phase)
+        # normalize into [0,1]
+        val = (acc / num_waves) * 0.5 + 0.5
+        # color shift over time
+        hue = (val + self.frame_count * color_shift) % 1.0
+        idx = (hue * (cmap_len - 1)).astype(np.intp)
+        buf[..., :3] = cmap[idx]
+        buf[..., 3] = 0
@@ -0,0 +1,114 @@
+# power.py
+"""
+Automatic current limiting for the LED output.
+
+PowerLimiter estimates the current a frame will draw from its final RGBW
+values — per LED it is idle + Σ channel/full × mA-per-channel — summed over
+the whole chain and over each power-injection segment.  When a budget would
+be exceeded the whole frame is scaled down by the tightest ratio (one
+factor for the wall, so segments don't visibly step in brightness);
+otherwise it passes through untouched.  Per frame that is one matmul, one
+reduceat and, only when limiting, one multiply.
+
+    limiter = PowerLimiter(num_leds)          # figures from config.py
+    frame = limiter.apply(frame, out=scratch)
+    limiter.draw_ma, limiter.segment_ma, limiter.scale
+
+uint8 frames are full scale at 255, uint16 (8.8, see dither.py) at 255·256.
+"""
+
+import numpy as np
+
+import config
+from dither import FULL_SCALE
+
+__all__ = ["PowerLimiter"]
+
+
+class PowerLimiter:
+    """
+    num_leds:       LEDs in the chain
+    ma_per_channel: (r, g, b, w) mA of one LED channel at full scale
+    idle_ma:        quiescent mA per LED (counted, never scaled away)
+    budget_ma:      limit for the whole chain, None for no limit
+    segments:       (first_led, count, budget_ma) per power-injection
+                    segment, not overlapping (else ValueError); budget None
+                    leaves that segment unlimited
+    """
+
+    def __init__(self, num_leds, ma_per_channel=None, idle_ma=None,
+                 budget_ma=None, segments=None):
+        self.num_leds = num_leds
+        self.ma_per_channel = np.array(ma_per_channel or config.LED_MA_PER_CHANNEL,
+                                       dtype=np.float32)
+        self.idle_ma = config.LED_IDLE_MA if idle_ma is None else idle_ma
+        self.budget_ma = config.POWER_BUDGET_MA if budget_ma is None else budget_ma
+        if segments is None:
+            segments = config.POWER_SEGMENTS
+        self.segments = sorted((int(s[0]), int(s[1]), s[2]) for s in segments)
+        end = 0
+        for start, count, _ in self.segments:
+            if not (0 <= start < num_leds and count > 0):
+                raise ValueError(f"power segment ({start}, {count}) is outside "
+                                 f"the {num_leds}-LED chain")
+            # each segment is one reduceat bin, which stops at the next edge
+            if start < end:
+                raise ValueError(f"power segment ({start}, {count}) overlaps the "
+                                 f"previous one, which ends at LED {end}")
+            end = start + count
+
+        # reduceat bins: every segment start plus the gaps between them
+        # (LEDs outside a segment only count towards the chain total)
+        edges = sorted({0, *[s for s, _, _ in self.segments],
+                        *[min(s + n, num_leds) for s, n, _ in self.segments]} - {num_leds})
+        self._edges = np.array(edges, dtype=np.intp)
+        self._seg_bins = np.array([edges.index(s) for s, _, _ in self.segments],
+                                  dtype=np.intp)
+        self._seg_idle = np.array([n * self.idle_ma for _, n, _ in self.segments])
+        self._seg_budget = np.array([np.inf if b is None else b for _, _, b in self.segments])
+
+        self.draw_ma = 0.0                       # last frame, before limiting
+        self.segment_ma = np.zeros(len(self.segments))
+        self.scale = 1.0                         # last factor applied
+        self.limited = 0                         # frames scaled down so far
+
+    def estimate(self, frame):
+        """Total and per-segment mA of an (N,4) frame, before limiting"""
+        frame = np.asarray(frame)
+        full = FULL_SCALE if frame.dtype == np.uint16 else 255
+        per_led = frame @ (self.ma_per_channel / full)
+        bins = np.add.reduceat(per_led, self._edges) if len(per_led) else np.zeros(1)
+        total = float(bins.sum()) + len(per_led) * self.idle_ma
+        return total, bins[self._seg_bins] + self._seg_idle
+
+    def apply(self, frame, out=None):
+        """
+        Limit an (N,4) RGBW frame; returns `frame` itself when it is within
+        budget, else the scaled frame (written into `out` if given).
+        """
+        frame = np.asarray(frame)
+        self.draw_ma, self.segment_ma = self.estimate(frame)
+
+        scale = 1.0
+        if self.budget_ma is not None and self.draw_ma > self.budget_ma:
+            scale = self._ratio(self.budget_ma, self.draw_ma, self.num_leds * self.idle_ma)
+        if len(self.segments):
+            over = self.segment_ma > self._seg_budget
+            if over.any():
+                ratios = [self._ratio(b, d, i) for b, d, i in
+                          zip(self._seg_budget[over], self.segment_ma[over], self._seg_idle[over])]
+                scale = min(scale, *ratios)
+        self.scale = scale
+        if scale >= 1.0:
+            return frame
+
+        self.limited += 1
+        if out is None:
+            out = np.empty_like(frame)
+        np.multiply(frame, scale, out=out, casting="unsafe")
+        return out
+
+    @staticmethod
+    def _ratio(budget, draw, idle):
+        # the idle current can't be scaled, only what the LEDs light with
+        return max(0.0, budget - idle) / max(draw - idle, 1e-9)
@@ -0,0 +1,446 @@
+# render_engine.py
+"""
+The render/output half of touch_ui, in a process of its own.
+
+launch_ui() used to handle events, draw widgets, render the pattern,
+composite the sprite, correct colors and feed the LEDs in one loop under
+one clock.tick(), so opening a dropdown or the patch grid slowed the wall.
+Now the UI process only handles input and draws; a RenderEngine in another
+process renders at the frame rate on its own clock:
+
+    UI ──commands──▶ engine    ("pattern", name, params, modulation),
+                               ("params", {...}), ("modulation", {...}),
+                               ("lfo", LFO_CONFIG), ("env", ENV_CONFIG),
+                               ("bpm", bpm), ("rgbw", strategy), ("quit",)
+    UI ◀──preview─── engine    frame_ring.FrameRing of (H, W, 4) frames
+                               as rendered, sprite included
+    UI ◀──signals─── engine    current LFO / envelope values for the meters
+    UI ◀──stats───── engine    stats() every STATS_INTERVAL and on errors
+
+EngineProcess is the UI's handle.  Its sync() sends a setting only when it
+differs from what was last sent, so the UI calls it every tick with its
+whole state instead of tracking which widget changed what.
+
+A pattern that raises (in its constructor, update_params() or render) is
+dropped and the wall goes black until the next pattern; the error shows
+up in stats() as "error" instead of ending the engine.  If the engine
+process dies anyway, EngineProcess.stats() reports it and preview() goes
+black.
+
+The engine sends to the LEDs through an OutputWorker thread of its own or,
+given the name of an output_worker.OutputProcess ring, writes its frames
+straight into that ring.
+"""
+
+import copy
+import importlib
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+import numpy as np
+from PIL import Image
+
+import audio_env
+import config
+import lfo
+from calibration import load_calibration
+from color_pipeline import ColorPipeline
+from frame_ring import FrameRing
+from framepool import FramePool
+from gamma import init_gamma
+from output_worker import STATS_INTERVAL, OutputWorker
+from patterns.base import adapt_pattern
+
+__all__ = ["RenderEngine", "EngineProcess", "MOD_SOURCES",
+           "load_patterns", "load_sprite_arrays", "overlay_sprite"]
+
+# modulation sources, in the order of EngineProcess's shared signal array
+MOD_SOURCES = ("lfo1", "lfo2", "envl", "envh")
+
+
+def load_patterns(quiet=False):
+    """Pattern modules in patterns/ by name, legacy ones wrapped by adapt_pattern()"""
+    patterns = {}
+    pattern_dir = "patterns"
+    for fname in os.listdir(pattern_dir):
+        if fname.endswith(".py") and not fname.startswith("_"):
+            modname = fname[:-3]
+            try:
+                module = importlib.import_module(f"patterns.{modname}")
+                if hasattr(module, "Pattern") and hasattr(module, "PARAMS"):
+                    # patterns still returning tuple lists from render() get
+                    # a render_into() that converts them (Pattern.slow_path)
+                    module.Pattern = adapt_pattern(module.Pattern)
+                    patterns[modname] = module
+            except Exception as e:
+                if not quiet:
+                    print(f"Error loading pattern {modname}: {e}")
+    slow = sorted(name for name, module in patterns.items() if module.Pattern.slow_path)
+    if slow and not quiet:
+        print(f"{len(slow)} of {len(patterns)} patterns on the slow list path: {', '.join(slow)}")
+    return patterns
+
+
+def load_sprite_arrays(folder="sprites"):
+    """
+    Sprite name -> [(rgb (h,w,3) uint8, opaque (h,w) bool)] per frame, for
+    PNGs and animated GIFs — touch_ui.load_sprites() without pygame
+    """
+    sprites = {}
+    for fname in os.listdir(folder):
+        name, ext = os.path.splitext(fname)
+        if ext.lower() not in (".png", ".gif"):
+            continue
+        image = Image.open(os.path.join(folder, fname))
+        frames = []
+        for i in range(getattr(image, "n_frames", 1)):
+            image.seek(i)
+            rgba = np.asarray(image.convert("RGBA"))
+            frames.append((np.ascontiguousarray(rgba[..., :3]), rgba[..., 3] > 0))
+        sprites[name] = frames
+    return sprites
+
+
+def overlay_sprite(frame, rgb, opaque):
+    """Copy a sprite's opaque pixels into the centre of an (H, W, 4) frame"""
+    h, w = opaque.shape
+    H, W = frame.shape[:2]
+    oy, ox = (H - h) // 2, (W - w) // 2
+    # clip sprites larger than the wall
+    y0, x0 = max(0, -oy), max(0, -ox)
+    y1, x1 = min(h, H - oy), min(w, W - ox)
+    region = frame[oy + y0:oy + y1, ox + x0:ox + x1]
+    mask = opaque[y0:y1, x0:x1]
+    region[mask, :3] = rgb[y0:y1, x0:x1][mask]
+    region[mask, 3] = 0
+
+
+class RenderEngine:
+    """
+    Renders the current pattern, composites the sprite, corrects colors and
+    hands frames to `output` (anything with back()/publish(): an
+    OutputWorker or a FrameRing attached as writer), and copies each frame
+    into `preview` if given.
+    wall:       layout.WallLayout
+    brightness: folded into the color LUT / calibration
+    rgbw:       initial RGB→RGBW split
+    """
+
+    def __init__(self, wall, output, preview=None, brightness=1.0, rgbw=config.RGBW_STRATEGY):
+        self.wall = wall
+        self.output = output
+        self.preview = preview
+        self.patterns = load_patterns(quiet=True)
+        self.sprites = load_sprite_arrays()
+        self.module = None
+        self.pattern = None
+        self.params = {}
+        self.start = time.perf_counter()
+        self.pool = FramePool(track_gc=True)
+        # warm-white fix, RGBW split, gamma and brightness folded into one LUT;
+        # with a per-panel calibration file the LUT stops at the RGBW split and
+        # gamma/scale/brightness are applied per LED after mapping
+        bits = config.OUTPUT_BITS
+        self.calibration = load_calibration(config.CALIBRATION_FILE, wall.num_leds, brightness,
+                                            wall.led_panel, bits, pool=self.pool)
+        self.color = ColorPipeline(brightness=brightness, rgbw=rgbw,
+                                   with_gamma=self.calibration is None, bits=bits,
+                                   pool=self.pool)
+        self.frames = 0
+        self.render_ms = 0.0     # smoothed time per tick
+        self.error = None        # last pattern/command failure, for stats()
+
+    def fail(self, what, error):
+        """Record a failed command or pattern; a broken pattern is dropped"""
+        traceback.print_exception(error)
+        self.error = f"{what}: {error!r}"
+        if what.startswith("pattern"):
+            self.pattern = None
+
+    def handle(self, command, *args):
+        """Apply one UI command (see module docstring)"""
+        if command == "pattern":
+            name, params, modulation = args
+            self.pattern = None
+            module = self.module = self.patterns[name]
+            self.params = dict(params)
+            self._set_modulation(module.PARAMS, modulation)
+            try:
+                pattern = module.Pattern(self.wall.width, self.wall.height, params=self.params)
+                pattern.update_params(self.params)
+            except Exception as e:
+                self.fail(f"pattern {name}", e)
+                return
+            self.pattern = pattern
+            self.error = None
+        elif command == "params":
+            self.params = dict(args[0])
+            if self.pattern is not None:
+                try:
+                    self.pattern.update_params(self.params)
+                except Exception as e:
+                    self.fail("pattern params", e)
+        elif command == "modulation":
+            if self.module is not None:
+                self._set_modulation(self.module.PARAMS, args[0])
+        elif command == "lfo":
+            for name, cfg in args[0].items():
+                lfo.LFO_CONFIG.setdefault(name, {}).clear()
+                lfo.LFO_CONFIG[name].update(cfg)
+        elif command == "env":
+            for name, cfg in args[0].items():
+                audio_env.ENV_CONFIG.setdefault(name, {}).clear()
+                audio_env.ENV_CONFIG[name].update(cfg)
+        elif command == "bpm":
+            lfo.BPM = args[0]
+        elif command == "rgbw":
+            self.color.update(rgbw=args[0])
+        else:
+            raise ValueError(f"unknown engine command {command!r}")
+
+    @staticmethod
+    def _set_modulation(param_meta, modulation):
+        """Modulation flags as saved in patches (touch_ui.extract_mod_config())"""
+        for name, meta in param_meta.items():
+            if isinstance(meta, dict) and meta.get("modulatable"):
+                m = modulation.get(name, {})
+                meta["mod_active"] = m.get("mod_active", False)
+                meta["mod_source"] = m.get("mod_source")
+                meta["mod_mode"] = m.get("mod_mode", meta.get("mod_mode", "add"))
+
+    def tick(self):
+        """Render one frame and send it; returns the modulation signals used"""
+        t0 = time.perf_counter()
+        signals = lfo.evaluate_lfos()
+        signals.update(audio_env.evaluate_env())
+
+        wall, pool = self.wall, self.pool
+        frame = pool.take((wall.height, wall.width, 4))
+        if self.pattern is not None:
+            try:
+                self.pattern.render_into(frame, lfo_signals=signals)
+            except Exception as e:
+                self.fail("pattern render", e)
+        if self.pattern is None:
+            frame[:] = 0
+
+        # sprite overlay (static or animated GIF), one frame per beat
+        frames = self.sprites.get(self.params.get("SPRITE", "none"))
+        if frames:
+            beat = (t0 - self.start) * lfo.BPM / 60.0
+            overlay_sprite(frame, *frames[int(beat) % len(frames)])
+        if self.preview is not None:
+            np.copyto(self.preview.back(), frame)
+            self.preview.publish()
+
+        # color correction is one LUT lookup, wiring order one gather; the
+        # last step writes straight into the output's back buffer
+        corrected = pool.take((wall.width * wall.height, 4), self.color.dtype)  # logical order
+        self.color.apply(frame.reshape(-1, 4), out=corrected)
+        if self.calibration is not None:
+            led_frame = pool.take((wall.num_leds, 4), self.color.dtype)
+            wall.to_physical(corrected, out=led_frame)
+            self.calibration.apply(led_frame, out=self.output.back())
+        else:
+            wall.to_physical(corrected, out=self.output.back())
+        self.output.publish()
+        pool.recycle()
+
+        self.frames += 1
+        self.render_ms += 0.1 * ((time.perf_counter() - t0) * 1000.0 - self.render_ms)
+        return signals
+
+    def stats(self) -> dict:
+        stats = {"frames": self.frames, "render_ms": round(self.render_ms, 2),
+                 "pool": self.pool.stats()}
+        if self.error is not None:
+            stats["error"] = self.error
+        return stats
+
+
+def _engine_main(wall, frame_rate, brightness, rgbw, gamma_settings, output_settings,
+                 output_options, output_ring, preview_name, commands, signals, stats):
+    """
+    EngineProcess body: build the engine and run it at frame_rate until
+    "quit".  Reports stats every STATS_INTERVAL and right after an error;
+    the last report is followed by None.  If the engine itself fails the
+    LEDs are blanked and the final report carries the error.
+    """
+    if gamma_settings is not None:
+        init_gamma(*gamma_settings)
+    device = worker = output = preview = engine = None
+    result = {}
+    try:
+        if output_ring is not None:
+            output = FrameRing.attach(output_ring)
+        else:
+            from outputs import open_output
+            device = open_output(wall.num_leds, **output_options)
+            output = worker = OutputWorker(device, frame_rate, **output_settings).start()
+        preview = FrameRing.attach(preview_name)
+        engine = RenderEngine(wall, output, preview, brightness, rgbw)
+        _run_engine(engine, worker, frame_rate, commands, signals, stats)
+        result = engine.stats()
+    except Exception as e:
+        traceback.print_exc()
+        result = dict(engine.stats() if engine is not None else {}, error=repr(e))
+        if worker is None and output is not None:
+            output.write(np.zeros(output.shape, output.dtype))   # blank the OutputProcess
+    if worker is not None:
+        try:
+            worker.stop()   # blanks the strip
+        except RuntimeError as e:
+            result.setdefault("error", str(e))
+        result["output"] = worker.stats()
+        device.close()
+    stats.put(result)
+    stats.put(None)
+    if engine is not None:
+        engine.pool.close()
+    del engine
+    if preview is not None:
+        preview.close()
+    if worker is None and output is not None:
+        output.close()
+
+
+def _run_engine(engine, worker, frame_rate, commands, signals, stats):
+    period = 1.0 / frame_rate
+    next_tick = next_report = time.perf_counter()
+    while True:
+        error = engine.error
+        try:
+            while True:
+                command = commands.get_nowait()
+                if command[0] == "quit":
+                    return
+                try:
+                    engine.handle(*command)
+                except Exception as e:
+                    engine.fail(command[0], e)
+        except queue.Empty:
+            pass
+        values = engine.tick()
+        signals[:] = [values.get(name, 0.0) for name in MOD_SOURCES]
+
+        now = time.perf_counter()
+        if now >= next_report or engine.error != error:
+            report = engine.stats()
+            if worker is not None:
+                report["output"] = worker.stats()
+            stats.put(report)
+            next_report = now + STATS_INTERVAL
+        next_tick += period
+        delay = next_tick - now
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_tick = time.perf_counter()    # fell behind; don't try to catch up
+
+
+class EngineProcess:
+    """
+    The UI's handle on a RenderEngine running in its own process.
+    wall:            layout.WallLayout
+    gamma_settings:  (gammas, scales) for gamma.init_gamma() in the engine
+    output_settings: OutputWorker options (dither, power, interpolate)
+    output_options:  open_output() options for the engine's own LED device
+    output_ring:     name of an OutputProcess's ring to write into instead
+    """
+
+    def __init__(self, wall, frame_rate=45, brightness=1.0, rgbw=config.RGBW_STRATEGY,
+                 gamma_settings=None, output_settings=None, output_options=None,
+                 output_ring=None):
+        self.preview_ring = FrameRing.create((wall.height, wall.width, 4))
+        self._preview = np.zeros((wall.height, wall.width, 4), dtype=np.uint8)
+        # spawn, not fork: the UI process has pygame/SDL state a fork would inherit
+        ctx = multiprocessing.get_context("spawn")
+        self.commands = ctx.Queue()
+        self._signals = ctx.Array("d", len(MOD_SOURCES), lock=False)
+        self._stats = ctx.Queue()
+        self._sent = {}
+        self._last_stats = {}
+        self._finished = False    # got the engine's final report
+        self._process = ctx.Process(
+            target=_engine_main, name="render-engine", daemon=True,
+            args=(wall, frame_rate, brightness, rgbw, gamma_settings, output_settings or {},
+                  output_options or {}, output_ring, self.preview_ring.name,
+                  self.commands, self._signals, self._stats))
+
+    def start(self):
+        self._process.start()
+        return self
+
+    def send(self, command, *args) -> None:
+        self.commands.put((command,) + args)
+
+    def load_pattern(self, name, params, modulation) -> None:
+        """Start a fresh instance of pattern `name` (also on a patch load)"""
+        self.send("pattern", name, dict(params), modulation)
+        self._sent["params"] = copy.deepcopy(params)
+        self._sent["modulation"] = copy.deepcopy(modulation)
+
+    def sync(self, **settings) -> None:
+        """Send each setting (params=, modulation=, lfo=, env=, bpm=, rgbw=) that changed"""
+        for key, value in settings.items():
+            if key not in self._sent or self._sent[key] != value:
+                self._sent[key] = copy.deepcopy(value)
+                self.send(key, self._sent[key])
+
+    @property
+    def alive(self) -> bool:
+        return self._process.is_alive()
+
+    def preview(self) -> np.ndarray:
+        """
+        Newest rendered (H, W, 4) frame; the same array is refilled by the
+        next call.  Black once the engine has stopped.
+        """
+        if not self.alive:
+            self._preview[:] = 0
+            return self._preview
+        frame, _ = self.preview_ring.read(timeout=0)
+        if frame is not None:
+            self._preview = frame
+        return self._preview
+
+    def signals(self) -> dict:
+        """Modulation values of the engine's last tick"""
+        return dict(zip(MOD_SOURCES, self._signals))
+
+    def _drain(self, timeout=None):
+        """Take the engine's reports; with a timeout, wait for the final one"""
+        try:
+            while not self._finished:
+                stats = self._stats.get_nowait() if timeout is None else \
+                    self._stats.get(timeout=timeout)
+                if stats is None:
+                    self._finished = True
+                else:
+                    self._last_stats = stats
+        except queue.Empty:
+            pass
+
+    def stats(self) -> dict:
+        """
+        The engine's latest stats (every STATS_INTERVAL, "output" included
+        when it owns the LED device), with "error" set after a pattern or
+        command failed or once the process has died
+        """
+        self._drain()
+        stats = dict(self._last_stats)
+        if not self._finished and self._process.exitcode is not None:
+            stats["error"] = f"render engine exited (code {self._process.exitcode})"
+        return stats
+
+    def stop(self):
+        """Stop the engine (blanking its own LED device, if any) and free the preview"""
+        if self._process.is_alive():
+            self.send("quit")
+            self._drain(timeout=5.0)
+            self._process.join()
+        self._preview = None
+        self.preview_ring.close()
+        self.preview_ring.unlink()
@@ -0,0 +1,103 @@
+# rgbw.py
+"""
+RGB → RGBW split strategies, on whole arrays.
+
+Each split takes r, g, b arrays of 0–255 values (any numeric dtype) and
+returns float r, g, b, w arrays, truncated the same way the old per-pixel
+int() code was:
+
+    min    move the common white into W, subtract it from RGB
+    extra  keep RGB, add half the common white on W (brighter)
+    luma   Rec.709 luma white, capped at the smallest channel
+    hsv    split value into a saturated hue part and a white part
+
+rgb_to_rgbw() applies one to an (N,3|4) frame.  color_pipeline compiles
+the chosen split into its LUT, so at run time the strategy costs nothing
+extra; switching it rebuilds the table.
+"""
+
+import numpy as np
+
+__all__ = ["STRATEGIES", "get_strategy", "rgb_to_rgbw",
+           "split_min", "split_extra", "split_luma", "split_hsv"]
+
+
+def _common_white(r, g, b):
+    return np.minimum(np.minimum(r, g), b)
+
+
+def split_min(r, g, b):
+    w = _common_white(r, g, b)
+    return r - w, g - w, b - w, w
+
+
+def split_extra(r, g, b):
+    # don't subtract, just boost with white
+    return r, g, b, np.floor(_common_white(r, g, b) / 2)
+
+
+def split_luma(r, g, b):
+    w0 = 0.2126 * r + 0.7152 * g + 0.0722 * b
+    w = np.floor(np.minimum(w0, _common_white(r, g, b)))
+    return r - w, g - w, b - w, w
+
+
+def split_hsv(r, g, b):
+    """
+    HSV split: white part (1-s)·v, color part s·v at the pixel's hue and
+    full saturation.  The same float64 operations, in the same order, as
+    colorsys.rgb_to_hsv / hsv_to_rgb, so it matches the per-pixel version
+    exactly.
+    """
+    rn, gn, bn = (np.asarray(c, dtype=np.float64) / 255.0 for c in (r, g, b))
+    maxc = np.maximum(np.maximum(rn, gn), bn)
+    minc = np.minimum(np.minimum(rn, gn), bn)
+    rangec = maxc - minc
+    gray = rangec == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.where(gray, 0.0, rangec / maxc)
+        rc, gc, bc = ((maxc - c) / rangec for c in (rn, gn, bn))
+    h = np.where(rn == maxc, bc - gc, np.where(gn == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(gray, 0.0, np.mod(h / 6.0, 1.0))
+
+    # hsv_to_rgb(h, 1.0, 1.0): sector i, rising t and falling q edges
+    h6 = h * 6.0
+    i = h6.astype(np.intp)
+    f = h6 - i
+    q = 1.0 - f
+    t = 1.0 - (1.0 - f)
+    one, zero = np.ones_like(f), np.zeros_like(f)
+    i %= 6
+    pure = (np.choose(i, (one, q, zero, zero, t, one)),
+            np.choose(i, (t, one, one, q, zero, zero)),
+            np.choose(i, (zero, zero, t, one, one, q)))
+
+    c_frac = s * maxc
+    w_frac = (1.0 - s) * maxc
+    return tuple(np.floor(p * c_frac * 255) for p in pure) + (np.floor(w_frac * 255),)
+
+
+STRATEGIES = {
+    "min":   split_min,
+    "extra": split_extra,
+    "luma":  split_luma,
+    "hsv":   split_hsv,
+}
+
+
+def get_strategy(name):
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"unknown RGBW strategy {name!r}; choose from {sorted(STRATEGIES)}") from None
+
+
+def rgb_to_rgbw(frame, strategy="extra", out=None):
+    """(N,3) or (N,4) RGB[W] frame (W ignored) → (N,4) uint8 RGBW"""
+    rgb = np.asarray(frame)[..., :3]
+    if out is None:
+        out = np.empty(rgb.shape[:-1] + (4,), dtype=np.uint8)
+    channels = get_strategy(strategy)(*(rgb[..., i].astype(np.float32) for i in range(3)))
+    for i, c in enumerate(channels):
+        np.copyto(out[..., i], np.clip(c, 0, 255), casting="unsafe")
+    return out
@@ -1,9 +1,11 @@
 import pygame, sys, os
 import colorsys
+import numpy as np
 from PIL import Image
-import spidev
-from ws2814 import WS2814
-from gamma import init_gamma, apply_gamma
+from outputs import open_output
+from gamma import init_gamma
+from color_pipeline import ColorPipeline
+from layout import get_layout
 import tkinter as tk
 from tkinter import filedialog
 
@@ -16,11 +18,17 @@ PANEL_HEIGHT = 8
 X_PANELS = 3
 Y_PANELS = 3
 
+# wall geometry: config.LAYOUT_FILE if present, else this panel grid
+wall = get_layout(PANEL_WIDTH, PANEL_HEIGHT, X_PANELS, Y_PANELS)
+
 # the canvas in pixels is:
-GRID_W = X_PANELS * PANEL_WIDTH   # e.g. 3×8 = 24
-GRID_H = Y_PANELS * PANEL_HEIGHT  # e.g. 3×8 = 24
+GRID_W = wall.width    # e.g. 3×8 = 24
+GRID_H = wall.height   # e.g. 3×8 = 24
+
+NUM_LEDS = wall.num_leds  # total LEDs wired up
 
-NUM_LEDS = PANEL_WIDTH*X_PANELS*PANEL_HEIGHT*Y_PANELS  # total LEDs wired up
+# RGB→RGBW split for the LED preview (see rgbw.STRATEGIES)
+RGBW_STRATEGY = "hsv"
 
 tk_root = tk.Tk()
 tk_root.withdraw()
@@ -40,66 +48,30 @@ init_gamma(
     }
 )
 
-def serpentine_index(x, y):
-    """
-    x,y are 0..(PANEL_WIDTH*X_PANELS -1), 0..(PANEL_HEIGHT*Y_PANELS -1)
-    Panels wired column-major top→down, then next column.
-    Inside each panel: each row is serpentine L→R then R→L.
-    """
-    # which panel
-    px = x // PANEL_WIDTH
-    py = y // PANEL_HEIGHT
-
-    # local coords inside panel
-    lx = x % PANEL_WIDTH
-    ly = y % PANEL_HEIGHT
-
-    # panel number in column-major, NO zig-zag at panel level
-    panel_num = px * Y_PANELS + py
-
-    # within-panel serpentine on rows
-    if (ly % 2) == 0:
-        cell_num = ly * PANEL_WIDTH + lx
-    else:
-        cell_num = ly * PANEL_WIDTH + (PANEL_WIDTH - 1 - lx)
-
-    leds_per_panel = PANEL_WIDTH * PANEL_HEIGHT
-    return panel_num * leds_per_panel + cell_num
+# RGBW split + gamma as one LUT; compiled once and cached on disk
+led_color = ColorPipeline(warm_white=None, rgbw=RGBW_STRATEGY)
 
 try:
-    from ws2814 import WS2814
-    # we assume a 24×24 matrix wired in row‐major order
-    led = WS2814('/dev/spidev0.0', NUM_LEDS, 800)
+    # edits touch a few pixels, so only resend up to the last changed LED
+    led = open_output(
+        NUM_LEDS, width=GRID_W, height=GRID_H,
+        pixel_map=wall.physical,
+        partial_updates=True, full_refresh_interval=30)
     use_led = True
     print("→ Sprite editor: LED matrix enabled (24×24).")
 except Exception as e:
     use_led = False
     print("→ Sprite editor: LED matrix disabled:", e)
 
-def rgb_to_rgbw(r, g, b):
-    """Split out white channel as min(R,G,B)."""
-    w = min(r, g, b)
-    return (r - w, g - w, b - w, w)
-
-def rgb_to_rgbw_hsv(r, g, b):
-    # normalize
-    rn, gn, bn = r/255.0, g/255.0, b/255.0
-    h, s, v    = colorsys.rgb_to_hsv(rn, gn, bn)
-
-    # split into white vs. color_size
-    w_frac = (1.0 - s) * v
-    c_frac = s * v
-
-    # rebuild a pure‐hue color at full saturation
-    pr, pg, pb = colorsys.hsv_to_rgb(h, 1.0, 1.0)
-
-    # scale back down
-    r4 = int(pr * c_frac * 255)
-    g4 = int(pg * c_frac * 255)
-    b4 = int(pb * c_frac * 255)
-    w4 = int(w_frac * 255)
-
-    return (r4, g4, b4, w4)
+def show_on_leds(surf):
+    """Send a whole sprite frame to the wall; transparent pixels are off"""
+    # the canvas cells live in the top-left GRID_W×GRID_H pixels of the surface
+    rgb = pygame.surfarray.array3d(surf)[:GRID_W, :GRID_H].transpose(1, 0, 2).reshape(-1, 3)
+    alpha = pygame.surfarray.array_alpha(surf)[:GRID_W, :GRID_H].T.reshape(-1)
+    rgbw = led_color.apply(rgb)
+    rgbw[alpha == 0] = 0
+    led.set_frame(wall.to_physical(rgbw))
+    led.update_strip()
 
 def ask_sprite_filename():
     # 1) release Pygame’s grab so Tkinter can grab focus
@@ -392,20 +364,7 @@ def main():
                     #TODO: update LEDs live here
                     if use_led:
                         surf = frames[cur_frame]
-                        for y in range(grid_h):
-                            for x in range(grid_w):
-                                idx = serpentine_index(x, y)
-                                if(idx < NUM_LEDS):
-                                    r, g, b, a = surf.get_at((x,y))
-                                    if a == 0:
-                                    # you could set LED black or leave previous
-                                        led.set_led_color(idx, 0, 0, 0, 0)
-                                    else:
-                                        # simple RGB→RGBW: all white = min(r,g,b)
-                                        r, g, b, w = rgb_to_rgbw_hsv(r, g, b)
-                                        r_corr, g_corr, b_corr, w_corr = apply_gamma(r, g, b, w)
-                                        led.set_led_color(idx, r_corr, g_corr, b_corr, w_corr)
-                        led.update_strip()
+                        show_on_leds(surf)
 
                 # 2) Tool buttons (Pencil, Eraser, Clear)
                 if tool_buttons[0].hit(ev.pos):
@@ -502,15 +461,13 @@ def main():
                         paint_cell(frames, cur_frame, x, y, cur_tool, cur_color)
                         if use_led:
                             r, g, b, a = surf.get_at((x,y))
-                            idx = serpentine_index(x, y)
-                            if(idx < NUM_LEDS):
+                            idx = wall.index(x, y)
+                            if 0 <= idx < NUM_LEDS:
                                 if a == 0:
                                     # you could set LED black or leave previous
                                     led.set_led_color(idx, 0, 0, 0, 0)
                                 else:
-                                    # simple RGB→RGBW: all white = min(r,g,b)
-                                    r, g, b, w = rgb_to_rgbw_hsv(r, g, b)
-                                    r_corr, g_corr, b_corr, w_corr = apply_gamma(r, g, b, w)
+                                    r_corr, g_corr, b_corr, w_corr = led_color.apply([(r, g, b)])[0]
                                     # optionally compensate for warm white here…
                                     led.set_led_color(idx, r_corr, g_corr, b_corr, w_corr)
                             led.update_strip()
@@ -572,19 +529,7 @@ def main():
 
         if use_led and frame_update:
             surf = frames[cur_frame]
-            for y in range(grid_h):
-                for x in range(grid_w):
-                    r, g, b, a = surf.get_at((x, y))
-                    idx = serpentine_index(x, y)
-                    if(idx < NUM_LEDS):
-                        if a == 0:
-                            led.set_led_color(idx, 0,0,0,0)
-                        else:
-                            r, g, b, w = rgb_to_rgbw_hsv(r, g, b)
-                            r_corr, g_corr, b_corr, w_corr = apply_gamma(r, g, b, w)
-                            # optionally compensate for warm white here…
-                            led.set_led_color(idx, r_corr, g_corr, b_corr, w_corr)
-            led.update_strip()
+            show_on_leds(surf)
             frame_update = False
 
         pygame.display.flip()
@@ -592,11 +537,7 @@ def main():
 
 
     pygame.quit()
-    for y in range(grid_h):
-        for x in range(grid_w):
-            idx = serpentine_index(x, y)
-            if(idx < NUM_LEDS):
-                led.set_led_color(idx, 0,0,0,0)
+    led.clear_strip()
     led.update_strip()
     sys.exit()
 
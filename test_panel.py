@@ -1,16 +1,17 @@
-from ws2814 import WS2814
+from outputs import open_output
 from gamma import init_gamma, apply_gamma
+from layout import get_layout
 import time
 PANEL_WIDTH  = 8    # pixels per panel in X
 PANEL_HEIGHT = 8    # pixels per panel in Y
 PANELS_X     = 3    # how many panels across
 PANELS_Y     = 3    # how many panels down
 
-WALL_W = PANEL_WIDTH  * PANELS_X   # e.g. 8*3 = 24
-WALL_H = PANEL_HEIGHT * PANELS_Y   # e.g. 8*3 = 24
+wall = get_layout(PANEL_WIDTH, PANEL_HEIGHT, PANELS_X, PANELS_Y)
+WALL_W = wall.width    # e.g. 8*3 = 24
+WALL_H = wall.height   # e.g. 8*3 = 24
 
-NUM_LEDS = PANEL_WIDTH*PANELS_X*PANEL_HEIGHT*PANELS_Y
-panel = WS2814('/dev/spidev0.0', NUM_LEDS, 800)
+NUM_LEDS = wall.num_leds
 
 init_gamma(
     gammas = {
@@ -27,31 +28,8 @@ init_gamma(
     }
 )
 
-def serpentine_index(x, y):
-    """
-    x,y are 0..(PANEL_WIDTH*PANELS_X -1), 0..(PANEL_HEIGHT*PANELS_Y -1)
-    Panels wired column-major top→down, then next column.
-    Inside each panel: each row is serpentine L→R then R→L.
-    """
-    # which panel
-    px = x // PANEL_WIDTH
-    py = y // PANEL_HEIGHT
-
-    # local coords inside panel
-    lx = x % PANEL_WIDTH
-    ly = y % PANEL_HEIGHT
-
-    # panel number in column-major, NO zig-zag at panel level
-    panel_num = px * PANELS_Y + py
-
-    # within-panel serpentine on rows
-    if (ly % 2) == 0:
-        cell_num = ly * PANEL_WIDTH + lx
-    else:
-        cell_num = ly * PANEL_WIDTH + (PANEL_WIDTH - 1 - lx)
-
-    leds_per_panel = PANEL_WIDTH * PANEL_HEIGHT
-    return panel_num * leds_per_panel + cell_num
+panel = open_output(NUM_LEDS, width=WALL_W, height=WALL_H,
+                    pixel_map=wall.physical)
 
 def main():
     panel.clear_strip()
@@ -60,7 +38,8 @@ def main():
     for i in range(WALL_W):
         r_corr, g_corr, b_corr, w_corr = apply_gamma(i * int(255/WALL_W),0,255 - i * int(255/WALL_W),0)
         for j in range(WALL_H): 
-            panel.set_led_color(serpentine_index(i, j), r_corr, g_corr, b_corr, w_corr)
+            if wall.index(i, j) >= 0:
+                panel.set_led_color(wall.index(i, j), r_corr, g_corr, b_corr, w_corr)
         print((r_corr, g_corr, b_corr, w_corr))
     panel.update_strip()
 
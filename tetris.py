@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import pygame, sys, time, random
-from ws2814 import WS2814
+import numpy as np
+from outputs import open_output
+from layout import get_layout
 
 # ─── LED MATRIX CONFIG ─────────────────────────────────────────────────────
 PANEL_WIDTH  = 8    # pixels per panel
@@ -8,31 +10,20 @@ PANEL_HEIGHT = 8
 PANELS_X     = 3    # panels across
 PANELS_Y     = 3    # panels down
 
-WIDTH  = PANEL_WIDTH  * PANELS_X   # 16
-HEIGHT = PANEL_HEIGHT * PANELS_Y   # 32
-NUM_LEDS = WIDTH * HEIGHT
+# config.LAYOUT_FILE if present, else column-major panels with zig-zag rows
+wall = get_layout(PANEL_WIDTH, PANEL_HEIGHT, PANELS_X, PANELS_Y)
+WIDTH  = wall.width    # 24
+HEIGHT = wall.height   # 24
+NUM_LEDS = wall.num_leds
 
-# initialize your strip
-led = WS2814('/dev/spidev0.0', NUM_LEDS, 800)
-
-def serpentine_index(x, y):
-    """ column-major panels, each panel rows zig-zag """
-    px = x // PANEL_WIDTH; py = y // PANEL_HEIGHT
-    lx = x % PANEL_WIDTH;  ly = y % PANEL_HEIGHT
-    panel = px * PANELS_Y + py
-    if (ly & 1)==0:
-        cell = ly * PANEL_WIDTH + lx
-    else:
-        cell = ly * PANEL_WIDTH + (PANEL_WIDTH -1 - lx)
-    return panel * (PANEL_WIDTH*PANEL_HEIGHT) + cell
+# initialize your strip (LED_OUTPUT picks SPI, simulator, null or record)
+led = open_output(NUM_LEDS, width=WIDTH, height=HEIGHT, pixel_map=wall.physical)
+led_frame = np.zeros((HEIGHT, WIDTH, 4), dtype=np.uint8)
 
 def push_to_led(board):
-    """ board[y][x] is (r,g,b) or None """
-    for y in range(HEIGHT):
-        for x in range(WIDTH):
-            idx = serpentine_index(x,y)
-            color = board[y][x] or (0,0,0)
-            led.set_led_color(idx, *color, 0)
+    """ board is a (HEIGHT, WIDTH, 3) RGB array """
+    led_frame[..., :3] = board
+    led.set_frame(wall.to_physical(led_frame))
     led.update_strip()
 
 # ─── TETROMINO DEFINITIONS ──────────────────────────────────────────────────
@@ -176,12 +167,7 @@ def main():
         buf = pygame.surfarray.array3d(screen)
         # buf.shape == (WIDTH*20, HEIGHT*20, 3)
         # sample the center of each 20×20 cell
-        led_board = [[ None for _ in range(WIDTH)] for __ in range(HEIGHT)]
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                r,g,b = buf[x*20+10, y*20+10]
-                led_board[y][x] = (int(r),int(g),int(b))
-        push_to_led(led_board)
+        push_to_led(buf[10::20, 10::20].swapaxes(0, 1))
 
         clock.tick(10)
 
@@ -1,6 +1,6 @@
 #Theater Chase Effect (Classic moving LED chase effect)
 import time
-from ws2814 import WS2814
+from outputs import open_output
 num_leds = 99
 def chase(neo, color, delay=0.1):
     while True:
@@ -18,6 +18,6 @@ def chase(neo, color, delay=0.1):
             leds.update_strip()
 
 # Initialize Pi5Neo with 10 LEDs
-leds = WS2814('/dev/spidev0.0', 100, 800)
+leds = open_output(100)
 
 chase(leds, (0, 0, 0, 255))
\ No newline at end of file
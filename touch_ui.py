@@ -4,26 +4,33 @@ import time
 import importlib
 import os
 import json
-import colorsys
-from ws2814 import WS2814
+import numpy as np
+from output_worker import OutputProcess
 from os.path import join, isfile
 from PIL import Image
-from lfo import evaluate_lfos, LFO_CONFIG, BPM
-from audio_env import evaluate_env, ENV_CONFIG
-from gamma import init_gamma, apply_gamma
+import lfo
+from lfo import LFO_CONFIG
+from audio_env import ENV_CONFIG
+from gamma import init_gamma
+from power import PowerLimiter
+from render_engine import EngineProcess, load_patterns
+from rgbw import STRATEGIES as RGBW_STRATEGIES
+import config
+from layout import get_layout
 
 PANEL_WIDTH  = 8    # pixels per panel in X
 PANEL_HEIGHT = 8    # pixels per panel in Y
 PANELS_X     = 5    # how many panels across
 PANELS_Y     = 2    # how many panels down
 
-WALL_W = PANEL_WIDTH  * PANELS_X   # e.g. 8*3 = 24
-WALL_H = PANEL_HEIGHT * PANELS_Y   # e.g. 8*3 = 24
+# wall geometry: config.LAYOUT_FILE if present, else this panel grid
+wall = get_layout(PANEL_WIDTH, PANEL_HEIGHT, PANELS_X, PANELS_Y)
+WALL_W = wall.width
+WALL_H = wall.height
 
-NUM_LEDS = PANEL_WIDTH*PANELS_X*PANEL_HEIGHT*PANELS_Y
+NUM_LEDS = wall.num_leds
 FRAME_RATE = 45
 
-led_matrix = WS2814('/dev/spidev0.0', NUM_LEDS, 800) 
 brightness = 0.3
 
 
@@ -39,35 +46,20 @@ SLIDER_COLOR = (100, 200, 255)
 BG_COLOR = (30, 30, 30)
 instant_update = True
 
-init_gamma(
-    gammas = {
-        "r": 0.65,
-        "g": 0.65,
-        "b": 0.65,
-        "w": 0.65
-    },
-    scales = {
-        "r": 1.25,   # red is usually “normal”
-        "g": 1.25,   # green looks a bit too bright
-        "b": 1.25,   # blue tends to be dimmer
-        "w": 1.25    # white LED is often very bright, so scale it way down
-    }
-)
-
-# --- Load Patterns ---
-def load_patterns():
-    patterns = {}
-    pattern_dir = "patterns"
-    for fname in os.listdir(pattern_dir):
-        if fname.endswith(".py") and not fname.startswith("_"):
-            modname = fname[:-3]
-            try:
-                module = importlib.import_module(f"patterns.{modname}")
-                if hasattr(module, "Pattern") and hasattr(module, "PARAMS"):
-                    patterns[modname] = module
-            except Exception as e:
-                print(f"Error loading pattern {modname}: {e}")
-    return patterns
+# also handed to the render engine process, which builds the color tables
+GAMMAS = {
+    "r": 0.65,
+    "g": 0.65,
+    "b": 0.65,
+    "w": 0.65
+}
+SCALES = {
+    "r": 1.25,   # red is usually “normal”
+    "g": 1.25,   # green looks a bit too bright
+    "b": 1.25,   # blue tends to be dimmer
+    "w": 1.25    # white LED is often very bright, so scale it way down
+}
+init_gamma(gammas=GAMMAS, scales=SCALES)
 
 # --- Load Sprites ---
 def load_sprites(folder="sprites"):
@@ -113,31 +105,13 @@ def load_patch(index):
     with open(f"patches/patch_{index:02d}.json", "r") as f:
         return json.load(f)
 
-def serpentine_index(x, y):
-    """
-    x,y are 0..(PANEL_WIDTH*PANELS_X -1), 0..(PANEL_HEIGHT*PANELS_Y -1)
-    Panels wired column-major top→down, then next column.
-    Inside each panel: each row is serpentine L→R then R→L.
-    """
-    # which panel
-    px = x // PANEL_WIDTH
-    py = y // PANEL_HEIGHT
-
-    # local coords inside panel
-    lx = x % PANEL_WIDTH
-    ly = y % PANEL_HEIGHT
-
-    # panel number in column-major, NO zig-zag at panel level
-    panel_num = px * PANELS_Y + py
-
-    # within-panel serpentine on rows
-    if (ly % 2) == 0:
-        cell_num = ly * PANEL_WIDTH + lx
-    else:
-        cell_num = ly * PANEL_WIDTH + (PANEL_WIDTH - 1 - lx)
-
-    leds_per_panel = PANEL_WIDTH * PANEL_HEIGHT
-    return panel_num * leds_per_panel + cell_num
+# LED output (SPI by default; LED_OUTPUT=null/simulator/record for dev boxes).
+# Only resend up to the last changed LED; full refresh once a second.
+# Opened by the render engine, or by the output process (config.OUTPUT_PROCESS)
+OUTPUT_OPTIONS = dict(
+    width=WALL_W, height=WALL_H,
+    pixel_map=wall.physical,
+    partial_updates=True, full_refresh_interval=FRAME_RATE)
 
 def restore_patch(index,
                   pattern_names,
@@ -156,7 +130,7 @@ def restore_patch(index,
       4. Restore LFO_CONFIG into lfo_panels
       5. Restore ENV_CONFIG into env_panels
       6. Restore colormap & sprite dropdowns
-    Returns: (new_index, pattern, sliders, dropdowns, mod_checkboxes)
+    Returns: (new_index, params, sliders, dropdowns, mod_checkboxes)
     """
     patch = load_patch(index)
 
@@ -165,7 +139,6 @@ def restore_patch(index,
     module       = patterns[pattern_names[new_index]]
     param_specs  = module.PARAMS
     params       = patch["params"].copy()
-    pattern      = module.Pattern(WALL_W, WALL_H, params=params)
 
     # 2) UI elements
     sliders, dropdowns, mod_checkboxes = create_sliders(param_specs, params)
@@ -184,7 +157,6 @@ def restore_patch(index,
                 cb.active = (cb.source_id == m["mod_source"])
 
     # 4) LFOs
-    import lfo
     lfo.LFO_CONFIG.update(patch["lfo_config"])
     for (lname, panel) in zip(("lfo1","lfo2"), lfo_panels):
         cfg = lfo.LFO_CONFIG[lname]
@@ -218,10 +190,7 @@ def restore_patch(index,
     if "SPRITE" in params:
         sprite_dropdown.selected   = params["SPRITE"]
 
-    # commit into the live pattern
-    pattern.update_params(params)
-
-    return new_index, pattern, sliders, dropdowns, mod_checkboxes
+    return new_index, params, sliders, dropdowns, mod_checkboxes
 
 def delete_patch(index):
     """
@@ -314,52 +283,6 @@ def draw_mod_indicator(screen, font, signals, label, key, color, idx):
     #screen.blit(font.render(label, True, (255,255,255)),
     #            (bar_x + bar_w + 10, bar_y))
 
-def rgb_to_rgbw_min(r, g, b):
-    w = min(r, g, b)
-    return r - w, g - w, b - w, w
-
-def rgb_to_rgbw_extra(r, g, b):
-    w = min(r, g, b)
-    # don't subtract, just boost with white 
-    return r , g , b , int(w/2)
-
-def rgb_to_rgbw_luma(r, g, b):
-    # Rec.709 luma formula
-    w0 = 0.2126*r + 0.7152*g + 0.0722*b  
-    w  = int(min(w0, r, g, b))
-    return r - w, g - w, b - w, w
-
-def rgb_to_rgbw_hsv(r, g, b):
-    # normalize
-    rn, gn, bn = r/255.0, g/255.0, b/255.0
-    h, s, v    = colorsys.rgb_to_hsv(rn, gn, bn)
-
-    # split into white vs. color
-    w_frac = (1.0 - s) * v
-    c_frac = s * v
-
-    # rebuild a pure‐hue color at full saturation
-    pr, pg, pb = colorsys.hsv_to_rgb(h, 1.0, 1.0)
-
-    # scale back down
-    r4 = int(pr * c_frac * 255)
-    g4 = int(pg * c_frac * 255)
-    b4 = int(pb * c_frac * 255)
-    w4 = int(w_frac * 255)
-
-    return (r4, g4, b4, w4)
-
-def compensate_warm_white(r, g, b):
-    """
-    Simple tint‑correction for warm‑white LEDs:
-      • slightly reduce red and green,
-      • boost blue to pull back toward neutral.
-    """
-    rc = int(r * 0.92)
-    gc = int(g * 0.96)
-    bc = int(b * 1.10)
-    return min(rc, 255), min(gc, 255), min(bc, 255)
-
 class Slider:
     def __init__(self, name, default, min_val, max_val, step, x, y, height, valid_values=None):
         self.name = name
@@ -824,6 +747,8 @@ class EnvelopeControlPanel:
 def draw_simulator(screen, frame, grid_w, grid_h, rect):
     # Determine square pixel size that fits
     pixel_size = min(rect.width // grid_w, rect.height // grid_h)
+    if pixel_size == 0:
+        return
 
     # Calculate drawing area size
     draw_width = pixel_size * grid_w
@@ -833,20 +758,11 @@ def draw_simulator(screen, frame, grid_w, grid_h, rect):
     offset_x = rect.x + (rect.width - draw_width) // 2
     offset_y = rect.y + (rect.height - draw_height) // 2
 
-    for y in range(grid_h):
-        for x in range(grid_w):
-            idx = y * grid_w + x
-            r, g, b, *_ = frame[idx]
-            pygame.draw.rect(
-                screen,
-                (r, g, b),
-                pygame.Rect(
-                    offset_x + x * pixel_size,
-                    offset_y + y * pixel_size,
-                    pixel_size,
-                    pixel_size
-                )
-            )
+    # one pixel per LED, scaled up in a single blit
+    rgb = np.asarray(frame, dtype=np.uint8).reshape(grid_h, grid_w, -1)[..., :3]
+    small = pygame.surfarray.make_surface(rgb.swapaxes(0, 1))
+    screen.blit(pygame.transform.scale(small, (draw_width, draw_height)),
+                (offset_x, offset_y))
 
 
 def create_sliders(param_specs, current_values):
@@ -919,7 +835,6 @@ def create_sliders(param_specs, current_values):
 
 def launch_ui():
     pygame.init()
-    from lfo import BPM
     # — Basic setup —
     show_simulator = False
     screen = pygame.display.set_mode((SCREEN_WIDTH, UI_HEIGHT), pygame.RESIZABLE)
@@ -955,20 +870,22 @@ def launch_ui():
         20, 10,
         width=180, show_label=False,
         dropup=False,
-        max_visible=20
+        max_visible=20,
+        # flag patterns not yet ported to render_into()
+        label_map={name: f"{name} (slow)" for name in pattern_names
+                   if patterns[name].Pattern.slow_path}
     )
 
     sprites, sprite_names = load_sprites("sprites")
     from colormaps import COLORMAPS
     colormap_names = list(COLORMAPS.keys())
 
-    # — Initial pattern instance —
+    # — Initial pattern (instantiated by the render engine) —
     module = patterns[pattern_names[current_index]]
     param_specs = module.PARAMS
     params = {k: v["default"] for k, v in param_specs.items()}
     if "SPRITE" in param_specs:
         param_specs["SPRITE"]["options"] = sprite_names
-    pattern = module.Pattern(WALL_W, WALL_H, params=params)
     sliders, dropdowns, mod_checkboxes = create_sliders(param_specs, params)
 
     # — Fixed dropdowns (won’t be recreated on pattern change) —
@@ -990,6 +907,15 @@ def launch_ui():
         width=180, show_label=False,
         max_visible=20
     )
+    # RGB→RGBW split used by the color LUT; switching rebuilds the LUT
+    rgbw_dropdown = Dropdown(
+        "RGBW",
+        list(RGBW_STRATEGIES),
+        config.RGBW_STRATEGY,
+        620, 10,
+        width=120, show_label=False,
+        label_map={name: f"W: {name}" for name in RGBW_STRATEGIES}
+    )
     # — UI button rectangles —
     BTN = 90
     SPACING = 10
@@ -1054,7 +980,37 @@ def launch_ui():
 
     clock = pygame.time.Clock()
     running = True
-    frame = None
+
+    # Rendering, sprite, color correction and LED output run in the render
+    # engine process (render_engine.py) on their own clock, so UI work never
+    # delays the LEDs.  This loop only sends it commands and shows its
+    # preview frames.
+    # LED output runs on a thread in the engine, or in its own process the
+    # engine writes to through shared memory (config.OUTPUT_PROCESS).  It
+    # refreshes the LEDs at FRAME_RATE even when a heavy pattern renders
+    # slower (config.OUTPUT_INTERPOLATION), the power limiter scales down
+    # frames that would overload the PSU, and with OUTPUT_BITS = 16 uint16
+    # (8.8) frames are dithered to 8 bits
+    output_settings = dict(dither=config.OUTPUT_BITS == 16, power=PowerLimiter(NUM_LEDS),
+                           interpolate=config.OUTPUT_INTERPOLATION)
+    output = None
+    if config.OUTPUT_PROCESS:
+        output = OutputProcess(NUM_LEDS, FRAME_RATE, **output_settings, **OUTPUT_OPTIONS).start()
+    engine = EngineProcess(wall, FRAME_RATE, brightness, rgbw_dropdown.selected,
+                           gamma_settings=(GAMMAS, SCALES),
+                           output_settings=output_settings, output_options=OUTPUT_OPTIONS,
+                           output_ring=output.ring.name if output else None).start()
+
+    def load_engine_pattern(name):
+        # a fresh pattern instance in the engine; patterns read COLORMAP and
+        # SPRITE from params as soon as they are constructed
+        params["COLORMAP"] = colormap_dropdown.selected
+        params["SPRITE"]   = sprite_dropdown.selected
+        engine.load_pattern(name, params, extract_mod_config(param_specs))
+
+    load_engine_pattern(pattern_names[current_index])
+    frame = engine.preview()
+    engine_error = None
 
     # load patches
     for i in range(TOTAL_SLOTS):
@@ -1067,9 +1023,10 @@ def launch_ui():
             ps  = mod.PARAMS
             params = p["params"]
             temp = mod.Pattern(WALL_W, WALL_H, params=params)
-            frame = temp.render(lfo_signals={})
+            thumb_frame = np.zeros((WALL_H, WALL_W, 4), dtype=np.uint8)
+            temp.render_into(thumb_frame, lfo_signals={})
             patch_icons[i] = make_thumbnail(
-                temp, frame,
+                temp, thumb_frame,
                 sprites, params,
                 (SLOT_SIZE, SLOT_SIZE)
             )
@@ -1081,7 +1038,7 @@ def launch_ui():
         if random_cycle:
             now = time.time()
             # how many beats since last cycle?
-            beats_elapsed = (now - last_cycle_time) * (BPM / 60.0)
+            beats_elapsed = (now - last_cycle_time) * (lfo.BPM / 60.0)
             if beats_elapsed >= cycle_beats:
                 last_cycle_time = now
 
@@ -1092,7 +1049,7 @@ def launch_ui():
 
                     # call your shared restore function:
                     (current_index,
-                    pattern,
+                    params,
                     sliders,
                     dropdowns,
                     mod_checkboxes) = restore_patch(
@@ -1106,6 +1063,8 @@ def launch_ui():
                         sprite_dropdown,
                         create_sliders
                     )
+                    param_specs = patterns[pattern_names[current_index]].PARAMS
+                    load_engine_pattern(pattern_names[current_index])
 
         # — Event loop —
         for event in pygame.event.get():
@@ -1116,7 +1075,7 @@ def launch_ui():
             for s in sliders: s.handle_event(event)
             for c in mod_checkboxes:
                 if c.handle_event(event):
-                    meta = pattern.param_meta.get(c.param_name)
+                    meta = param_specs.get(c.param_name)
                     if not meta or not meta.get("modulatable"):
                         continue
 
@@ -1154,6 +1113,8 @@ def launch_ui():
                     continue
                 if sprite_dropdown.handle_event(event):
                     continue
+                if rgbw_dropdown.handle_event(event):
+                    continue
                 if toggle_rect.collidepoint(event.pos):
                     display_patch_mode = not display_patch_mode
                     continue 
@@ -1165,7 +1126,7 @@ def launch_ui():
                         intervals = [b - a for a, b in zip(tap_times, tap_times[1:])]
                         avg = sum(intervals) / len(intervals)
                         if avg > 0:
-                            from lfo import BPM as _; import lfo; lfo.BPM = 60.0 / avg
+                            lfo.BPM = 60.0 / avg
                     continue
 
                 # Simulator toggle
@@ -1211,19 +1172,19 @@ def launch_ui():
                                 i,
                                 pattern_names[current_index],
                                 params,
-                                pattern.param_meta,
+                                param_specs,
                                 lfo_config,
                                 env_config
                             )
 
                             # capture thumbnail
-                            thumb = pygame.Surface((pattern.width, pattern.height))
+                            thumb = pygame.Surface((WALL_W, WALL_H))
                             draw_simulator(
                                 thumb,
-                                frame or [],
-                                pattern.width,
-                                pattern.height,
-                                pygame.Rect(0, 0, pattern.width, pattern.height)
+                                frame,
+                                WALL_W,
+                                WALL_H,
+                                pygame.Rect(0, 0, WALL_W, WALL_H)
                             )
                             patch_icons[i] = pygame.transform.smoothscale(
                                 thumb, (slot.width, slot.height)
@@ -1266,8 +1227,6 @@ def launch_ui():
 
                                 # Rebuild UI controls
                                 sliders, dropdowns, mod_checkboxes = create_sliders(param_specs, params)
-                                pattern = module.Pattern(WALL_W, WALL_H, params=params)
-                                pattern.param_meta = param_specs
 
                                 # Restore each param’s saved modulation flags
                                 for key, m in patch["modulation"].items():
@@ -1323,8 +1282,8 @@ def launch_ui():
                                     # finally update panel.config so future handle_event sees it
                                     panel.config.update(cfg)
 
-                                # 8) Finalize: update pattern.params so .render() sees everything
-                                pattern.update_params(params)
+                                # 8) Finalize: a fresh pattern instance in the engine
+                                load_engine_pattern(pattern_name)
 
                             break
         
@@ -1344,7 +1303,6 @@ def launch_ui():
         if instant_update:
             for s in sliders:
                 params[s.name] = s.value
-            pattern.update_params(params)
 
         # — After events: update dropdown-based params —
         new_pat = pattern_dropdown.selected
@@ -1353,10 +1311,8 @@ def launch_ui():
             module = patterns[new_pat]
             param_specs = module.PARAMS
 
-            # reset params & inject colormap/sprite
+            # reset params (load_engine_pattern injects colormap/sprite)
             params = {k: v["default"] for k, v in param_specs.items()}
-            params["COLORMAP"] = colormap_dropdown.selected
-            params["SPRITE"]   = sprite_dropdown.selected
 
             # disable all modulation defaults
             for meta in param_specs.values():
@@ -1365,71 +1321,37 @@ def launch_ui():
                     meta["mod_source"] = None
 
             sliders, dropdowns, mod_checkboxes = create_sliders(param_specs, params)
-            pattern = module.Pattern(WALL_W, WALL_H, params=params)
+            load_engine_pattern(new_pat)
         
         params["COLORMAP"] = colormap_dropdown.selected
         params["SPRITE"]   = sprite_dropdown.selected
-        pattern.update_params(params)
-
-        # — Evaluate LFOs & render frame —
-        mod_signals = evaluate_lfos()
-        mod_signals.update(evaluate_env())
-        #print("DEBUG vals:", {k: round(v,3) for k,v in mod_signals.items()})
-   
-        frame = pattern.render(lfo_signals=mod_signals)
-
-        # — Sprite overlay (static or animated GIF) —
-        sprite_name = params.get("SPRITE", "none")
-        if sprite_name in sprites and sprites[sprite_name]:
-            frames = sprites[sprite_name]
-            # sync to BPM: 1 beat per frame
-            from lfo import BPM
-            bps = BPM / 60.0
-            beat = (pygame.time.get_ticks()/1000.0) * bps
-            idx = int(beat) % len(frames)
-            sprite_surf = frames[idx]
-            w,h = sprite_surf.get_size()
-            ox = (pattern.width - w)//2
-            oy = (pattern.height - h)//2
-            for yy in range(h):
-                for xx in range(w):
-                    rgba = sprite_surf.get_at((xx,yy))
-                    if rgba[3]>0:
-                        frame[ (oy+yy)*pattern.width + (ox+xx) ] = (rgba.r,rgba.g,rgba.b,0)
-        
+
+        # — Hand the engine whatever changed; show what it rendered —
+        engine.sync(params=params, modulation=extract_mod_config(param_specs),
+                    lfo=LFO_CONFIG, env=ENV_CONFIG, bpm=lfo.BPM,
+                    rgbw=rgbw_dropdown.selected)
+        frame = engine.preview()
+        mod_signals = engine.signals()
+
+        # a failing pattern leaves the engine running on a black frame; if
+        # the engine itself died, the output process still has to be blanked
+        error = engine.stats().get("error")
+        if error != engine_error:
+            engine_error = error
+            print("Render engine:", error or "OK")
+            pygame.display.set_caption("LED Wall Touch UI" +
+                                       (f" - engine error: {error}" if error else ""))
+            if output is not None and not engine.alive:
+                output.submit(np.zeros((NUM_LEDS, 4), output.ring.dtype))
+
         ## Drawing Section 
         # Simulator (background) ——————————————————————————————
         if show_simulator:
             sim_rect = pygame.Rect(0, FULL_HEIGHT - SIM_HEIGHT,
                                    SCREEN_WIDTH, SIM_HEIGHT)
             draw_simulator(screen, frame,
-                           pattern.width, pattern.height,
+                           WALL_W, WALL_H,
                            sim_rect)
-    
-        # Output to the LED Matrix!
-        wall_w = PANEL_WIDTH * PANELS_X
-        wall_h = PANEL_HEIGHT * PANELS_Y
-
-        for y in range(wall_h):
-            for x in range(wall_w):
-                # compute the index into your frame buffer:
-                linear = y * wall_w + x
-                if linear >= len(frame):
-                    continue
-                r, g, b, _ = frame[linear]
-                r, g, b = compensate_warm_white(r, g, b)
-                r4, g4, b4, w = rgb_to_rgbw_extra(r, g, b)
-                r_corr, g_corr, b_corr, w_corr = apply_gamma(r4, g4, b4, w)
-                idx = serpentine_index(x, y)
-                r_out = int(brightness * r_corr)
-                g_out = int(brightness * g_corr)
-                b_out = int(brightness * b_corr)
-                w_out = int(brightness * w_corr)
-
-                if idx < NUM_LEDS:
-                    led_matrix.set_led_color(idx, r_out, g_out, b_out, w_out)
-                    # led_matrix.set_led_color(idx, r, g, b, 0)
-        led_matrix.update_strip()
 
         # Mode Buttons (Save-mode, Tap-tempo, Show/Hide) ————————
         pygame.draw.rect(screen, (200,80,80) if save_mode else (80,200,80),
@@ -1466,7 +1388,7 @@ def launch_ui():
             sim_rect = pygame.Rect(265, 55,
                                    440, 440)
             draw_simulator(screen, frame,
-                           pattern.width, pattern.height,
+                           WALL_W, WALL_H,
                            sim_rect)
         else:
             # Patch Grid Slots ——————————————————————————————
@@ -1485,29 +1407,10 @@ def launch_ui():
         # — Draw the Mode-Toggle button itself —
         pygame.draw.rect(screen, (80,80,80), toggle_rect)
         bw, bh = toggle_rect.width, toggle_rect.height
-        pw, ph = pattern.width, pattern.height
-        pixel_size = min(bw // pw, bh // ph)
-        # total icon size
-        icon_w = pixel_size * pw
-        icon_h = pixel_size * ph
-
-        # center it inside the button
-        off_x = toggle_rect.x + (bw - icon_w)//2
-        off_y = toggle_rect.y + (bh - icon_h)//2
-
 
         if display_patch_mode:
             # Pattern-mode: draw the full‐pattern thumbnail
-            for y in range(ph):
-                for x in range(pw):
-                    idx = y*pw + x
-                    r,g,b,_ = frame[idx]
-                    rect = pygame.Rect(
-                        off_x + x*pixel_size,
-                        off_y + y*pixel_size,
-                        pixel_size, pixel_size
-                    )
-                    pygame.draw.rect(screen, (r,g,b), rect)
+            draw_simulator(screen, frame, WALL_W, WALL_H, toggle_rect)
         else:
             # Patch-mode: draw an 8×8 grid icon
             rows, cols = PATCH_ROWS, PATCH_COLS  # 8,8
@@ -1545,7 +1448,6 @@ def launch_ui():
         draw_mod_indicator(screen, font, mod_signals,
                         "ENVH", "envh", (255,150, 50), 3)
         # BPM text
-        import lfo
         bpm_text = f"{int(lfo.BPM)} BPM"
         screen.blit(
             bold_bpm_font.render(bpm_text, True, (127,255,0)),
@@ -1578,15 +1480,22 @@ def launch_ui():
         pattern_dropdown.draw(screen, font)
         colormap_dropdown.draw(screen, font)
         sprite_dropdown.draw(screen, font)
+        rgbw_dropdown.draw(screen, font)
 
 
         # Final Flip 
         pygame.display.flip()
         clock.tick(FRAME_RATE)
 
-    for i in range(min(NUM_LEDS, len(frame))):
-        led_matrix.set_led_color(i, 0, 0, 0, 0)
-    led_matrix.update_strip()
+    engine.stop()   # blanks the strip if the engine owns it
+    if output is not None:
+        try:
+            output.stop()
+        except RuntimeError as e:
+            print(e)
+    stats = engine.stats()
+    print("LED output:", stats.pop("output", None) or (output.stats() if output else {}))
+    print("Render engine:", stats)
     pygame.quit()
 
 
@@ -1,4 +1,6 @@
 from config import USE_SIMULATOR, GPIO_PIN
+import numpy as np
+from layout import WallLayout
 try:
     import neopixel
     import board
@@ -15,6 +17,8 @@ class Wall:
         self.width = width
         self.height = height
         self.num_pixels = width * height
+        # one strip snaking row by row: a single panel the size of the wall
+        self.layout = WallLayout(width, height)
 
         if USE_SIMULATOR:
             self.simulator = True
@@ -36,14 +40,7 @@ class Wall:
         self.show(blank)
 
     def _show(self, frame):  # NeoPixel-only
-        for y in range(self.height):
-            for x in range(self.width):
-                # Convert from row-major to serpentine
-                logical_idx = y * self.width + x
-                if y % 2 == 0:
-                    physical_idx = logical_idx
-                else:
-                    physical_idx = y * self.width + (self.width - 1 - x)
-                
-                self.pixels[physical_idx] = frame[logical_idx]
+        # Convert from row-major to serpentine in one gather
+        ordered = self.layout.to_physical(np.asarray(frame))
+        self.pixels[:] = [tuple(p) for p in ordered.tolist()]
         self.pixels.show()
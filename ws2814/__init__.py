@@ -1 +1,4 @@
-from .ws2814 import WS2814
+from .ws2814 import WS2814
+from .chipsets import CHIPSETS, ChipsetProfile
+from .fake_spi import FakeSpiDev
+from .multibus import MultiBusOutput
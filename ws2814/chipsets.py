@@ -0,0 +1,73 @@
+# chipsets.py
+"""
+Named LED chipset profiles for the SPI driver.
+
+A profile fixes everything that differs between WS281x-style chips: how
+many channels each LED takes, the order they go out on the wire, the SPI
+symbols for a '0' / '1' bit and the latch (reset) time.  Encode tables are
+built once when the profile is created, so switching chipsets — or mixing
+them across buses — costs nothing per frame.
+"""
+
+from .encoding import build_symbol_table
+
+__all__ = ["ChipsetProfile", "CHIPSETS", "get_chipset"]
+
+# channel indices into an RGBW frame
+R, G, B, W = 0, 1, 2, 3
+
+
+class ChipsetProfile:
+    """
+    name:     profile name
+    order:    RGBW frame channels in wire order, e.g. (G, R, B) for GRB
+    symbols:  {spi_bits_per_data_bit: (zero_symbol, one_symbol)}
+    latch_seconds: reset time padded before and after every frame
+    """
+
+    def __init__(self, name, order, symbols, latch_seconds):
+        self.name = name
+        self.order = tuple(order)
+        self.channels = len(self.order)
+        self.symbols = dict(symbols)
+        self.latch_seconds = latch_seconds
+        self.tables = {bits: build_symbol_table(zero, one, bits)
+                       for bits, (zero, one) in self.symbols.items()}
+
+    def table(self, bits=8):
+        """Precomputed 256×bits encode table for one symbol width"""
+        if bits not in self.tables:
+            raise ValueError(f"{self.name} has no {bits}-bit symbol timing; "
+                             f"use one of {sorted(self.tables)}")
+        return self.tables[bits]
+
+    def __repr__(self):
+        return f"ChipsetProfile({self.name!r}, {self.channels} ch)"
+
+
+CHIPSETS = {
+    # T0H 0.25 µs / T1H 0.6 µs, reset > 50 µs
+    "ws2811":  ChipsetProfile("ws2811", (R, G, B),
+                              {8: (0xC0, 0xF0), 4: (0b1000, 0b1100)}, 80e-6),
+    # T0H 0.4 µs / T1H 0.8 µs, reset > 280 µs on current parts
+    "ws2812b": ChipsetProfile("ws2812b", (G, R, B),
+                              {8: (0xC0, 0xF8), 4: (0b1000, 0b1110), 3: (0b100, 0b110)},
+                              300e-6),
+    # RGBW variant, T0H 0.3 µs / T1H 0.6 µs, reset > 80 µs
+    "sk6812":  ChipsetProfile("sk6812", (G, R, B, W),
+                              {8: (0xC0, 0xF0), 4: (0b1000, 0b1100)}, 100e-6),
+    # what this wall uses: white first, then R, G, B
+    "ws2814":  ChipsetProfile("ws2814", (W, R, G, B),
+                              {8: (0xC0, 0xF8), 4: (0b1000, 0b1110), 3: (0b100, 0b110)},
+                              312.5e-6),
+}
+
+
+def get_chipset(chipset):
+    """Look up a profile by name (profiles are passed through unchanged)"""
+    if isinstance(chipset, ChipsetProfile):
+        return chipset
+    try:
+        return CHIPSETS[chipset.lower()]
+    except KeyError:
+        raise ValueError(f"unknown chipset {chipset!r}; choose from {sorted(CHIPSETS)}") from None
@@ -0,0 +1,63 @@
+# fake_spi.py
+"""
+Stand-in for spidev.SpiDev that records what would have gone out on the bus.
+
+Pass one to WS2814(..., spi=FakeSpiDev()) to benchmark or inspect the
+driver on a machine with no SPI hardware.
+"""
+
+import time
+
+__all__ = ["FakeSpiDev"]
+
+
+class FakeSpiDev:
+    """Minimal spidev.SpiDev look-alike (open / xfer3 / writebytes2 / close)"""
+
+    def __init__(self, record=True, bufsiz=4096, delay_per_byte=0.0):
+        self.record = record              # keep a copy of every transfer
+        self.bufsiz = bufsiz
+        self.delay_per_byte = delay_per_byte  # simulate wire time, seconds/byte
+        self.max_speed_hz = 0
+        self.mode = 0
+        self.bus = None
+        self.device = None
+        self.transfers = []               # [(timestamp, bytes)] when recording
+        self.bytes_sent = 0
+        self.calls = 0
+
+    def open(self, bus, device):
+        self.bus, self.device = bus, device
+
+    def close(self):
+        self.bus = self.device = None
+
+    def _send(self, data):
+        n = len(data)
+        if n > self.bufsiz:
+            raise OverflowError(f"transfer of {n} bytes exceeds bufsiz {self.bufsiz}")
+        if self.delay_per_byte:
+            time.sleep(n * self.delay_per_byte)
+        if self.record:
+            self.transfers.append((time.perf_counter(), bytes(data)))
+        self.bytes_sent += n
+        self.calls += 1
+
+    def xfer3(self, values):
+        # like spidev, xfer3 splits large transfers into bufsiz blocks
+        for start in range(0, len(values), self.bufsiz):
+            self._send(values[start:start + self.bufsiz])
+        return [0] * len(values)
+
+    def writebytes(self, values):
+        self._send(values)
+
+    def writebytes2(self, data):
+        # real spidev splits writebytes2 into bufsiz blocks itself
+        view = memoryview(data).cast("B")
+        for start in range(0, len(view), self.bufsiz):
+            self._send(view[start:start + self.bufsiz])
+
+    def sent_bytes(self) -> bytes:
+        """Everything recorded so far, concatenated"""
+        return b"".join(data for _, data in self.transfers)
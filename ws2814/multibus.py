@@ -0,0 +1,126 @@
+# multibus.py
+"""
+Fan one physical LED index space out over several SPI buses.
+
+Each segment of the chain (e.g. LEDs 0–319 on /dev/spidev0.0, 320–639 on
+/dev/spidev1.0) gets its own WS2814 and its own worker thread, so segments
+encode and transfer in parallel.  update_strip() releases all workers at
+once and returns only when every bus has finished, giving one synchronized
+frame boundary.
+"""
+
+import threading
+import time
+import numpy as np
+
+from .ws2814 import WS2814
+
+__all__ = ["MultiBusOutput"]
+
+
+class MultiBusOutput:
+    """
+    WS2814-compatible output split across buses.
+
+    segments: list of (spi_device, start, count[, chipset]) tiling the
+              physical index space 0..N-1 without gaps or overlaps (else
+              ValueError); start/count are LED indices. A segment's
+              chipset overrides the `chipset` keyword, so chains can be mixed.
+    spi_factory: optional callable(spi_device) -> SpiDev-like object, e.g.
+              lambda path: FakeSpiDev() to run without hardware.
+    Remaining keyword arguments go to every WS2814.
+    """
+
+    def __init__(self, segments, spi_speed_khz=800, spi_factory=None, **strip_kwargs):
+        default_chipset = strip_kwargs.pop("chipset", "ws2814")
+        self.segments = sorted(((seg[0], int(seg[1]), int(seg[2]),
+                                 seg[3] if len(seg) > 3 else default_chipset)
+                                for seg in segments),
+                               key=lambda seg: seg[1])
+        if not self.segments:
+            raise ValueError("MultiBusOutput needs at least one segment")
+        end = 0
+        for dev, start, count, _ in self.segments:
+            if count <= 0 or start != end:
+                raise ValueError(f"segment {dev} ({start}, {count}) leaves a gap or overlaps; "
+                                 f"segments must tile 0..N-1 and this one should start at {end}")
+            end = start + count
+        self.num_leds = end
+        self.led_state = np.zeros((self.num_leds, 4), dtype=np.uint8)
+
+        self.strips = []
+        try:
+            for dev, start, count, chipset in self.segments:
+                spi = spi_factory(dev) if spi_factory else None
+                strip = WS2814(dev, count, spi_speed_khz, spi=spi, chipset=chipset,
+                               **strip_kwargs)
+                # every strip works directly on its slice of the shared state
+                strip.led_state = self.led_state[start:start + count]
+                self.strips.append(strip)
+        except Exception:
+            for strip in self.strips:
+                strip.close()
+            raise
+
+        self.bus_seconds = [0.0] * len(self.strips)   # last transfer time per bus
+        self._errors = [None] * len(self.strips)
+        self._start = threading.Barrier(len(self.strips) + 1)
+        self._done = threading.Barrier(len(self.strips) + 1)
+        self._workers = [
+            threading.Thread(target=self._run, args=(i,), name=f"spi-bus-{i}", daemon=True)
+            for i in range(len(self.strips))
+        ]
+        for t in self._workers:
+            t.start()
+
+    def _run(self, i):
+        strip = self.strips[i]
+        while True:
+            try:
+                self._start.wait()
+            except threading.BrokenBarrierError:
+                return      # close()
+            t0 = time.perf_counter()
+            try:
+                strip.update_strip()
+                self._errors[i] = None
+            except Exception as e:
+                self._errors[i] = e
+            self.bus_seconds[i] = time.perf_counter() - t0
+            try:
+                self._done.wait()
+            except threading.BrokenBarrierError:
+                return
+
+    def update_strip(self):
+        """Send the current state on every bus; returns once all buses are done"""
+        self._start.wait()
+        self._done.wait()
+        for err in self._errors:
+            if err is not None:
+                raise err
+
+    def set_frame(self, frame):
+        """Replace the whole state with an (N,4) RGBW array in physical order"""
+        self.led_state[:] = np.asarray(frame, dtype=np.uint8).reshape(self.num_leds, 4)
+
+    def set_led_color(self, index, red, green, blue, white):
+        if 0 <= index < self.num_leds:
+            self.led_state[index] = (red, green, blue, white)
+            return True
+        return False
+
+    def fill_strip(self, red=0, green=0, blue=0, white=0):
+        self.led_state[:] = (red, green, blue, white)
+
+    def clear_strip(self):
+        self.fill_strip(0, 0, 0, 0)
+
+    def close(self):
+        """Stop the bus workers and release every SPI device"""
+        self._start.abort()
+        self._done.abort()
+        for t in self._workers:
+            t.join()
+        for strip in self.strips:
+            strip.close()
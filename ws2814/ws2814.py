@@ -1,5 +1,28 @@
-import spidev
+try:
+    import spidev
+except ImportError:
+    spidev = None
+import math
 import time
+import numpy as np
+
+from .chipsets import CHIPSETS, get_chipset
+
+# WS2814 latch/reset time padded before and after each frame (250 zero bytes at 6.4 MHz)
+LATCH_SECONDS = CHIPSETS["ws2814"].latch_seconds
+
+# spidev's per-transfer limit; the kernel default unless the module says otherwise
+SPIDEV_BUFSIZ_PATH = '/sys/module/spidev/parameters/bufsiz'
+DEFAULT_BUFSIZ = 4096
+
+
+def spidev_bufsiz(path=SPIDEV_BUFSIZ_PATH, default=DEFAULT_BUFSIZ):
+    """Largest single SPI transfer the spidev driver accepts"""
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return default
 
 class LEDColor:
     """Represents an RGBW color for the WS2814"""
@@ -10,40 +33,94 @@ class LEDColor:
         self.white = white
 
 class WS2814:
-    def __init__(self, spi_device='/dev/spidev0.0', num_leds=8, spi_speed_khz=800):
-        """Initialize the Pi5Neo class with SPI device, number of LEDs, and speed"""
+    def __init__(self, spi_device='/dev/spidev0.0', num_leds=8, spi_speed_khz=800,
+                 bits_per_symbol=8, spi=None, partial_updates=False,
+                 full_refresh_interval=45, chipset="ws2814"):
+        """Initialize the Pi5Neo class with SPI device, number of LEDs, and speed
+
+        bits_per_symbol: SPI bits spent per LED data bit. 8 is one SPI byte per
+        bit (6.4 MHz); 4 or 3 pack the same timing into 3.2 / 2.4 MHz and cut
+        the wire bytes by 2x / 2.7x.
+        spi: an already-constructed SpiDev-like object (e.g. FakeSpiDev) to
+        use instead of spidev.SpiDev().
+        partial_updates: only transmit up to the last LED that changed since
+        the previous push (LEDs past the end of a transmission keep their
+        colour). Every `full_refresh_interval` updates the whole chain is
+        resent anyway so a glitched LED recovers; 0 disables the refresh.
+        chipset: name of a ws2814.chipsets profile (ws2811, ws2812b, sk6812,
+        ws2814) or a ChipsetProfile; sets channel count/order, symbols and
+        latch time. Frames are always RGBW; RGB chips just skip W.
+        """
         self.num_leds = num_leds
-        self.spi_speed = spi_speed_khz * 1000 * 8  # Convert kHz to bytes per second this is 6.4MHz
-        print(self.spi_speed)
-        self.spi = spidev.SpiDev()  # Create SPI device instance
-        self.raw_data = [0] * (self.num_leds * 32)  # Placeholder for raw data sent via SPI
-        self.led_state = [LEDColor()] * self.num_leds  # Initial state for each LED (off)
-        
+        self.chipset = get_chipset(chipset)
+        self.channels = self.chipset.channels
+        self.bits_per_symbol = bits_per_symbol
+        self.symbol_table = self.chipset.table(bits_per_symbol)  # 256 x bits_per_symbol SPI bytes
+        self.spi_speed = spi_speed_khz * 1000 * bits_per_symbol  # SPI clock, 6.4MHz for 8 bits
+        self.pause_bytes = math.ceil(self.chipset.latch_seconds * self.spi_speed / 8)
+        if spi is None:
+            if spidev is None:
+                raise RuntimeError("spidev is not installed; install it or pass spi= "
+                                   "(e.g. FakeSpiDev()), or use LED_OUTPUT=simulator")
+            spi = spidev.SpiDev()  # Create SPI device instance
+        self.spi = spi
+        self.bufsiz = getattr(spi, 'bufsiz', None) or spidev_bufsiz()
+
+        # One persistent transmit buffer: latch padding | payload | latch padding.
+        # raw_data is a view of the payload region, so encoding writes straight
+        # into the bytes that go out on the wire.
+        self.bytes_per_led = self.channels * bits_per_symbol
+        payload_bytes = self.num_leds * self.bytes_per_led
+        self.tx_buffer = bytearray(self.pause_bytes + payload_bytes + self.pause_bytes)
+        self.tx_view = memoryview(self.tx_buffer)
+        self.raw_data = np.frombuffer(self.tx_buffer, dtype=np.uint8)[
+            self.pause_bytes:self.pause_bytes + payload_bytes]  # Encoded SPI payload
+        self.led_state = np.zeros((self.num_leds, 4), dtype=np.uint8)  # RGBW per LED (off)
+        # led_state in wire order, kept as intp so np.take needn't convert it
+        self._wire_state = np.zeros((self.num_leds, self.channels), dtype=np.intp)
+
+        # Change tracking for partial updates
+        self.partial_updates = partial_updates
+        self.full_refresh_interval = full_refresh_interval
+        self._sent_state = np.zeros_like(self.led_state)  # what the chain shows now
+        self._updates_since_full = None                   # None: next push is full
+        self.last_sent_leds = 0
 
         # Open the SPI device
-        if self.open_spi_device(spi_device):
-            time.sleep(0.1)  # Short delay to ensure device is ready
-            self.clear_strip()  # Clear the strip on startup
-            self.update_strip()
+        self.open_spi_device(spi_device)
+        time.sleep(0.1)  # Short delay to ensure device is ready
+        self.clear_strip()  # Clear the strip on startup
+        self.update_strip()
 
     def open_spi_device(self, device_path):
-        """Open the SPI device with the provided path"""
+        """Open the SPI device with the provided path; raises RuntimeError if it can't"""
         try:
             bus, device = map(int, device_path[-3:].split('.'))
             self.spi.open(bus, device)
             self.spi.max_speed_hz = self.spi_speed
             self.spi.mode = 0
-            print(f"Opened SPI device: {device_path}")
-            return True
         except Exception as e:
-            print(f"Failed to open SPI device: {e}")
-            return False
+            raise RuntimeError(f"Failed to open SPI device {device_path}: {e}") from e
+        print(f"Opened SPI device: {device_path}")
+
+    def close(self):
+        """Release the SPI device"""
+        if self.spi is not None:
+            self.spi.close()
 
     def send_spi_data(self):
-        """Send the raw data buffer to the NeoPixel strip via SPI"""
-        pause = [0x00] * 250
-        spi_message = bytes(pause + self.raw_data + pause)
-        self.spi.xfer3(list(spi_message))  #previously spi.xfer2
+        """Send the transmit buffer (padding + raw data + padding) to the strip via SPI"""
+        self.write_spi(self.tx_view)
+
+    def write_spi(self, view):
+        """Write a buffer in chunks of at most bufsiz bytes, without copying"""
+        write = getattr(self.spi, 'writebytes2', None)
+        for start in range(0, len(view), self.bufsiz):
+            chunk = view[start:start + self.bufsiz]
+            if write:
+                write(chunk)
+            else:
+                self.spi.xfer3(list(chunk))  # old spidev without buffer support
 
 
     def bitmask(self, byte, position):
@@ -58,13 +135,6 @@ class WS2814:
                 bitstream[i] = 0xF8  # Set HIGH bits for '1'
         return bitstream
 
-    # def rgb_to_spi_bitstream(self, red, green, blue):
-    #     """Convert RGB values to the NeoPixel bitstream format for SPI"""
-    #     green_bits = self.byte_to_bitstream(green)  # Send green first
-    #     red_bits = self.byte_to_bitstream(red)  # Then red
-    #     blue_bits = self.byte_to_bitstream(blue)  # Then blue
-    #     return green_bits + red_bits + blue_bits  # Concatenate GRB order
-
     def rgbw_to_spi_bitstream(self, red, green, blue, white):
         """Convert RGB values to the NeoPixel bitstream format for SPI"""
         white_bits = self.byte_to_bitstream(white)
@@ -79,26 +149,65 @@ class WS2814:
 
     def fill_strip(self, red=0, green=0, blue=0, white=0):
         """Fill the entire strip with a specific color"""
-        color = LEDColor(red, green, blue, white)
-        self.led_state = [color] * self.num_leds  # Set all LEDs to the same color
+        self.led_state[:] = (red, green, blue, white)  # Set all LEDs to the same color
 
     def set_led_color(self, index, red, green, blue, white):
         """Set the color of an individual LED"""
         if 0 <= index < self.num_leds:
-            self.led_state[index] = LEDColor(red, green, blue, white)
+            self.led_state[index] = (red, green, blue, white)
             return True
         return False
 
+    def set_frame(self, frame):
+        """Replace the whole strip state with an (N,4) RGBW array in physical order"""
+        self.led_state[:] = np.asarray(frame, dtype=np.uint8).reshape(self.num_leds, 4)
+
     def update_strip(self):
-        """Send the current state of the LED strip to the LEDs
-        """
+        """Send the current state of the LED strip to the LEDs"""
+        count = self._leds_to_send()
+        if count == 0:
+            self.last_sent_leds = 0
+            return  # nothing changed; the chain already shows this frame
+
+        for wire_ch, ch in enumerate(self.chipset.order):
+            np.copyto(self._wire_state[:count, wire_ch], self.led_state[:count, ch])
+        # mode='clip' lets np.take write into `out` directly instead of buffering
+        np.take(self.symbol_table, self._wire_state[:count], axis=0, mode='clip',
+                out=self.raw_data[:count * self.bytes_per_led].reshape(count, self.channels, -1))
+
+        if count == self.num_leds:
+            self.send_spi_data()
+        else:
+            # leading padding + changed prefix, then the trailing latch padding
+            self.write_spi(self.tx_view[:self.pause_bytes + count * self.bytes_per_led])
+            self.write_spi(self.tx_view[-self.pause_bytes:])
+        self._sent_state[:count] = self.led_state[:count]
+        self.last_sent_leds = count
+
+    def _leds_to_send(self):
+        """How many LEDs, from the start of the chain, this push has to cover"""
+        if not self.partial_updates:
+            return self.num_leds
+        due = (self._updates_since_full is None or
+               (self.full_refresh_interval and
+                self._updates_since_full + 1 >= self.full_refresh_interval))
+        if due:
+            self._updates_since_full = 0
+            return self.num_leds
+        self._updates_since_full += 1
+        # comparing RGBW state is equivalent to comparing the encoded bytes
+        # and touches 8x less memory
+        changed = np.flatnonzero((self.led_state != self._sent_state).any(axis=1))
+        return int(changed[-1]) + 1 if changed.size else 0
+
+    def update_strip_legacy(self):
+        """Reference per-LED WS2814 encoder (slow); kept for benchmarks and bit-exact checks"""
+        raw = [0] * (self.num_leds * 32)
         total_bytes = 0
         for i in range(self.num_leds):
-            led = self.led_state[i]  # Get the color for each LED
-            bitstream = self.rgbw_to_spi_bitstream(led.red, led.green, led.blue, led.white)
+            red, green, blue, white = (int(v) for v in self.led_state[i])
+            bitstream = self.rgbw_to_spi_bitstream(red, green, blue, white)
             for j in range(32):
-                self.raw_data[total_bytes] = bitstream[j]
+                raw[total_bytes] = bitstream[j]
                 total_bytes += 1
-        self.send_spi_data()
-
-
+        return raw